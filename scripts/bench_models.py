@@ -0,0 +1,89 @@
+"""
+Benchmark construction time and memory of validated hot-path models and their compact counterparts.
+
+Run with `PYTHONPATH=src python scripts/bench_models.py`.
+"""
+import gc
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from tbot.common.compact import get_compact_adapter
+from tbot.common.easymodel import get_type_adapter
+from tbot.dexscreener.models import TokenPair
+from tbot.meteora.models import Swap
+
+
+def make_swaps(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "tx_id": f"Tx{i:080d}", "in_amount": 1_000_000 + i, "in_amount_usd": 1.5,
+            "out_amount": 2_000_000 + i, "out_amount_usd": 1.49, "trade_fee": 300, "trade_fee_usd": 0.0003,
+            "protocol_fee": 15, "protocol_fee_usd": 0.00001, "onchain_timestamp": 1_700_000_000 + i,
+            "pair_address": "ARwi1S4DaiTG5DX7S4M4ZsrXqpMD1MrTmbu9ue2tpmEq", "start_bin_id": -100 + i % 7,
+            "end_bin_id": -99 + i % 7, "bin_count": 2, "fee_bps": 25.0,
+            "in_token": "So11111111111111111111111111111111111111112",
+            "out_token": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+        }
+        for i in range(count)
+    ]
+
+
+def make_token_pairs(count: int) -> List[Dict[str, Any]]:
+    period: Dict[str, float] = {"m5": 1.0, "h1": 2.0, "h6": 3.0, "h24": 4.0}
+    txns: Dict[str, int] = {"buys": 10, "sells": 12}
+    return [
+        {
+            "chainId": "solana", "dexId": "raydium", "url": f"https://dexscreener.com/solana/pair{i}",
+            "pairAddress": f"Pair{i:040d}",
+            "baseToken": {"address": f"Mint{i:040d}", "name": "Token", "symbol": "TKN"},
+            "quoteToken": {"address": "So11111111111111111111111111111111111111112", "name": "Wrapped SOL",
+                           "symbol": "SOL"},
+            "priceNative": 0.0012, "priceUsd": 0.18,
+            "txns": {"m5": txns, "h1": txns, "h6": txns, "h24": txns},
+            "volume": period, "priceChange": period,
+            "liquidity": {"usd": 10_000.0, "base": 5_000.0, "quote": 30.0},
+            "fdv": 1_000_000.0, "pairCreatedAt": 1_700_000_000_000 + i,
+        }
+        for i in range(count)
+    ]
+
+
+def measure(build: Callable[[], Any]) -> Dict[str, float]:
+    seconds: float = min(timeit.repeat(build, number=1, repeat=3))
+    gc.collect()
+    tracemalloc.start()
+    result: Any = build()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"ms": seconds * 1000, "mb": size / 2 ** 20}
+
+
+def report(title: str, cases: Dict[str, Callable[[], Any]]) -> None:
+    print(title)
+    baseline: Dict[str, float] = {}
+    for name, build in cases.items():
+        result: Dict[str, float] = measure(build)
+        baseline = baseline or result
+        print(f"  {name:<32} {result['ms']:9.1f} ms {baseline['ms'] / result['ms']:5.1f}x"
+              f" {result['mb']:8.1f} MiB {baseline['mb'] / result['mb']:5.1f}x")
+
+
+def main() -> None:
+    swaps: List[Dict[str, Any]] = make_swaps(100_000)
+    report("100k Swap", {
+        "TypeAdapter (validated)": lambda: get_type_adapter(List[Swap]).validate_python(swaps),
+        "Swap(**swap) loop": lambda: [Swap(**swap) for swap in swaps],
+        "trusted (CompactSwap)": lambda: get_compact_adapter(List[Swap]).validate_python(swaps),
+    })
+    pairs: List[Dict[str, Any]] = make_token_pairs(10_000)
+    report("10k TokenPair", {
+        "TypeAdapter (validated)": lambda: get_type_adapter(List[TokenPair]).validate_python(pairs),
+        "TokenPair(**pair) loop": lambda: [TokenPair(**pair) for pair in pairs],
+        "trusted (CompactTokenPair)": lambda: get_compact_adapter(List[TokenPair]).validate_python(pairs),
+    })
+
+
+if __name__ == "__main__":
+    main()
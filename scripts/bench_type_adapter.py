@@ -0,0 +1,50 @@
+"""
+Benchmark building a 5k-element `PairInfo` list per element versus through one prebuilt TypeAdapter.
+
+Run with `PYTHONPATH=src python scripts/bench_type_adapter.py`.
+"""
+import json
+import timeit
+from typing import Any, Dict, List
+
+from tbot.common.easymodel import get_type_adapter
+from tbot.meteora.models import PairInfo
+
+
+def make_pairs(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "address": f"Pair{i:040d}", "name": "SOL-USDC",
+            "mint_x": "So11111111111111111111111111111111111111112",
+            "mint_y": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+            "reserve_x": f"ResX{i:040d}", "reserve_x_amount": 1000 + i,
+            "reserve_y": f"ResY{i:040d}", "reserve_y_amount": 2000 + i,
+            "bin_step": 10, "base_fee_percentage": "0.1", "max_fee_percentage": "10",
+            "protocol_fee_percentage": "5", "liquidity": "123456.789",
+            "reward_mint_x": "11111111111111111111111111111111", "reward_mint_y": "11111111111111111111111111111111",
+            "fees_24h": 1.5, "today_fees": 0.5, "trade_volume_24h": 1000.0, "cumulative_trade_volume": "1000000.0",
+            "cumulative_fee_volume": "1000.0", "current_price": 150.25, "apr": 1.2, "apy": 1.3,
+            "farm_apr": 0.0, "farm_apy": 0.0, "hide": False,
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    pairs: List[Dict[str, Any]] = make_pairs(5000)
+    body: bytes = json.dumps(pairs).encode()
+    adapter = get_type_adapter(List[PairInfo])
+    cases = {
+        "json.loads + PairInfo(**pair) loop": lambda: [PairInfo(**pair) for pair in json.loads(body)],
+        "json.loads + TypeAdapter.validate_python": lambda: adapter.validate_python(json.loads(body)),
+        "TypeAdapter.validate_json(bytes)": lambda: adapter.validate_json(body),
+    }
+    baseline: float = 0.0
+    for name, case in cases.items():
+        seconds: float = min(timeit.repeat(case, number=5, repeat=5)) / 5
+        baseline = baseline or seconds
+        print(f"{name:<45} {seconds * 1000:8.2f} ms  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
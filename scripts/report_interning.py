@@ -0,0 +1,93 @@
+"""
+Report the memory retained by a full Meteora pair list and a swap-history backfill, with and without interning.
+
+Run with `PYTHONPATH=src python scripts/report_interning.py`.
+"""
+import gc
+import json
+import random
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from tbot.common import intern
+from tbot.common.compact import get_compact_adapter
+from tbot.common.easymodel import get_type_adapter
+from tbot.meteora.models import PairInfo, Swap
+
+SOL: str = "So11111111111111111111111111111111111111112"
+USDC: str = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+NO_REWARD: str = "11111111111111111111111111111111"
+
+
+def mint(i: int) -> str:
+    return f"Mint{i:040d}"
+
+
+def make_pairs(count: int, tokens: int) -> List[Dict[str, Any]]:
+    rng: random.Random = random.Random(1)
+    return [
+        {
+            "address": f"Pair{i:040d}", "name": "TKN-SOL", "mint_x": mint(rng.randrange(tokens)),
+            "mint_y": rng.choice([SOL, SOL, SOL, USDC]), "reserve_x": f"ResX{i:040d}", "reserve_x_amount": i,
+            "reserve_y": f"ResY{i:040d}", "reserve_y_amount": i, "bin_step": 10, "base_fee_percentage": "0.1",
+            "max_fee_percentage": "10", "protocol_fee_percentage": "5", "liquidity": "1234.5",
+            "reward_mint_x": NO_REWARD, "reward_mint_y": NO_REWARD, "fees_24h": 1.0, "today_fees": 1.0,
+            "trade_volume_24h": 1.0, "cumulative_trade_volume": "1.0", "cumulative_fee_volume": "1.0",
+            "current_price": 1.0, "apr": 1.0, "apy": 1.0, "farm_apr": 0.0, "farm_apy": 0.0, "hide": False,
+        }
+        for i in range(count)
+    ]
+
+
+def make_swaps(count: int, pairs: int) -> List[Dict[str, Any]]:
+    rng: random.Random = random.Random(2)
+    swaps: List[Dict[str, Any]] = []
+    for i in range(count):
+        pair: int = rng.randrange(pairs)
+        tokens: List[str] = [mint(pair), SOL] if rng.random() < 0.5 else [SOL, mint(pair)]
+        swaps.append({
+            "tx_id": f"Tx{i:080d}", "in_amount": i, "in_amount_usd": 1.0, "out_amount": i, "out_amount_usd": 1.0,
+            "trade_fee": 1, "trade_fee_usd": 0.1, "protocol_fee": 1, "protocol_fee_usd": 0.1,
+            "onchain_timestamp": 1_700_000_000 + i, "pair_address": f"Pair{pair:040d}", "start_bin_id": 1,
+            "end_bin_id": 2, "bin_count": 2, "fee_bps": 25.0, "in_token": tokens[0], "out_token": tokens[1],
+        })
+    return swaps
+
+
+def retained(build: Callable[[], Any]) -> float:
+    """
+    Get the MiB still allocated once `build` returns, i.e. held by its result.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result: Any = build()
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size / 2 ** 20
+
+
+def report(title: str, body: bytes, tp: Any) -> None:
+    cases: Dict[str, Callable[[], Any]] = {
+        "json.loads + validate_python": lambda: get_type_adapter(tp).validate_python(json.loads(body)),
+        "json.loads + compact records": lambda: get_compact_adapter(tp).validate_python(json.loads(body)),
+        "validate_json(bytes)": lambda: get_type_adapter(tp).validate_json(body),
+    }
+    print(title)
+    for name, build in cases.items():
+        build()
+        intern.default_pool.maxsize = 0
+        intern.default_pool.clear()
+        plain: float = retained(build)
+        intern.default_pool.maxsize = 65536
+        interned: float = retained(build)
+        print(f"  {name:<32} {plain:8.1f} MiB -> {interned:8.1f} MiB interned ({1 - interned / plain:5.1%} saved)")
+
+
+def main() -> None:
+    report("40k pairs (/pair/all)", json.dumps(make_pairs(40_000, tokens=8_000)).encode(), List[PairInfo])
+    report("200k swaps over 50 pairs (backfill)", json.dumps(make_swaps(200_000, pairs=50)).encode(), List[Swap])
+
+
+if __name__ == "__main__":
+    main()
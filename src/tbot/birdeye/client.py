@@ -1,12 +1,26 @@
 """
 Provides a simple rate-limited HTTP client for making requests to the Birdeye API.
 """
-from typing import Any, List, Optional
-from pydantic import Field, HttpUrl
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from pydantic import Field, HttpUrl, PrivateAttr
 
-from .models import DefiNetwork, TokenPrice
-from ..common.easymodel import EasyModel
+from .models import (
+    BulkPrices,
+    DefiNetwork,
+    MultiTokenPriceResponse,
+    PriceChunkError,
+    SupportedNetworksResponse,
+    TokenPrice,
+    TokenPriceResponse,
+)
+from ..common.batch import batch_map_async, chunked
+from ..common.cache import CachePolicy
+from ..common.easymodel import EasyModel, get_type_adapter
+from ..common.compact import get_compact_adapter
 from ..common.httpclient import HttpClient, HttpRequestMethod
+from ..common.microbatch import MicroBatcher
+from ..common.ratelimit import RateLimitPolicy
 
 
 class BirdeyeClientConfig(EasyModel):
@@ -15,6 +29,22 @@ class BirdeyeClientConfig(EasyModel):
     """
     base_url: Optional[HttpUrl] = Field(default="https://public-api.birdeye.so/defi", alias="base_url")
     api_key: Optional[str] = Field(default=None, alias="api_key")
+    cache_policies: List[CachePolicy] = Field(
+        default_factory=lambda: [
+            CachePolicy(route="networks", ttl=6 * 60 * 60),
+            CachePolicy(route="price", ttl=2, negative_ttl=30, negative_field="data"),
+            CachePolicy(route="multi_price", ttl=2),
+        ],
+        alias="cache_policies",
+    )
+    stale_while_revalidate: bool = Field(default=False, alias="stale_while_revalidate")
+    hedge_requests: bool = Field(default=False, alias="hedge_requests")
+    max_staleness: Optional[float] = Field(default=None, alias="max_staleness")
+    trusted: bool = Field(default=False, alias="trusted")
+    rate_limits: List[RateLimitPolicy] = Field(default_factory=list, alias="rate_limits")
+    max_addresses: int = Field(default=100, alias="max_addresses")
+    batch_prices: bool = Field(default=False, alias="batch_prices")
+    batch_window: float = Field(default=0.005, alias="batch_window")
 
 
 class BirdeyeClient(EasyModel):
@@ -24,11 +54,83 @@ class BirdeyeClient(EasyModel):
     client: HttpClient = Field(default_factory=HttpClient, alias="client")
     config: BirdeyeClientConfig = Field(
         default_factory=BirdeyeClientConfig, alias="config")
+    _price_batcher: Optional[MicroBatcher] = PrivateAttr(default=None)
 
     def __init__(self: Any, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.client.config.base_url = self.config.base_url
         self.config.api_key = kwargs.get("api_key", None)
+        self.client.add_cache_policies(self.config.cache_policies)
+        self.client.add_rate_limits(self.config.rate_limits)
+        if self.config.stale_while_revalidate:
+            self.client.config.stale_while_revalidate = True
+        if self.config.hedge_requests:
+            self.client.config.hedge_requests = True
+        if self.config.max_staleness is not None:
+            self.client.config.max_staleness = self.config.max_staleness
+        if self.config.batch_prices:
+            self._price_batcher = MicroBatcher(
+                load=lambda network, addresses: self._multi_price_async(addresses, network),
+                window=self.config.batch_window,
+                max_size=self.config.max_addresses,
+            )
+
+    def __enter__(self) -> "BirdeyeClient":
+        self.client.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        self.client.__exit__(exc_type, exc_val, exc_tb)
+
+    async def __aenter__(self) -> "BirdeyeClient":
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        if self._price_batcher is not None:
+            self._price_batcher.cancel()
+        await self.client.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def close_async(self) -> None:
+        """
+        Close the pooled connections of the underlying HTTP client, cancelling batched price lookups.
+        """
+        if self._price_batcher is not None:
+            self._price_batcher.cancel()
+        await self.client.close_async()
+
+    def close(self) -> None:
+        """
+        Close the pooled sync connections and thread pool of the underlying HTTP client.
+        """
+        self.client.close()
+
+    def batch_map(
+        self,
+        func: Callable[..., Any],
+        *iterables: Iterable[Any],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Fan sync calls of this client out over the bounded thread pool of the underlying HTTP client.
+        """
+        return self.client.batch_map(func, *iterables, return_exceptions=return_exceptions)
+
+    def parser(self, tp: Any) -> Any:
+        """
+        Get the parser of a response type, building compact unvalidated records when the client is `trusted`.
+        """
+        return get_compact_adapter(tp) if self.config.trusted else get_type_adapter(tp)
 
     def get_supported_networks(self) -> list[DefiNetwork]:
         """
@@ -40,13 +142,10 @@ class BirdeyeClient(EasyModel):
             headers={
                 "X-API-KEY": self.config.api_key,
             },
+            parser=get_type_adapter(SupportedNetworksResponse),
         )
-        if response["success"] == True:
-            return (
-                [DefiNetwork(value=network) for network in response["data"]]
-                if response["data"] is not None and len(response["data"]) > 0
-                else []
-            )
+        if response.success and response.data is not None:
+            return response.data
         return []
 
     async def get_supported_networks_async(self) -> list[DefiNetwork]:
@@ -59,13 +158,10 @@ class BirdeyeClient(EasyModel):
             headers={
                 "X-API-KEY": self.config.api_key,
             },
+            parser=get_type_adapter(SupportedNetworksResponse),
         )
-        if response["success"] == True:
-            return (
-                [DefiNetwork(value=network) for network in response["data"]]
-                if response["data"] is not None and len(response["data"]) > 0
-                else []
-            )
+        if response.success and response.data is not None:
+            return response.data
         return []
 
     def get_price(
@@ -88,8 +184,9 @@ class BirdeyeClient(EasyModel):
             },
             headers={"X-API-KEY": self.config.api_key,
                      "X-CHAIN": network.value},
+            parser=self.parser(TokenPriceResponse),
         )
-        return TokenPrice(**response.get("data", {}))
+        return response.data if response.data is not None else TokenPrice()
 
     async def get_price_async(
         self,
@@ -100,7 +197,13 @@ class BirdeyeClient(EasyModel):
     ) -> TokenPrice:
         """
 		Async version of `get_price` method - Get the price of a token.
+
+        With `batch_prices`, plain lookups made within `batch_window` of each other are sent
+        together as one `multi_price` request per network.
         """
+        if self._price_batcher is not None and check_liquidity is None and include_liquidity is None:
+            price: Optional[TokenPrice] = await self._price_batcher.load_one(network, address)
+            return price if price is not None else TokenPrice()
         response = await self.client.api_request_async(
             "price",
             HttpRequestMethod.GET,
@@ -111,38 +214,114 @@ class BirdeyeClient(EasyModel):
             },
             headers={"X-API-KEY": self.config.api_key,
                      "X-CHAIN": network.value},
+            parser=self.parser(TokenPriceResponse),
         )
-        return TokenPrice(**response.get("data", {}))
+        return response.data if response.data is not None else TokenPrice()
 
-    def get_multi_price(self, addresses: List[str]) -> List[TokenPrice]:
+    def get_multi_price(
+        self,
+        addresses: List[str],
+        network: Optional[DefiNetwork] = DefiNetwork.SOLANA,
+    ) -> List[TokenPrice]:
         """
 		Get the price of multiple tokens.
         """
-        address_list: str = ",".join(addresses)
+        prices: Dict[str, Optional[TokenPrice]] = self._multi_price(addresses, network)
+        return [price for price in (prices.get(address) for address in addresses) if price is not None]
+
+    async def get_multi_price_async(
+        self,
+        addresses: List[str],
+        network: Optional[DefiNetwork] = DefiNetwork.SOLANA,
+    ) -> List[TokenPrice]:
+        """
+		Async version of `get_multi_price` method - Get the price of multiple tokens.
+        """
+        prices: Dict[str, Optional[TokenPrice]] = await self._multi_price_async(addresses, network)
+        return [price for price in (prices.get(address) for address in addresses) if price is not None]
+
+    def _multi_price(self, addresses: List[str], network: DefiNetwork) -> Dict[str, Optional[TokenPrice]]:
         response = self.client.api_request(
             "multi_price",
             HttpRequestMethod.GET,
             params={
-                "list_address": address_list,
-            },
-            headers={
-                "X-API-KEY": self.config.api_key,
+                "list_address": ",".join(addresses),
             },
+            headers={"X-API-KEY": self.config.api_key,
+                     "X-CHAIN": network.value},
+            parser=self.parser(MultiTokenPriceResponse),
         )
-        return [TokenPrice(**token) for token in response.get("data", [])]
+        return response.data or {}
 
-    async def get_multi_price_async(self, addresses: List[str]) -> List[TokenPrice]:
-        """
-		Async version of `get_multi_price` method - Get the price of multiple tokens.
-        """
+    async def _multi_price_async(self, addresses: List[str], network: DefiNetwork) -> Dict[str, Optional[TokenPrice]]:
         response = await self.client.api_request_async(
-            f"multi_price",
+            "multi_price",
             HttpRequestMethod.GET,
             params={
                 "list_address": ",".join(addresses),
             },
-            headers={
-                "X-API-KEY": self.config.api_key,
-            },
+            headers={"X-API-KEY": self.config.api_key,
+                     "X-CHAIN": network.value},
+            parser=self.parser(MultiTokenPriceResponse),
         )
-        return [TokenPrice(**token) for token in response.get("data", [])]
+        return response.data or {}
+
+    def _price_chunks(
+        self,
+        addresses: Union[Iterable[str], Mapping[DefiNetwork, Iterable[str]]],
+        network: DefiNetwork,
+    ) -> List[Tuple[List[str], DefiNetwork]]:
+        groups: Mapping[DefiNetwork, Iterable[str]] = (
+            addresses if isinstance(addresses, Mapping) else {network: addresses})
+        return [
+            (chunk, group)
+            for group, members in groups.items()
+            for chunk in chunked(members, self.config.max_addresses)
+        ]
+
+    def get_prices(
+        self,
+        addresses: Union[Iterable[str], Mapping[DefiNetwork, Iterable[str]]],
+        network: DefiNetwork = DefiNetwork.SOLANA,
+    ) -> BulkPrices:
+        """
+        Get the prices of any number of tokens, `max_addresses` per `multi_price` request.
+
+        `addresses` are on `network`, or grouped by network in a mapping; every chunk is sent
+        with the `X-CHAIN` of its network, on the thread pool of the client.  A failed chunk
+        is reported in `errors` while the other chunks still return their prices.
+        """
+        chunks: List[Tuple[List[str], DefiNetwork]] = self._price_chunks(addresses, network)
+        results: List[Any] = self.batch_map(
+            self._multi_price, [chunk for chunk, _ in chunks], [group for _, group in chunks], return_exceptions=True)
+        return _bulk_prices(chunks, results)
+
+    async def get_prices_async(
+        self,
+        addresses: Union[Iterable[str], Mapping[DefiNetwork, Iterable[str]]],
+        network: DefiNetwork = DefiNetwork.SOLANA,
+    ) -> BulkPrices:
+        """
+        Async version of `get_prices`, running the chunks of every network concurrently.
+        """
+        chunks: List[Tuple[List[str], DefiNetwork]] = self._price_chunks(addresses, network)
+        results: List[Any] = await batch_map_async(
+            self._multi_price_async,
+            [chunk for chunk, _ in chunks],
+            [group for _, group in chunks],
+            return_exceptions=True,
+        )
+        return _bulk_prices(chunks, results)
+
+
+def _bulk_prices(chunks: List[Tuple[List[str], DefiNetwork]], results: List[Any]) -> BulkPrices:
+    bulk: BulkPrices = BulkPrices()
+    for (chunk, network), result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            bulk.errors.append(PriceChunkError(network=network, addresses=chunk, error=result))
+            continue
+        for address in chunk:
+            price: Optional[TokenPrice] = result.get(address)
+            if price is not None:
+                bulk.prices[address] = price
+    return bulk
@@ -1,16 +1,26 @@
 """
 Python module for BirdEye API models.
 """
-from datetime import datetime
+from datetime import datetime, timezone, tzinfo
 from enum import Enum
+from functools import cached_property, lru_cache
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import Field, model_validator
+from pydantic import Field, computed_field
 import tzlocal
 
+from ..common.compact import compact_model
 from ..common.easymodel import EasyModel
 
 
+@lru_cache(maxsize=1)
+def local_zone() -> tzinfo:
+    """
+    Get the local timezone, looked up once per process.
+    """
+    return tzlocal.get_localzone()
+
+
 class DefiNetwork(Enum):
     """
     Enum class for DeFi networks.
@@ -101,20 +111,69 @@ class TokenPrice(EasyModel):
     value: Optional[float] = Field(default=None, alias="value")
     updateUnixTime: Optional[datetime] = Field(
         default=None, alias="updateUnixTime")
-    updateHumanTime: Optional[str] = Field(
-        default=None, alias="updateHumanTime")
     liquidity: Optional[float] = Field(default=None, alias="liquidity")
 
-    @model_validator(mode="before")
-    def serialize_model(cls, values: Dict[str, Any]) -> Any:
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def updateHumanTime(self) -> Optional[str]:
         """
-        Serialize the model.
+        The update time in the local timezone, formatted on first access.
         """
-        update_unix_time: int | None = values.get("updateUnixTime")
-        if isinstance(update_unix_time, int):
-            time_stamp: datetime = datetime.fromtimestamp(
-                update_unix_time, tz=tzlocal.get_localzone())
-            values["updateHumanTime"] = time_stamp.strftime(
-                "%m-%d-%Y @ %H:%M:%S %p (%Z)")
-            values["updateUnixTime"] = update_unix_time
-        return values
+        update_time: Any = self.updateUnixTime
+        if isinstance(update_time, int):
+            update_time = datetime.fromtimestamp(update_time, tz=timezone.utc)
+        if update_time is None:
+            return None
+        return update_time.astimezone(local_zone()).strftime("%m-%d-%Y @ %H:%M:%S %p (%Z)")
+
+
+class TokenPriceResponse(EasyModel):
+    """
+    Model class for the BirdEye `price` response.
+    """
+    data: Optional[TokenPrice] = Field(default=None, alias="data")
+    success: bool = Field(default=True, alias="success")
+
+
+class MultiTokenPriceResponse(EasyModel):
+    """
+    Model class for the BirdEye `multi_price` response, keyed by token address.
+    """
+    data: Optional[Dict[str, Optional[TokenPrice]]] = Field(default=None, alias="data")
+    success: bool = Field(default=True, alias="success")
+
+
+class PriceChunkError(EasyModel):
+    """
+    Model class for a failed chunk of a bulk price request.
+    """
+    network: DefiNetwork = Field(default=..., alias="network")
+    addresses: List[str] = Field(default_factory=list, alias="addresses")
+    error: BaseException = Field(default=..., alias="error")
+
+
+class BulkPrices(EasyModel):
+    """
+    Model class for the result of a bulk price request: the prices found, keyed by token
+    address, and the chunks that failed.
+    """
+    prices: Dict[str, TokenPrice] = Field(default_factory=dict, alias="prices")
+    errors: List[PriceChunkError] = Field(default_factory=list, alias="errors")
+
+    @property
+    def failed(self) -> List[str]:
+        """
+        The addresses of the failed chunks.
+        """
+        return [address for error in self.errors for address in error.addresses]
+
+
+class SupportedNetworksResponse(EasyModel):
+    """
+    Model class for the BirdEye `networks` response.
+    """
+    data: Optional[List[DefiNetwork]] = Field(default=None, alias="data")
+    success: bool = Field(default=True, alias="success")
+
+
+CompactTokenPrice = compact_model(TokenPrice)
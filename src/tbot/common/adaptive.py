@@ -0,0 +1,131 @@
+"""
+Python module for adapting a rate limiter to the throttling signals of an API.
+"""
+from email.utils import parsedate_to_datetime
+import threading
+import time
+from typing import Any, Mapping, Optional
+
+from pydantic import Field, PrivateAttr
+
+from .easymodel import EasyModel
+
+
+def _number(value: Any) -> Optional[float]:
+    if not isinstance(value, (str, bytes, int, float)):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after(headers: Mapping[str, Any]) -> Optional[float]:
+    """
+    Get the seconds a `Retry-After` header asks to wait, given as seconds or as an HTTP date.
+    """
+    value: Any = headers.get("Retry-After")
+    seconds: Optional[float] = _number(value)
+    if seconds is None and isinstance(value, str):
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return max(0.0, seconds) if seconds is not None else None
+
+
+def ratelimit_reset(value: Any) -> Optional[float]:
+    """
+    Get the seconds until an `X-RateLimit-Reset` window resets.
+
+    Providers send either the seconds left or the reset time as a Unix timestamp, in seconds or milliseconds.
+    """
+    reset: Optional[float] = _number(value)
+    if reset is None:
+        return None
+    if reset > 1e12:
+        reset /= 1000
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+def ratelimit_limit(value: Any, period: float) -> Optional[float]:
+    """
+    Get the rate in calls per second an `X-RateLimit-Limit` header allows.
+
+    The header holds the calls allowed per window, optionally with the window length in a
+    `w=` parameter (`100;w=60`); without one the window is taken to be `period` seconds.
+    """
+    text: str = value.decode() if isinstance(value, bytes) else str(value) if value is not None else ""
+    limit_part, *parameters = text.split(",")[0].split(";")
+    limit: Optional[float] = _number(limit_part.strip())
+    window: Optional[float] = period
+    for parameter in parameters:
+        name, _, number = parameter.partition("=")
+        if name.strip() == "w":
+            window = _number(number.strip())
+    return limit / window if limit and window else None
+
+
+class AdaptiveRate(EasyModel):
+    """
+    An AIMD controller that tunes the rate of a `RateLimiter` to what the API actually allows.
+
+    Each successful response adds `increase` calls per second, up to `ceiling`.  A 429
+    multiplies the rate by `decrease`, down to `floor`, so the controller settles just below
+    the point where the provider starts throttling.  A `Retry-After` header holds back every
+    call for as long as it asks.  `X-RateLimit-Remaining` and `X-RateLimit-Reset` cap the rate
+    at what is left of the current window, or pause until the reset when nothing is left.
+
+    The ceiling starts at the limiter's rate unless given, and follows `X-RateLimit-Limit`
+    whenever the provider announces its limit, so the rate can climb above a cautious guess.
+    """
+    limiter: Any = Field(default=..., alias="limiter")
+    ceiling: float = Field(default=0, alias="ceiling")
+    floor: float = Field(default=0, alias="floor")
+    increase: float = Field(default=0, alias="increase")
+    decrease: float = Field(default=0.5, alias="decrease")
+    throttled: int = Field(default=0, alias="throttled")
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.ceiling = self.ceiling or self.limiter.rate
+        self.floor = self.floor or self.ceiling / 100
+        self.increase = self.increase or self.ceiling / 50
+
+    @property
+    def rate(self) -> float:
+        """
+        The learned rate in calls per second.
+        """
+        return self.limiter.rate
+
+    def observe(self, status: int, headers: Mapping[str, Any]) -> None:
+        """
+        Adjust the rate to the status and headers of a response.
+        """
+        wait: Optional[float] = retry_after(headers)
+        with self._lock:
+            rate: float = self.limiter.rate
+            limit: Optional[float] = ratelimit_limit(headers.get("X-RateLimit-Limit"), self.limiter.period)
+            if limit is not None:
+                self.ceiling = max(self.floor, limit)
+                rate = min(rate, self.ceiling)
+            if status == 429:
+                self.throttled += 1
+                rate = max(self.floor, rate * self.decrease)
+            elif 200 <= status < 400:
+                rate = min(self.ceiling, rate + self.increase)
+            remaining: Optional[float] = _number(headers.get("X-RateLimit-Remaining"))
+            reset: Optional[float] = ratelimit_reset(headers.get("X-RateLimit-Reset"))
+            if remaining is not None and reset:
+                if remaining <= 0:
+                    wait = max(wait or 0.0, reset)
+                else:
+                    rate = max(self.floor, min(rate, remaining / reset))
+            if rate != self.limiter.rate:
+                self.limiter.set_rate(rate)
+        if wait:
+            self.limiter.defer(wait)
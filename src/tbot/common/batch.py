@@ -0,0 +1,64 @@
+"""
+Python module for fanning calls out over a bounded thread pool or the event loop.
+"""
+import asyncio
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> List[List[T]]:
+    """
+    Split `items` into lists of at most `size` items, dropping duplicates but keeping the first-seen order.
+    """
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive, got {size}")
+    unique: Sequence[T] = list(dict.fromkeys(items))
+    return [list(unique[start:start + size]) for start in range(0, len(unique), size)]
+
+
+def batch_map(
+    func: Callable[..., Any],
+    *iterables: Iterable[Any],
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Call `func` once per item of the zipped iterables on a bounded thread pool.
+
+    Results are returned in input order.  When `return_exceptions` is set, failed calls
+    yield their exception in place of a result instead of raising the first one.
+    """
+    owned: bool = executor is None
+    pool: Executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures: List[Future[Any]] = [pool.submit(func, *args) for args in zip(*iterables)]
+        results: List[Any] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise e
+                results.append(e)
+        return results
+    finally:
+        if owned:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def batch_map_async(
+    func: Callable[..., Awaitable[Any]],
+    *iterables: Iterable[Any],
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    Await `func` once per item of the zipped iterables, all at once.
+
+    Results are returned in input order; the rate limiter of the client the calls go through
+    sets the actual pace.  When `return_exceptions` is set, failed calls yield their exception
+    in place of a result instead of raising the first one.
+    """
+    return list(await asyncio.gather(*(func(*args) for args in zip(*iterables)), return_exceptions=return_exceptions))
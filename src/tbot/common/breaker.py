@@ -0,0 +1,245 @@
+"""
+Python module for circuit breakers that stop calling an endpoint while it is failing.
+"""
+from collections import deque
+from enum import Enum
+from functools import wraps
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, Hashable, List, NamedTuple, Optional
+
+from pydantic import Field, PrivateAttr
+
+from .deadline import DeadlineExceeded
+from .easymodel import EasyModel
+
+
+class CircuitState(Enum):
+    """
+    Enum class for the states of a circuit breaker.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """
+    Raised instead of making a call while its circuit is open.
+    """
+
+    def __init__(self, key: Hashable, retry_in: float) -> None:
+        super().__init__(key, retry_in)
+        self.key: Hashable = key
+        self.retry_in: float = retry_in
+
+    def __str__(self) -> str:
+        return f"Circuit {self.key} is open, retry in {self.retry_in:.1f}s"
+
+
+class Transition(NamedTuple):
+    """
+    A change of state of a circuit, with its wall-clock time.
+    """
+    key: Hashable
+    old: CircuitState
+    new: CircuitState
+    at: float
+
+
+class CircuitBreaker(EasyModel):
+    """
+    A circuit breaker for one endpoint, tripped by the failure rate of its recent calls.
+
+    While `closed`, the outcomes of the last `window` calls are kept; once at least
+    `min_calls` of them are known and `failure_rate` of them failed, the circuit opens.  An
+    `open` circuit rejects every call with `CircuitOpen` for `open_for` seconds, then turns
+    `half_open` and lets `half_open_calls` probes through: a successful probe closes it and
+    a failed one opens it again.
+    """
+    key: Any = Field(default="*", alias="key")
+    window: int = Field(default=20, alias="window")
+    min_calls: int = Field(default=10, alias="min_calls")
+    failure_rate: float = Field(default=0.5, alias="failure_rate")
+    open_for: float = Field(default=30.0, alias="open_for")
+    half_open_calls: int = Field(default=1, alias="half_open_calls")
+    state: CircuitState = Field(default=CircuitState.CLOSED, alias="state")
+    rejected: int = Field(default=0, alias="rejected")
+    listeners: List[Callable[[Transition], None]] = Field(default_factory=list, alias="listeners")
+    _outcomes: Deque[bool] = PrivateAttr()
+    _opened_at: float = PrivateAttr(default=0.0)
+    _probes: int = PrivateAttr(default=0)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._outcomes = deque(maxlen=self.window)
+
+    def _move(self, new: CircuitState) -> Transition:
+        old: CircuitState = self.state
+        self.state = new
+        self._outcomes.clear()
+        self._probes = 0
+        if new is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        return Transition(self.key, old, new, time.time())
+
+    def _notify(self, transition: Optional[Transition]) -> None:
+        if transition is not None:
+            for listener in self.listeners:
+                listener(transition)
+
+    def before_call(self) -> None:
+        """
+        Let a call through, or raise `CircuitOpen` if the circuit rejects it.
+        """
+        transition: Optional[Transition] = None
+        with self._lock:
+            if self.state is CircuitState.OPEN:
+                retry_in: float = self._opened_at + self.open_for - time.monotonic()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpen(self.key, retry_in)
+                transition = self._move(CircuitState.HALF_OPEN)
+            if self.state is CircuitState.HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpen(self.key, 0.0)
+                self._probes += 1
+        self._notify(transition)
+
+    def record(self, success: bool) -> None:
+        """
+        Record the outcome of a call that was let through.
+        """
+        transition: Optional[Transition] = None
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN:
+                transition = self._move(CircuitState.CLOSED if success else CircuitState.OPEN)
+            elif self.state is CircuitState.CLOSED:
+                self._outcomes.append(success)
+                failures: int = self._outcomes.count(False)
+                calls: int = len(self._outcomes)
+                if calls >= self.min_calls and failures and failures >= self.failure_rate * calls:
+                    transition = self._move(CircuitState.OPEN)
+        self._notify(transition)
+
+    def release(self) -> None:
+        """
+        Forget a call that was let through but ended without an outcome, such as a cancelled probe.
+        """
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+
+class CircuitBreakers(EasyModel):
+    """
+    The circuit breakers of a client, one per host and route, created on first use with shared settings.
+
+    The last state changes are kept in `transitions`, and every change is passed to `listeners`.
+    """
+    settings: Dict[str, Any] = Field(default_factory=dict, alias="settings")
+    listeners: List[Callable[[Transition], None]] = Field(default_factory=list, alias="listeners")
+    transitions: Deque[Transition] = Field(default_factory=lambda: deque(maxlen=100), alias="transitions")
+    _breakers: Dict[Hashable, CircuitBreaker] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def get(self, key: Hashable) -> CircuitBreaker:
+        found: Optional[CircuitBreaker] = self._breakers.get(key)
+        if found is not None:
+            return found
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(key=key, listeners=[self._notify], **self.settings)
+            return self._breakers[key]
+
+    def _notify(self, transition: Transition) -> None:
+        self.transitions.append(transition)
+        for listener in self.listeners:
+            listener(transition)
+
+    def states(self) -> Dict[Hashable, CircuitState]:
+        """
+        The current state of every circuit, for monitoring.
+        """
+        return {key: breaker.state for key, breaker in self._breakers.items()}
+
+
+def _breaker_for(self: Any, *args: Any, **kwargs: Any) -> Optional[CircuitBreaker]:
+    breakers: Optional[CircuitBreakers] = getattr(self, "circuit_breakers", None)
+    if breakers is None:
+        return None
+    return breakers.get(self.circuit_key(*args, **kwargs))
+
+
+def _is_failure(self: Any, error: BaseException) -> bool:
+    is_failure: Optional[Callable[[BaseException], bool]] = getattr(self, "is_circuit_failure", None)
+    return is_failure(error) if is_failure is not None else True
+
+
+def circuit_breaker_async() -> Callable[..., Callable[..., Any]]:
+    """
+    An asynchronous decorator that rejects calls while the circuit of their endpoint is open.
+
+    The decorated object provides `circuit_breakers`, a `circuit_key` method naming the circuit
+    of a call and optionally an `is_circuit_failure` method telling failures from other errors.
+    Calls that never reached the endpoint, rejected by a nested circuit or out of time while
+    waiting on the rate limiter, count neither way and give their probe slot back.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(wrapped=func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            breaker: Optional[CircuitBreaker] = _breaker_for(self, *args, **kwargs)
+            if breaker is None:
+                return await func(self, *args, **kwargs)
+            breaker.before_call()
+            try:
+                result: Any = await func(self, *args, **kwargs)
+            except (CircuitOpen, DeadlineExceeded):
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record(not _is_failure(self, e))
+                raise e
+            except BaseException:
+                breaker.release()
+                raise
+            breaker.record(True)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def circuit_breaker() -> Callable[..., Callable[..., Any]]:
+    """
+    A synchronous decorator that rejects calls while the circuit of their endpoint is open.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(wrapped=func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            breaker: Optional[CircuitBreaker] = _breaker_for(self, *args, **kwargs)
+            if breaker is None:
+                return func(self, *args, **kwargs)
+            breaker.before_call()
+            try:
+                result: Any = func(self, *args, **kwargs)
+            except (CircuitOpen, DeadlineExceeded):
+                breaker.release()
+                raise
+            except Exception as e:
+                breaker.record(not _is_failure(self, e))
+                raise e
+            except BaseException:
+                breaker.release()
+                raise
+            breaker.record(True)
+            return result
+
+        return wrapper
+
+    return decorator
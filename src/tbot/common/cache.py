@@ -0,0 +1,333 @@
+"""
+A bounded in-memory response cache with LRU and per-route TTL eviction.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from fnmatch import fnmatchcase
+from functools import wraps
+import threading
+import time
+from typing import Any, Callable, Coroutine, Hashable, List, NamedTuple, Optional, Set
+
+from cachetools import TLRUCache
+from pydantic import Field, PrivateAttr
+from .breaker import CircuitOpen
+from .easymodel import EasyModel
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """
+    Get the HTTP status carried by a `requests` or `aiohttp` error, if any.
+    """
+    status: Optional[int] = getattr(error, "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+class CachePolicy(EasyModel):
+    """
+    Time-to-live of responses whose route matches a glob pattern, such as `pair/*/analytic/*`.
+
+    Negative results, a payload whose `negative_field` is null or an error with one of the
+    `negative_statuses`, are remembered for `negative_ttl` seconds instead.
+    """
+    route: str = Field(default=..., alias="route")
+    ttl: float = Field(default=..., alias="ttl")
+    max_staleness: Optional[float] = Field(default=None, alias="max_staleness")
+    negative_ttl: float = Field(default=0, alias="negative_ttl")
+    negative_field: Optional[str] = Field(default=None, alias="negative_field")
+    negative_statuses: List[int] = Field(default_factory=lambda: [400, 404], alias="negative_statuses")
+
+    def matches(self, route: str) -> bool:
+        return fnmatchcase(route.lstrip("/"), self.route.lstrip("/"))
+
+    def is_negative(self, value: Any) -> bool:
+        if value is None:
+            return True
+        if self.negative_field is None:
+            return False
+        if isinstance(value, dict):
+            return value.get(self.negative_field) is None
+        return getattr(value, self.negative_field, False) is None
+
+
+class CacheEntry(NamedTuple):
+    """
+    A cached value, or a remembered error, with the monotonic times at which it goes stale, stops
+    being served stale and expires.
+    """
+    value: Any
+    fresh_until: float
+    expires_at: float
+    error: Optional[BaseException] = None
+    stale_until: Optional[float] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.fresh_until
+
+    def unwrap(self) -> Any:
+        """
+        Return the cached value, or raise a fresh copy of the remembered error.
+
+        Each caller gets its own exception with an empty traceback, so concurrent callers do
+        not share one mutable instance and the traceback does not grow with every hit.
+        """
+        if self.error is not None:
+            try:
+                error: BaseException = copy.copy(self.error)
+            except Exception:
+                error = self.error
+            raise error.with_traceback(None)
+        return self.value
+
+
+class ResponseCache(EasyModel):
+    """
+    A bounded response cache that evicts least recently used entries and expired entries.
+    """
+    maxsize: int = Field(default=1024, alias="maxsize")
+    policies: List[CachePolicy] = Field(default_factory=list, alias="policies")
+    fallback_ttl: float = Field(default=0, alias="fallback_ttl")
+    hits: int = Field(default=0, alias="hits")
+    stale_hits: int = Field(default=0, alias="stale_hits")
+    misses: int = Field(default=0, alias="misses")
+    _store: TLRUCache = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _refreshing: Set[Hashable] = PrivateAttr(default_factory=set)
+    _tasks: Set[asyncio.Task] = PrivateAttr(default_factory=set)  # type: ignore
+    _executor: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._store = TLRUCache(
+            maxsize=self.maxsize, ttu=lambda _key, entry, _now: entry.expires_at, timer=time.monotonic)
+
+    def policy_for(self, route: str) -> Optional[CachePolicy]:
+        """
+        Get the first policy matching the route, if any.
+        """
+        for policy in self.policies:
+            if policy.matches(route):
+                return policy
+        return None
+
+    def get(self, key: Hashable, allow_stale: bool = False, fallback: bool = False) -> Optional[CacheEntry]:
+        """
+        Get the entry for a key, counting the lookup as a hit or a miss.
+
+        Entries past their TTL are only returned within their staleness window when `allow_stale`
+        is set, or until they expire when `fallback` is set because the upstream is unavailable.
+        """
+        with self._lock:
+            entry: Optional[CacheEntry] = self._store.get(key)
+            if entry is not None and not entry.fresh and not fallback and not (
+                allow_stale and (entry.stale_until is None or time.monotonic() < entry.stale_until)
+            ):
+                entry = None
+            if entry is None:
+                self.misses += 1
+            elif entry.fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry
+
+    def set(self, key: Hashable, value: Any, ttl: float, max_staleness: float = 0) -> None:
+        """
+        Store a value for `ttl` seconds, and keep serving it stale for up to `max_staleness` more.
+
+        The value is kept `fallback_ttl` seconds longer still, as a fallback while its upstream is down.
+        """
+        if ttl <= 0:
+            return
+        now: float = time.monotonic()
+        with self._lock:
+            self._store[key] = CacheEntry(
+                value=value, fresh_until=now + ttl, expires_at=now + ttl + max_staleness + self.fallback_ttl,
+                stale_until=now + ttl + max_staleness)
+
+    def store(self, key: Hashable, value: Any, policy: CachePolicy, max_staleness: float = 0) -> None:
+        """
+        Store a response under its policy, using the negative TTL for empty results.
+        """
+        if policy.negative_ttl > 0 and policy.is_negative(value):
+            self.set(key, value, policy.negative_ttl)
+        else:
+            self.set(key, value, policy.ttl, max_staleness)
+
+    def store_error(self, key: Hashable, error: BaseException, policy: CachePolicy) -> None:
+        """
+        Remember an error for the negative TTL if its status marks an unknown resource.
+        """
+        if policy.negative_ttl > 0 and error_status(error) in policy.negative_statuses:
+            now: float = time.monotonic()
+            with self._lock:
+                self._store[key] = CacheEntry(
+                    value=None, fresh_until=now + policy.negative_ttl,
+                    expires_at=now + policy.negative_ttl, error=error)
+
+    def begin_refresh(self, key: Hashable) -> bool:
+        """
+        Claim the background refresh of a key; returns `False` if one is already running.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def spawn(self, coro: Coroutine[Any, Any, Any]) -> None:
+        """
+        Run a background refresh on the running event loop, keeping a reference until it is done.
+        """
+        task: asyncio.Task = asyncio.ensure_future(coro)  # type: ignore
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def submit(self, func: Callable[[], Any]) -> None:
+        """
+        Run a background refresh on a small thread pool owned by the cache.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tbot-cache")
+            executor: ThreadPoolExecutor = self._executor
+        executor.submit(func)
+
+    def close(self) -> None:
+        """
+        Shut down the background refresh thread pool; it is started again on the next refresh.
+        """
+        with self._lock:
+            executor: Optional[ThreadPoolExecutor] = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._store.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._store)
+
+
+def cached() -> Callable[..., Callable[..., Any]]:
+    """
+    A synchronous decorator that serves responses from the `response_cache` of the object.
+
+    The decorated object provides a `cache_policy` method returning the policy of a call,
+    or `None` when the call is not cacheable, a `cache_staleness` method returning how
+    long a stale response may still be served, and a `request_key` method.  While the
+    circuit of a call is open, any response the cache still holds is served instead.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        def fill(
+            self: Any, cache: ResponseCache, key: Hashable, policy: CachePolicy, *args: Any, **kwargs: Any
+        ) -> Any:
+            try:
+                result: Any = func(self, *args, **kwargs)
+            except Exception as e:
+                cache.store_error(key, e, policy)
+                raise e
+            cache.store(key, result, policy, self.cache_staleness(policy))
+            return result
+
+        def refresh(
+            self: Any, cache: ResponseCache, key: Hashable, policy: CachePolicy, *args: Any, **kwargs: Any
+        ) -> None:
+            try:
+                fill(self, cache, key, policy, *args, **kwargs)
+            except Exception:
+                pass
+            finally:
+                cache.end_refresh(key)
+
+        @wraps(wrapped=func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            cache: Optional[ResponseCache] = getattr(self, "response_cache", None)
+            policy: Optional[CachePolicy] = self.cache_policy(*args, **kwargs) if cache is not None else None
+            if cache is None or policy is None:
+                return func(self, *args, **kwargs)
+            key: Hashable = self.request_key(*args, **kwargs)
+            entry: Optional[CacheEntry] = cache.get(key, allow_stale=self.cache_staleness(policy) > 0)
+            if entry is not None:
+                if not entry.fresh and cache.begin_refresh(key):
+                    cache.submit(lambda: refresh(self, cache, key, policy, *args, **kwargs))
+                return entry.unwrap()
+            try:
+                return fill(self, cache, key, policy, *args, **kwargs)
+            except CircuitOpen:
+                entry = cache.get(key, fallback=True)
+                if entry is None:
+                    raise
+                return entry.unwrap()
+
+        return wrapper
+
+    return decorator
+
+
+def cached_async() -> Callable[..., Callable[..., Any]]:
+    """
+    An asynchronous decorator that serves responses from the `response_cache` of the object.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        async def fill(
+            self: Any, cache: ResponseCache, key: Hashable, policy: CachePolicy, *args: Any, **kwargs: Any
+        ) -> Any:
+            try:
+                result: Any = await func(self, *args, **kwargs)
+            except Exception as e:
+                cache.store_error(key, e, policy)
+                raise e
+            cache.store(key, result, policy, self.cache_staleness(policy))
+            return result
+
+        async def refresh(
+            self: Any, cache: ResponseCache, key: Hashable, policy: CachePolicy, *args: Any, **kwargs: Any
+        ) -> None:
+            try:
+                await fill(self, cache, key, policy, *args, **kwargs)
+            except Exception:
+                pass
+            finally:
+                cache.end_refresh(key)
+
+        @wraps(wrapped=func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            cache: Optional[ResponseCache] = getattr(self, "response_cache", None)
+            policy: Optional[CachePolicy] = self.cache_policy(*args, **kwargs) if cache is not None else None
+            if cache is None or policy is None:
+                return await func(self, *args, **kwargs)
+            key: Hashable = self.request_key(*args, **kwargs)
+            entry: Optional[CacheEntry] = cache.get(key, allow_stale=self.cache_staleness(policy) > 0)
+            if entry is not None:
+                if not entry.fresh and cache.begin_refresh(key):
+                    cache.spawn(refresh(self, cache, key, policy, *args, **kwargs))
+                return entry.unwrap()
+            try:
+                return await fill(self, cache, key, policy, *args, **kwargs)
+            except CircuitOpen:
+                entry = cache.get(key, fallback=True)
+                if entry is None:
+                    raise
+                return entry.unwrap()
+
+        return wrapper
+
+    return decorator
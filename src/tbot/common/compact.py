@@ -0,0 +1,221 @@
+"""
+This module generates compact `__slots__` counterparts of EasyModel classes for holding many instances.
+"""
+from functools import cached_property, lru_cache
+import types
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic.fields import FieldInfo
+from pydantic_core import PydanticUndefined
+
+from .easymodel import EasyModel
+from .intern import intern_str, is_interned
+
+
+class CompactModel:
+    """
+    Base class of compact models: slotted, unvalidated records with the attribute names of their model.
+
+    They are built from trusted payloads, such as known API responses, with the values stored
+    exactly as received: no coercion happens, so a field sent as a string stays a string.
+    """
+    __slots__ = ()
+    __compact_fields__: Tuple[Tuple[str, str, Callable[[Any], Any], Callable[[], Any]], ...] = ()
+    __compact_build__: Callable[[Dict[str, Any]], "CompactModel"]
+    __model__: Type[EasyModel]
+
+    def __init__(self, **kwargs: Any) -> None:
+        for name, _alias, _build, default in self.__compact_fields__:
+            setattr(self, name, kwargs[name] if name in kwargs else default())
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactModel":
+        """
+        Build an instance from a payload keyed by field aliases or names, without validation.
+        """
+        try:
+            return cls.__compact_build__(data)
+        except KeyError:
+            pass
+        instance: CompactModel = cls.__new__(cls)
+        for name, alias, build, default in cls.__compact_fields__:
+            value: Any = data[alias] if alias in data else data[name] if name in data else default()
+            setattr(instance, name, build(value) if value is not None else None)
+        return instance
+
+    @classmethod
+    def from_model(cls, model: EasyModel) -> "CompactModel":
+        """
+        Convert a full model instance, converting nested models as well.
+        """
+        return cls.from_dict(model.model_dump(by_alias=True))
+
+    def to_model(self) -> EasyModel:
+        """
+        Validate this record into its full model.
+        """
+        return self.__model__(**self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {alias: _dump(getattr(self, name)) for name, alias, _build, _default in self.__compact_fields__}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, *_ in self.__compact_fields__)
+
+    def __repr__(self) -> str:
+        fields: str = ", ".join(f"{name}={getattr(self, name)!r}" for name, *_ in self.__compact_fields__)
+        return f"{type(self).__name__}({fields})"
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, CompactModel):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _dump(item) for key, item in value.items()}
+    return value
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _compact_builder(tp: Any) -> Callable[[Any], Any]:
+    """
+    Get the function that builds the compact value of an annotation, recursing into models and containers.
+    """
+    origin: Any = get_origin(tp)
+    if origin is Annotated:
+        return intern_str if is_interned(tp.__metadata__) else _compact_builder(get_args(tp)[0])
+    if origin in (Union, types.UnionType):
+        members: List[Any] = [arg for arg in get_args(tp) if arg is not type(None)]
+        return _compact_builder(members[0]) if len(members) == 1 else _identity
+    if origin in (list, List):
+        (item_tp,) = get_args(tp) or (Any,)
+        build_item: Callable[[Any], Any] = _compact_builder(item_tp)
+        if build_item is _identity:
+            return _identity
+        return lambda values: [build_item(value) if value is not None else None for value in values]
+    if origin in (dict, Dict):
+        args: Tuple[Any, ...] = get_args(tp)
+        build_value: Callable[[Any], Any] = _compact_builder(args[1]) if len(args) == 2 else _identity
+        if build_value is _identity:
+            return _identity
+        return lambda values: {key: build_value(value) if value is not None else None for key, value in values.items()}
+    if isinstance(tp, type) and issubclass(tp, EasyModel):
+        return compact_model(tp).from_dict
+    return _identity
+
+
+def _field_builder(field: FieldInfo) -> Callable[[Any], Any]:
+    return intern_str if is_interned(field.metadata) else _compact_builder(field.annotation)
+
+
+def _default_of(field: FieldInfo) -> Callable[[], Any]:
+    if field.default_factory is not None:
+        factory: Callable[[], Any] = field.default_factory  # type: ignore
+
+        def call_factory() -> Any:
+            try:
+                return factory()
+            except Exception:
+                return None
+        return call_factory
+    default: Any = None if field.default is PydanticUndefined else field.default
+    return lambda: default
+
+
+def _compile_from_dict(compact: Type["CompactModel"], fields: Dict[str, FieldInfo]) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Compile the fast path of `from_dict`, reading every field straight from its alias.
+
+    Generated code avoids a per-field loop and a call per attribute.  A payload that lacks a
+    field without a constant default raises `KeyError`, and `from_dict` takes its general path.
+    """
+    namespace: Dict[str, Any] = {"new": object.__new__, "cls": compact}
+    lines: List[str] = ["def build(data):", "    instance = new(cls)"]
+    for index, (name, field) in enumerate(fields.items()):
+        alias: str = field.alias or name
+        if field.is_required() or field.default_factory is not None:
+            value: str = f"data[{alias!r}]"
+        else:
+            namespace[f"default_{index}"] = field.default
+            value = f"data.get({alias!r}, default_{index})"
+        build: Callable[[Any], Any] = _field_builder(field)
+        if build is not _identity:
+            namespace[f"build_{index}"] = build
+            value = f"None if (value_{index} := {value}) is None else build_{index}(value_{index})"
+        lines.append(f"    instance.{name} = {value}")
+    lines.append("    return instance")
+    exec("\n".join(lines), namespace)  # pylint: disable=exec-used
+    return namespace["build"]
+
+
+def _derived_properties(model: Type[EasyModel]) -> Dict[str, property]:
+    """
+    Get the lazily derived values of a model, such as its cached properties, as plain properties.
+
+    Slotted records cannot cache them, so they are derived again on each access.
+    """
+    derived: Dict[str, property] = {}
+    for klass in reversed(model.__mro__):
+        for attr, value in vars(klass).items():
+            if isinstance(value, cached_property):
+                derived[attr] = property(value.func, doc=value.__doc__)
+    return derived
+
+
+_COMPACT_MODELS: Dict[Type[EasyModel], Type[CompactModel]] = {}
+
+
+def compact_model(model: Type[EasyModel], name: Optional[str] = None) -> Type[CompactModel]:
+    """
+    Get the compact counterpart of a model, generating it and its nested models on first use.
+
+    Instances have no per-instance `__dict__` and keep the attribute names of the model, so
+    code reading attributes works unchanged while each instance uses a fraction of the memory.
+    """
+    if model in _COMPACT_MODELS:
+        return _COMPACT_MODELS[model]
+    compact: Type[CompactModel] = type(
+        name or f"Compact{model.__name__}",
+        (CompactModel,),
+        {
+            "__slots__": tuple(model.model_fields),
+            "__module__": model.__module__,
+            "__doc__": f"Compact `__slots__` counterpart of `{model.__name__}`.",
+            "__model__": model,
+            **_derived_properties(model),
+        },
+    )
+    _COMPACT_MODELS[model] = compact
+    compact.__compact_fields__ = tuple(
+        (field_name, field.alias or field_name, _field_builder(field), _default_of(field))
+        for field_name, field in model.model_fields.items()
+    )
+    compact.__compact_build__ = staticmethod(_compile_from_dict(compact, model.model_fields))  # type: ignore
+    return compact
+
+
+class CompactAdapter:
+    """
+    A parser with the `validate_python` interface of a TypeAdapter that builds compact records instead.
+    """
+
+    def __init__(self, tp: Any) -> None:
+        self.tp: Any = tp
+        self._build: Callable[[Any], Any] = _compact_builder(tp)
+
+    def validate_python(self, payload: Any) -> Any:
+        return self._build(payload) if payload is not None else None
+
+
+@lru_cache(maxsize=None)
+def get_compact_adapter(tp: Any) -> CompactAdapter:
+    """
+    Get the cached compact counterpart of `get_type_adapter` for a type such as `List[Swap]`.
+    """
+    return CompactAdapter(tp)
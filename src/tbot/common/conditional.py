@@ -0,0 +1,64 @@
+"""
+Python module for remembering response validators to make conditional GET requests.
+"""
+import threading
+from typing import Any, Dict, Hashable, NamedTuple, Optional
+
+from cachetools import LRUCache
+from pydantic import Field, PrivateAttr
+from .easymodel import EasyModel
+
+
+class Validators(NamedTuple):
+    """
+    The `ETag` and `Last-Modified` validators of a response and its parsed result.
+    """
+    etag: Optional[str]
+    last_modified: Optional[str]
+    result: Any
+
+    def headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ConditionalCache(EasyModel):
+    """
+    A bounded store of validators per request, used to revalidate instead of re-downloading.
+    """
+    maxsize: int = Field(default=256, alias="maxsize")
+    not_modified: int = Field(default=0, alias="not_modified")
+    _store: LRUCache = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._store = LRUCache(maxsize=self.maxsize)
+
+    def get(self, key: Hashable) -> Optional[Validators]:
+        with self._lock:
+            return self._store.get(key)
+
+    def remember(self, key: Hashable, headers: Any, result: Any) -> None:
+        """
+        Store the validators found in the response headers together with the parsed result.
+        """
+        etag: Optional[str] = headers.get("ETag")
+        last_modified: Optional[str] = headers.get("Last-Modified")
+        with self._lock:
+            if etag is None and last_modified is None:
+                self._store.pop(key, None)
+            else:
+                self._store[key] = Validators(etag=etag, last_modified=last_modified, result=result)
+
+    def revalidated(self, validators: Validators) -> Any:
+        """
+        Count a `304 Not Modified` answer and return the result it confirms.
+        """
+        with self._lock:
+            self.not_modified += 1
+        return validators.result
@@ -0,0 +1,96 @@
+"""
+Python module for per-call deadlines shared by rate limiter waits, retries and requests.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+import time
+from typing import Any, Callable, Iterator, Optional
+
+_DEADLINE: ContextVar[Optional[float]] = ContextVar("tbot_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a call cannot finish before its deadline.
+    """
+
+
+def remaining() -> Optional[float]:
+    """
+    Get the seconds left before the deadline of the current call, or `None` if it has none.
+    """
+    expires_at: Optional[float] = _DEADLINE.get()
+    return None if expires_at is None else expires_at - time.monotonic()
+
+
+def check(wait: float = 0) -> None:
+    """
+    Raise `DeadlineExceeded` if the current call cannot wait `wait` more seconds.
+    """
+    left: Optional[float] = remaining()
+    if left is not None and wait >= left:
+        raise DeadlineExceeded(f"Waiting {wait:.3f}s would miss the deadline by {wait - left:.3f}s")
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Give the calls made in the block `seconds` to finish; a deadline already in force that is sooner still applies.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at: float = time.monotonic() + seconds
+    current: Optional[float] = _DEADLINE.get()
+    token: Any = _DEADLINE.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _DEADLINE.reset(token)
+
+
+def within_deadline_async() -> Callable[..., Callable[..., Any]]:
+    """
+    An asynchronous decorator that runs a coroutine under a deadline covering everything it awaits.
+
+    The deadline is the call's `deadline` keyword argument, or else the `request_deadline` of `self`;
+    a call with no time left raises `DeadlineExceeded` at once.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(wrapped=func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            seconds: Optional[float] = kwargs.pop("deadline", None)
+            if seconds is None:
+                seconds = getattr(self, "request_deadline", None)
+            with deadline(seconds):
+                check()
+                return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def within_deadline() -> Callable[..., Callable[..., Any]]:
+    """
+    A synchronous decorator that runs a function under a deadline covering everything it calls.
+
+    The deadline is the call's `deadline` keyword argument, or else the `request_deadline` of `self`;
+    a call with no time left raises `DeadlineExceeded` at once.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(wrapped=func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            seconds: Optional[float] = kwargs.pop("deadline", None)
+            if seconds is None:
+                seconds = getattr(self, "request_deadline", None)
+            with deadline(seconds):
+                check()
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
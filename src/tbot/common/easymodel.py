@@ -1,9 +1,21 @@
 """
 This module provides a BaseModel subclass that provides easy serialization and deserialization methods.
 """
+from functools import lru_cache
 import json
 from typing import Any, Iterable, Optional, Dict, cast
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """
+    Get the prebuilt TypeAdapter of a type such as `List[PairInfo]`, building it on first use.
+
+    Validating a whole response through one adapter runs a single compiled validator instead
+    of constructing every element with Python-level keyword arguments.
+    """
+    return TypeAdapter(tp)
 
 
 class EasyModel(BaseModel):
@@ -0,0 +1,81 @@
+"""
+Python module for hedging slow requests with a second identical request.
+"""
+import asyncio
+from collections import deque
+import math
+import threading
+from typing import Any, Awaitable, Callable, Deque, List, Optional, Set
+
+from pydantic import Field, PrivateAttr
+
+from .easymodel import EasyModel
+
+
+class LatencyTracker(EasyModel):
+    """
+    The latencies of the last `window` successful requests to an endpoint.
+    """
+    window: int = Field(default=200, alias="window")
+    _samples: Deque[float] = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._samples = deque(maxlen=self.window)
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        The latency below which `percent` of the samples fall, or `None` without samples.
+        """
+        with self._lock:
+            samples: List[float] = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, max(0, math.ceil(percent / 100 * len(samples)) - 1))]
+
+
+async def hedged(
+    send: Callable[[], Awaitable[Any]],
+    delay: Optional[float],
+    may_hedge: Callable[[], bool],
+) -> Any:
+    """
+    Await `send()`, and if it has not answered after `delay` seconds send it again; the first
+    successful answer wins and the other request is cancelled.
+
+    `may_hedge` is asked right before the second request, so it can charge the rate limiter and
+    the hedging budget; the request is not duplicated when it refuses.  If one request fails,
+    the other one still gets the chance to answer.
+    """
+    tasks: List[asyncio.Future] = [asyncio.ensure_future(send())]
+    try:
+        if delay is not None:
+            done: Set[asyncio.Future]
+            done, _pending = await asyncio.wait(tasks, timeout=delay)
+            if not done and may_hedge():
+                tasks.append(asyncio.ensure_future(send()))
+        pending: Set[asyncio.Future] = set(tasks)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            if not pending:
+                return done.pop().result()
+    finally:
+        losers: List[asyncio.Future] = [task for task in tasks if not task.done()]
+        for task in losers:
+            task.cancel()
+        if losers:
+            await asyncio.wait(losers)
+        for task in tasks:
+            if not task.cancelled():
+                task.exception()
@@ -1,14 +1,37 @@
 """
 This module contains a simple rate-limited HTTP client for making requests to a REST API.
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+import threading
+import time
+from types import TracebackType
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
 import requests
+from requests.adapters import HTTPAdapter
 import aiohttp
-from pydantic import Field, HttpUrl
+from pydantic import Field, HttpUrl, PrivateAttr
 
-from .retry import retry_on_error, retry_on_error_async
-from .ratelimit import RateLimiter, rate_limit, rate_limit_async
+from .adaptive import AdaptiveRate
+from .batch import batch_map
+from .breaker import CircuitBreakers, CircuitOpen, CircuitState, circuit_breaker, circuit_breaker_async
+from .cache import CachePolicy, ResponseCache, cached, cached_async, error_status
+from .hedge import LatencyTracker, hedged
+from .deadline import DeadlineExceeded, remaining, within_deadline, within_deadline_async
+from .conditional import ConditionalCache, Validators
+from .jsoncodec import JsonDecoder, get_decoder, parse_body
+from .singleflight import SingleFlight, request_key, single_flight_async
+from .retry import RetryBudget, retry_on_error, retry_on_error_async
+from .ratelimit import (
+    LimiterRegistry,
+    RateLimiter,
+    RateLimitPolicy,
+    default_registry,
+    rate_limit,
+    rate_limit_async,
+)
 from .easymodel import EasyModel
 
 
@@ -25,11 +48,55 @@ class HttpRequestMethod(Enum):
 class HttpClientConfig(EasyModel):
     """
     Configuration for the Rate-Limited HttpClient class.
+
+    The response cache is opt-in (`cache_enabled`): a cache hit returns the very object parsed for the
+    first caller, so callers that turn it on must treat cached results as read-only.
     """
     base_url: HttpUrl = Field(
         default="https://api.dexscreener.io/latest", alias="base_url")
     ratelimit_max_calls: int = Field(default=300, alias="ratelimit_max_calls")
     ratelimit_period: int = Field(default=60, alias="ratelimit_period")
+    ratelimit_burst: int = Field(default=1, alias="ratelimit_burst")
+    ratelimit_shared: bool = Field(default=True, alias="ratelimit_shared")
+    ratelimit_policies: List[RateLimitPolicy] = Field(default_factory=list, alias="ratelimit_policies")
+    ratelimit_backend: str = Field(default="memory", alias="ratelimit_backend")
+    ratelimit_directory: Optional[str] = Field(default=None, alias="ratelimit_directory")
+    ratelimit_adaptive: bool = Field(default=True, alias="ratelimit_adaptive")
+    ratelimit_ceiling: Optional[float] = Field(default=None, alias="ratelimit_ceiling")
+    request_deadline: Optional[float] = Field(default=None, alias="request_deadline")
+    retry_budget_ratio: Optional[float] = Field(default=0.1, alias="retry_budget_ratio")
+    circuit_breaker: bool = Field(default=True, alias="circuit_breaker")
+    circuit_window: int = Field(default=20, alias="circuit_window")
+    circuit_min_calls: int = Field(default=10, alias="circuit_min_calls")
+    circuit_failure_rate: float = Field(default=0.5, alias="circuit_failure_rate")
+    circuit_open_for: float = Field(default=30.0, alias="circuit_open_for")
+    circuit_half_open_calls: int = Field(default=1, alias="circuit_half_open_calls")
+    circuit_fallback_ttl: float = Field(default=300.0, alias="circuit_fallback_ttl")
+    hedge_requests: bool = Field(default=False, alias="hedge_requests")
+    hedge_percentile: float = Field(default=95.0, alias="hedge_percentile")
+    hedge_min_samples: int = Field(default=20, alias="hedge_min_samples")
+    hedge_budget_ratio: float = Field(default=0.05, alias="hedge_budget_ratio")
+    connector_limit: int = Field(default=100, alias="connector_limit")
+    connector_limit_per_host: int = Field(default=20, alias="connector_limit_per_host")
+    keepalive_timeout: float = Field(default=30.0, alias="keepalive_timeout")
+    dns_cache_ttl: int = Field(default=300, alias="dns_cache_ttl")
+    pool_connections: int = Field(default=10, alias="pool_connections")
+    pool_maxsize: int = Field(default=20, alias="pool_maxsize")
+    batch_max_workers: int = Field(default=8, alias="batch_max_workers")
+    coalesce_requests: bool = Field(default=True, alias="coalesce_requests")
+    coalesce_methods: List[HttpRequestMethod] = Field(
+        default_factory=lambda: [HttpRequestMethod.GET], alias="coalesce_methods")
+    vary_headers: List[str] = Field(
+        default_factory=lambda: ["X-API-KEY", "X-CHAIN"], alias="vary_headers")
+    cache_enabled: bool = Field(default=False, alias="cache_enabled")
+    cache_maxsize: int = Field(default=1024, alias="cache_maxsize")
+    cache_policies: List[CachePolicy] = Field(default_factory=list, alias="cache_policies")
+    stale_while_revalidate: bool = Field(default=False, alias="stale_while_revalidate")
+    max_staleness: float = Field(default=30.0, alias="max_staleness")
+    conditional_requests: bool = Field(default=True, alias="conditional_requests")
+    conditional_cache_maxsize: int = Field(default=256, alias="conditional_cache_maxsize")
+    json_decoder: str = Field(default="auto", alias="json_decoder")
+    validate_json_bytes: bool = Field(default=True, alias="validate_json_bytes")
 
 
 class HttpRequest(EasyModel):
@@ -69,12 +136,233 @@ class HttpClient(EasyModel):
     config: HttpClientConfig = Field(
         default_factory=HttpClientConfig, alias="config")
     rate_limiter: Optional[RateLimiter] = Field(None, alias="rate_limiter")
+    limiter_registry: LimiterRegistry = Field(default_factory=lambda: default_registry, alias="limiter_registry")
+    single_flight: Optional[SingleFlight] = Field(None, alias="single_flight")
+    response_cache: Optional[ResponseCache] = Field(None, alias="response_cache")
+    conditional_cache: Optional[ConditionalCache] = Field(None, alias="conditional_cache")
+    retry_budget: Optional[RetryBudget] = Field(None, alias="retry_budget")
+    circuit_breakers: Optional[CircuitBreakers] = Field(None, alias="circuit_breakers")
+    hedge_budget: Optional[RetryBudget] = Field(None, alias="hedge_budget")
+    _session: Optional[aiohttp.ClientSession] = PrivateAttr(default=None)
+    _session_loop: Optional[asyncio.AbstractEventLoop] = PrivateAttr(default=None)
+    _adapter: Optional[HTTPAdapter] = PrivateAttr(default=None)
+    _sync_sessions: List[requests.Session] = PrivateAttr(default_factory=list)
+    _sync_local: threading.local = PrivateAttr(default_factory=threading.local)
+    _sync_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _executor: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+    _decoder: JsonDecoder = PrivateAttr()
+    _controller: Optional[AdaptiveRate] = PrivateAttr(default=None)
+    _latencies: Dict[str, LatencyTracker] = PrivateAttr(default_factory=dict)
+    _hedged: int = PrivateAttr(default=0)
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.config = HttpClientConfig(**kwargs.get("config", {}))
-        self.rate_limiter = RateLimiter(
-            max_calls=self.config.ratelimit_max_calls, period=self.config.ratelimit_period)
+        if self.rate_limiter is None and not self.config.ratelimit_shared:
+            self.rate_limiter = RateLimiter(
+                max_calls=self.config.ratelimit_max_calls, period=self.config.ratelimit_period,
+                burst=self.config.ratelimit_burst)
+        self.single_flight = SingleFlight() if self.config.coalesce_requests else None
+        self.response_cache = ResponseCache(
+            maxsize=self.config.cache_maxsize, policies=self.config.cache_policies,
+            fallback_ttl=self.config.circuit_fallback_ttl if self.config.circuit_breaker else 0,
+        ) if self.config.cache_enabled else None
+        self.conditional_cache = ConditionalCache(
+            maxsize=self.config.conditional_cache_maxsize
+        ) if self.config.conditional_requests else None
+        self._decoder = get_decoder(self.config.json_decoder)
+        if self.retry_budget is None and self.config.retry_budget_ratio is not None:
+            self.retry_budget = RetryBudget(ratio=self.config.retry_budget_ratio)
+        if self.hedge_budget is None:
+            self.hedge_budget = RetryBudget(ratio=self.config.hedge_budget_ratio)
+        if self.circuit_breakers is None and self.config.circuit_breaker:
+            self.circuit_breakers = CircuitBreakers(settings={
+                "window": self.config.circuit_window,
+                "min_calls": self.config.circuit_min_calls,
+                "failure_rate": self.config.circuit_failure_rate,
+                "open_for": self.config.circuit_open_for,
+                "half_open_calls": self.config.circuit_half_open_calls,
+            })
+
+    def add_cache_policies(self, policies: Iterable[CachePolicy]) -> None:
+        """
+        Append route policies to the response cache; earlier policies take precedence.
+        """
+        if self.response_cache is not None:
+            self.response_cache.policies.extend(policies)
+
+    def add_rate_limits(self, policies: Iterable[RateLimitPolicy]) -> None:
+        """
+        Append endpoint budgets nested in the provider total; every matching policy applies.
+        """
+        self.config.ratelimit_policies.extend(policies)
+
+    def limiter_for(self, endpoint: HttpUrl, method: HttpRequestMethod = HttpRequestMethod.GET, **kwargs: Any) -> Any:
+        """
+        Limiter a request acquires: the client's own `rate_limiter` if it has one, otherwise the
+        registry's endpoint budgets for the route nested in the shared total of its host.
+
+        With the `shared` backend those budgets live in files under `ratelimit_directory` and are
+        shared with the other processes of the host as well.
+        """
+        if self.rate_limiter is not None:
+            return self.rate_limiter
+        return self.limiter_registry.chain(
+            host=self._host(),
+            route=str(endpoint),
+            max_calls=self.config.ratelimit_max_calls,
+            period=self.config.ratelimit_period,
+            burst=self.config.ratelimit_burst,
+            policies=self.config.ratelimit_policies,
+            backend=self.config.ratelimit_backend,
+            directory=self.config.ratelimit_directory,
+        )
+
+    def _host(self) -> str:
+        return urlsplit(str(self.config.base_url)).netloc
+
+    def _host_limiter(self) -> RateLimiter:
+        if self.rate_limiter is not None:
+            return self.rate_limiter
+        return self.limiter_registry.limiter(
+            self._host(), self.config.ratelimit_max_calls, self.config.ratelimit_period, self.config.ratelimit_burst,
+            self.config.ratelimit_backend, self.config.ratelimit_directory)
+
+    def rate_controller(self) -> Optional[AdaptiveRate]:
+        """
+        AIMD controller of the provider total, shared by the clients of the host, or `None` if
+        adaptive rate control is off.
+        """
+        if not self.config.ratelimit_adaptive:
+            return None
+        limiter: RateLimiter = self._host_limiter()
+        if self.rate_limiter is None:
+            return self.limiter_registry.controller(self._host(), self.config.ratelimit_ceiling)
+        if self._controller is None or self._controller.limiter is not limiter:
+            self._controller = AdaptiveRate(limiter=limiter, ceiling=self.config.ratelimit_ceiling or 0)
+        return self._controller
+
+    def observe_response(self, status: int, headers: Mapping[str, Any]) -> None:
+        """
+        Let the rate controller learn from a response: back off on 429s and obey rate-limit headers.
+        """
+        controller: Optional[AdaptiveRate] = self.rate_controller()
+        if controller is not None:
+            controller.observe(status, headers)
+
+    @property
+    def current_rate(self) -> float:
+        """
+        The rate of the provider total in calls per second, as currently learned from responses.
+        """
+        return self._host_limiter().rate
+
+    def __enter__(self) -> "HttpClient":
+        self.get_session()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "HttpClient":
+        await self.get_session_async()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        await self.close_async()
+
+    async def get_session_async(self) -> aiohttp.ClientSession:
+        """
+        Get the pooled session of this client, creating it on first use.
+
+        The session is bound to the running event loop, so a new one is opened if the
+        previous session was closed or belongs to a different loop.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.connector_limit,
+                limit_per_host=self.config.connector_limit_per_host,
+                keepalive_timeout=self.config.keepalive_timeout,
+                ttl_dns_cache=self.config.dns_cache_ttl,
+                use_dns_cache=True,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+
+    async def close_async(self) -> None:
+        """
+        Close the pooled session and release its connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    def get_session(self) -> requests.Session:
+        """
+        Get the pooled `requests` session of the calling thread.
+
+        Every thread gets its own session, and all of them share one connection-pooling
+        adapter, so the client can be used from several threads at once.
+        """
+        session: Optional[requests.Session] = getattr(self._sync_local, "session", None)
+        if session is None:
+            with self._sync_lock:
+                if self._adapter is None:
+                    self._adapter = HTTPAdapter(
+                        pool_connections=self.config.pool_connections,
+                        pool_maxsize=self.config.pool_maxsize,
+                    )
+                session = requests.Session()
+                session.mount("https://", self._adapter)
+                session.mount("http://", self._adapter)
+                self._sync_sessions.append(session)
+            self._sync_local.session = session
+        return session
+
+    def close(self) -> None:
+        """
+        Close the pooled sync sessions, the batch thread pool and the cache refresh thread pool.
+        """
+        if self.response_cache is not None:
+            self.response_cache.close()
+        with self._sync_lock:
+            for session in self._sync_sessions:
+                session.close()
+            self._sync_sessions.clear()
+            self._sync_local = threading.local()
+            self._adapter = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def batch_map(
+        self,
+        func: Callable[..., Any],
+        *iterables: Iterable[Any],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Fan sync calls such as `get_price` out over the bounded thread pool of this client.
+        """
+        with self._sync_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.batch_max_workers, thread_name_prefix="tbot-http")
+            executor: ThreadPoolExecutor = self._executor
+        return batch_map(func, *iterables, executor=executor, return_exceptions=return_exceptions)
 
     @property
     def max_calls(self) -> int:
@@ -90,50 +378,298 @@ class HttpClient(EasyModel):
         """
         return self.config.ratelimit_period
 
+    @property
+    def coalesced_requests(self) -> int:
+        """
+        Number of requests that were answered by an identical in-flight request.
+        """
+        return self.single_flight.saved if self.single_flight is not None else 0
+
     def _create_absolute_url(self, relative: HttpUrl) -> str:
-        return f"{self.config.base_url}/{relative}"
+        return f"{str(self.config.base_url).rstrip('/')}/{str(relative).lstrip('/')}"
+
+    def request_key(
+        self,
+        endpoint: HttpUrl,
+        method: HttpRequestMethod,
+        params: Optional[Any] = None,
+        headers: Optional[Dict[str, Any]] = None,
+        parser: Optional[Any] = None,
+        **kwargs: Any
+    ) -> Tuple[Hashable, ...]:
+        """
+        Identity of a request: method, absolute URL, params, the configured vary headers and the parser.
+
+        Cached, revalidated and coalesced results are parsed values, so callers only share
+        them when they parse with the same parser object; results of unhashable parsers are never shared.
+        """
+        return request_key(
+            method=method.value,
+            url=self._create_absolute_url(relative=endpoint),
+            params=params,
+            headers=headers,
+            vary_headers=self.config.vary_headers,
+        ) + (parser if isinstance(parser, Hashable) else object(),)
+
+    def cache_policy(self, endpoint: HttpUrl, method: HttpRequestMethod, **kwargs: Any) -> Optional[CachePolicy]:
+        """
+        Cache policy of a request, or `None` if its response must not be cached.
+        """
+        if self.response_cache is None or method != HttpRequestMethod.GET or kwargs.get("data") is not None:
+            return None
+        return self.response_cache.policy_for(str(endpoint))
 
+    def cache_staleness(self, policy: CachePolicy) -> float:
+        """
+        How long past its TTL a cached response may be served while it is refreshed in the background.
+        """
+        if not self.config.stale_while_revalidate:
+            return 0
+        return policy.max_staleness if policy.max_staleness is not None else self.config.max_staleness
+
+    def _conditional_validators(
+        self,
+        endpoint: HttpUrl,
+        method: HttpRequestMethod,
+        **kwargs: Any
+    ) -> Tuple[Optional[Tuple[Hashable, ...]], Optional[Validators]]:
+        if self.conditional_cache is None or method != HttpRequestMethod.GET:
+            return None, None
+        key: Tuple[Hashable, ...] = self.request_key(endpoint, method, **kwargs)
+        return key, self.conditional_cache.get(key)
+
+    @property
+    def request_deadline(self) -> Optional[float]:
+        return self.config.request_deadline
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """
+        Whether a failed attempt may succeed if tried again: connection errors, timeouts, 429s and server errors.
+
+        A call past its deadline is not retried.
+        """
+        if isinstance(error, DeadlineExceeded):
+            return False
+        status: Optional[int] = error_status(error)
+        return status is None or status == 429 or status >= 500
+
+    def endpoint_key(self, endpoint: HttpUrl) -> str:
+        """
+        Name of the endpoint of a request: its host and the route pattern of its cache policy, or the whole host.
+
+        Cache policies name each endpoint of a client, so requests for different pairs or tokens
+        of one endpoint share a key.
+        """
+        policy: Optional[CachePolicy] = (
+            self.response_cache.policy_for(str(endpoint)) if self.response_cache is not None else None)
+        return f"{self._host()}/{policy.route.lstrip('/') if policy is not None else '*'}"
+
+    def circuit_key(self, endpoint: HttpUrl, method: HttpRequestMethod = HttpRequestMethod.GET, **kwargs: Any) -> str:
+        """
+        Circuit of a request: one per endpoint.
+        """
+        return self.endpoint_key(endpoint)
+
+    def latency(self, endpoint: HttpUrl) -> LatencyTracker:
+        """
+        Recent latencies of the endpoint of a request.
+        """
+        key: str = self.endpoint_key(endpoint)
+        tracker: Optional[LatencyTracker] = self._latencies.get(key)
+        if tracker is None:
+            tracker = self._latencies.setdefault(key, LatencyTracker())
+        return tracker
+
+    def hedge_delay(self, endpoint: HttpUrl) -> Optional[float]:
+        """
+        How long a GET waits before it is hedged, or `None` until the endpoint has enough latency samples.
+        """
+        tracker: LatencyTracker = self.latency(endpoint)
+        if len(tracker) < self.config.hedge_min_samples:
+            return None
+        return tracker.percentile(self.config.hedge_percentile)
+
+    def _may_hedge(self, endpoint: HttpUrl, method: HttpRequestMethod) -> bool:
+        if self.hedge_budget is not None and self.hedge_budget.tokens < 1:
+            return False
+        if not self.limiter_for(endpoint, method).try_acquire():
+            return False
+        if self.hedge_budget is not None and not self.hedge_budget.withdraw():
+            return False
+        self._hedged += 1
+        return True
+
+    @property
+    def hedged_requests(self) -> int:
+        """
+        Number of requests that were sent a second time because the first one was slow.
+        """
+        return self._hedged
+
+    def is_circuit_failure(self, error: BaseException) -> bool:
+        """
+        Whether an error counts against the circuit: connection errors, timeouts and server errors.
+
+        Client errors and 429s mean the endpoint is up; throttling is left to the rate controller.
+        """
+        if isinstance(error, (CircuitOpen, DeadlineExceeded)):
+            return False
+        status: Optional[int] = error_status(error)
+        return status is None or status >= 500
+
+    def circuit_states(self) -> Dict[str, CircuitState]:
+        """
+        The state of every circuit the client has used, for monitoring.
+        """
+        return self.circuit_breakers.states() if self.circuit_breakers is not None else {}
+
+    def coalesce_key(
+        self,
+        endpoint: HttpUrl,
+        method: HttpRequestMethod,
+        **kwargs: Any
+    ) -> Optional[Tuple[Hashable, ...]]:
+        """
+        Key under which concurrent identical requests are coalesced, or `None` if they are not.
+        """
+        if method not in self.config.coalesce_methods or kwargs.get("data") is not None:
+            return None
+        return self.request_key(endpoint, method, **kwargs)
+
+    @cached()
+    @within_deadline()
+    @circuit_breaker()
     @rate_limit()
     @retry_on_error(requests.HTTPError, requests.ConnectionError, requests.Timeout)
     def api_request(
         self,
         endpoint: HttpUrl,
         method: HttpRequestMethod,
+        *,
+        parser: Optional[Any] = None,
         **kwargs: Any
-    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    ) -> Any:
         """
         Make an API request to the specified endpoint.
+
+        The response body is decoded with the configured JSON decoder and passed through
+        `parser` when one is given; a `TypeAdapter` parser validates the raw bytes.  GET requests
+        send the validators of the previous response, and a `304 Not Modified` answer
+        returns the previously parsed result without decoding or parsing again.
+
+        A `deadline` keyword argument, or the configured `request_deadline`, bounds the whole
+        call in seconds: rate limiter waits, every attempt and the sleeps between retries.
         """
         http_obj = HttpRequest.from_dict(
             data=kwargs, exclude=["method", "url"])
         http_obj.url = HttpUrl(self._create_absolute_url(relative=endpoint))
-        response: requests.Response = requests.request(
+        left: Optional[float] = remaining()
+        if left is not None and http_obj.timeout is None:
+            http_obj.timeout = max(left, 0.001)
+        key, validators = self._conditional_validators(endpoint, method, parser=parser, **kwargs)
+        if validators is not None:
+            http_obj.headers = {**(http_obj.headers or {}), **validators.headers()}
+        response: requests.Response = self.get_session().request(
             method=method.value, url=http_obj.url, **(http_obj.to_dict(exclude=["method", "url"])))
+        self.observe_response(response.status_code, response.headers)
+        if response.status_code == 304 and validators is not None and self.conditional_cache is not None:
+            return self.conditional_cache.revalidated(validators)
         if response.status_code != 200:
-            raise requests.HTTPError
-        return response.json()
+            raise requests.HTTPError(f"{response.status_code} {response.reason}", response=response)
+        result: Any = parse_body(response.content, self._decoder, parser, self.config.validate_json_bytes)
+        if key is not None and self.conditional_cache is not None:
+            self.conditional_cache.remember(key, response.headers, result)
+        return result
 
+    @cached_async()
+    @single_flight_async()
+    @within_deadline_async()
+    @circuit_breaker_async()
     @rate_limit_async()
     @retry_on_error_async(
-        Type[aiohttp.ClientConnectorError],
-        Type[aiohttp.ClientResponseError],
-        Type[aiohttp.ClientPayloadError]
+        aiohttp.ClientConnectionError,
+        aiohttp.ClientResponseError,
+        aiohttp.ClientPayloadError,
+        asyncio.TimeoutError,
     )
     async def api_request_async(
         self,
         endpoint: HttpUrl,
         method: HttpRequestMethod,
+        *,
+        parser: Optional[Any] = None,
         **kwargs: Any
-    ) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    ) -> Any:
         """
         Make an API request to the specified endpoint asynchronously.
+
+        With `hedge_requests`, a GET that has not answered within the configured percentile
+        of its endpoint's recent latencies is sent a second time; the first answer wins.
         """
+        if method != HttpRequestMethod.GET or not self.config.hedge_requests:
+            return await self._send_async(endpoint, method, parser, kwargs)
+        if self.hedge_budget is not None:
+            self.hedge_budget.deposit()
+        return await hedged(
+            lambda: self._send_async(endpoint, method, parser, kwargs),
+            self.hedge_delay(endpoint),
+            lambda: self._may_hedge(endpoint, method),
+        )
+
+    async def _send_async(
+        self,
+        endpoint: HttpUrl,
+        method: HttpRequestMethod,
+        parser: Optional[Any],
+        kwargs: Dict[str, Any]
+    ) -> Any:
+        kwargs = dict(kwargs)
+        started: float = time.monotonic()
         http_obj = HttpRequest.from_dict(
             data=kwargs, exclude=["method", "url"])
         http_obj.url = self._create_absolute_url(relative=endpoint)
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method=method.value, url=http_obj.url, **kwargs) as response:
+        key, validators = self._conditional_validators(endpoint, method, parser=parser, **kwargs)
+        if validators is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **validators.headers()}
+        left: Optional[float] = remaining()
+        if left is not None and kwargs.get("timeout") is None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=max(left, 0.001))
+        session: aiohttp.ClientSession = await self.get_session_async()
+        async with session.request(method=method.value, url=http_obj.url, **kwargs) as response:
+            self.observe_response(response.status, response.headers)
+            if response.status == 304 and validators is not None and self.conditional_cache is not None:
+                return self.conditional_cache.revalidated(validators)
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    request_info=response.request_info, history=response.history, status=response.status,
+                    message=str(object=response.reason), headers=response.headers)
+            result: Any = parse_body(await response.read(), self._decoder, parser, self.config.validate_json_bytes)
+            if key is not None and self.conditional_cache is not None:
+                self.conditional_cache.remember(key, response.headers, result)
+        if self.config.hedge_requests:
+            self.latency(endpoint).observe(time.monotonic() - started)
+        return result
+
+    async def stream_async(
+        self,
+        endpoint: HttpUrl,
+        method: HttpRequestMethod,
+        chunk_size: int = 64 * 1024,
+        **kwargs: Any
+    ) -> AsyncIterator[bytes]:
+        """
+        Make a rate-limited API request and yield the response body in chunks as they arrive.
+
+        Streamed responses bypass the response cache, request coalescing and retries.
+        """
+        url: str = self._create_absolute_url(relative=endpoint)
+        session: aiohttp.ClientSession = await self.get_session_async()
+        async with self.limiter_for(endpoint, method):
+            async with session.request(method=method.value, url=url, **kwargs) as response:
+                self.observe_response(response.status, response.headers)
                 if response.status != 200:
-                    raise aiohttp.ClientResponseError(request_info=response.request_info, history=response.history,
-                                                      status=response.status, message=str(object=response.reason), headers=response.headers)
-                return await response.json()
+                    raise aiohttp.ClientResponseError(
+                        request_info=response.request_info, history=response.history, status=response.status,
+                        message=str(object=response.reason), headers=response.headers)
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    yield chunk
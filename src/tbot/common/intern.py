@@ -0,0 +1,61 @@
+"""
+Python module for interning identifiers repeated across many parsed models.
+"""
+from typing import Annotated, Any, Dict
+
+from pydantic import AfterValidator
+
+
+class InternPool:
+    """
+    A bounded table that maps equal strings to one shared object.
+
+    Unlike `sys.intern`, the table is capped at `maxsize` entries: when it fills up it starts
+    over, so identifiers that stopped appearing are released while hot ones are quickly
+    shared again.  A `maxsize` of zero disables interning.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize: int = maxsize
+        self._table: Dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        table: Dict[str, str] = self._table
+        found: Any = table.get(value)
+        if found is not None:
+            return found
+        if len(table) >= self.maxsize:
+            table.clear()
+            if self.maxsize <= 0:
+                return value
+        table[value] = value
+        return value
+
+    def clear(self) -> None:
+        self._table.clear()
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+default_pool: InternPool = InternPool()
+
+
+def intern_str(value: str) -> str:
+    """
+    Intern a string in the process-wide `default_pool`.
+    """
+    return default_pool(value)
+
+
+InternedStr = Annotated[str, AfterValidator(intern_str)]
+"""
+A validated string shared with every equal string parsed before it, for repeated identifiers such as mints.
+"""
+
+
+def is_interned(metadata: Any) -> bool:
+    """
+    Check whether annotation or field metadata marks a value as an `InternedStr`.
+    """
+    return any(getattr(item, "func", None) is intern_str for item in metadata)
@@ -0,0 +1,66 @@
+"""
+Python module for decoding JSON response bodies with the fastest available decoder.
+"""
+import json
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None  # type: ignore
+
+
+JsonDecoder = Callable[[bytes], Any]
+
+
+def _available_decoders() -> Dict[str, JsonDecoder]:
+    decoders: Dict[str, JsonDecoder] = {}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    if msgspec is not None:
+        decoders["msgspec"] = msgspec.json.decode
+    decoders["json"] = json.loads
+    return decoders
+
+
+def get_decoder(name: str = "auto") -> JsonDecoder:
+    """
+    Get a decoder of raw JSON bytes by name: `orjson`, `msgspec`, `json` or `auto`.
+
+    `auto` picks orjson, then msgspec, and falls back to the standard library.
+    """
+    decoders: Dict[str, JsonDecoder] = _available_decoders()
+    if name == "auto":
+        return next(iter(decoders.values()))
+    if name not in decoders:
+        raise ValueError(f"JSON decoder {name!r} is not installed; available: {', '.join(decoders)}")
+    return decoders[name]
+
+
+def parse_body(
+    body: bytes,
+    decoder: JsonDecoder,
+    parser: Optional[Any] = None,
+    validate_json_bytes: bool = True,
+) -> Any:
+    """
+    Decode a response body and run it through a parser.
+
+    A parser exposing `validate_json`, such as a pydantic `TypeAdapter`, receives the raw bytes
+    directly when `validate_json_bytes` is set, skipping the intermediate Python objects.
+    Otherwise the decoded payload is handed to `validate_python` or to the parser itself.
+    """
+    if parser is not None and validate_json_bytes:
+        validate_json: Optional[Callable[[bytes], Any]] = getattr(parser, "validate_json", None)
+        if validate_json is not None:
+            return validate_json(body)
+    payload: Any = decoder(body)
+    if parser is None:
+        return payload
+    validate_python: Optional[Callable[[Any], Any]] = getattr(parser, "validate_python", None)
+    return validate_python(payload) if validate_python is not None else parser(payload)
@@ -0,0 +1,75 @@
+"""
+Python module for incrementally parsing a top-level JSON array as its bytes arrive.
+"""
+import codecs
+import json
+from typing import Any, List
+
+
+class JsonArrayStream:
+    """
+    Splits a streamed top-level JSON array into its decoded elements.
+
+    Feed it raw chunks as they arrive; every call returns the elements completed so far.
+    Only the unparsed tail of the stream is buffered, so memory stays bounded by the chunk
+    size plus the largest single element, however long the array is.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: str = ""
+        self._started: bool = False
+        self._finished: bool = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Consume a chunk of the response body and return the newly completed elements.
+        """
+        if self._finished:
+            return []
+        buffer: str = self._buffer + self._utf8.decode(chunk)
+        size: int = len(buffer)
+        pos: int = 0
+        items: List[Any] = []
+        while True:
+            while pos < size and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= size:
+                break
+            if not self._started:
+                if buffer[pos] != "[":
+                    raise ValueError(f"Expected a JSON array, got {buffer[pos]!r}")
+                self._started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                self._finished = True
+                pos += 1
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break
+            follow: int = end
+            while follow < size and buffer[follow] in " \t\r\n":
+                follow += 1
+            if follow >= size or buffer[follow] not in ",]":
+                # A complete element is always followed by ',' or ']'; without one, a
+                # number such as `3` of `3.5` may still continue in the next chunk.
+                break
+            items.append(item)
+            pos = end
+        self._buffer = buffer[pos:]
+        return items
+
+    def close(self) -> None:
+        """
+        Check that the stream ended with a complete array.
+        """
+        if not self._finished:
+            raise ValueError("JSON array stream ended before the closing bracket")
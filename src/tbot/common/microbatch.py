@@ -0,0 +1,95 @@
+"""
+Python module for collecting single lookups into batched calls (the DataLoader pattern).
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Mapping, Optional, Set
+
+from pydantic import Field, PrivateAttr
+
+from .easymodel import EasyModel
+
+
+def _consume(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+class MicroBatcher(EasyModel):
+    """
+    Collects single lookups for `window` seconds, or until `max_size` keys are waiting, and
+    resolves them all with one call of `load`.
+
+    Lookups are grouped, for example by network: `load(group, keys)` gets the distinct keys of
+    one group and returns a mapping from key to value; keys missing from it resolve to `None`.
+    If `load` raises, every lookup of its batch raises the same error; if the batch is
+    cancelled, such as at shutdown, its lookups are cancelled too rather than left waiting.
+    """
+    load: Callable[[Hashable, List[Hashable]], Awaitable[Mapping[Hashable, Any]]] = Field(default=..., alias="load")
+    window: float = Field(default=0.005, alias="window")
+    max_size: int = Field(default=100, alias="max_size")
+    batches: int = Field(default=0, alias="batches")
+    _pending: Dict[Hashable, Dict[Hashable, asyncio.Future]] = PrivateAttr(default_factory=dict)
+    _timers: Dict[Hashable, asyncio.TimerHandle] = PrivateAttr(default_factory=dict)
+    _running: Set[asyncio.Future] = PrivateAttr(default_factory=set)
+    _loop: Optional[asyncio.AbstractEventLoop] = PrivateAttr(default=None)
+
+    async def load_one(self, group: Hashable, key: Hashable) -> Any:
+        """
+        Look `key` up in the next batch of `group`; concurrent lookups of one key share the result.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._pending, self._timers = loop, {}, {}
+        batch: Dict[Hashable, asyncio.Future] = self._pending.setdefault(group, {})
+        future: Optional[asyncio.Future] = batch.get(key)
+        if future is None:
+            future = batch[key] = loop.create_future()
+            future.add_done_callback(_consume)
+        if len(batch) >= self.max_size:
+            self.dispatch(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.window, self.dispatch, group)
+        return await asyncio.shield(future)
+
+    def dispatch(self, group: Hashable) -> None:
+        """
+        Send the waiting lookups of `group` now instead of at the end of the window.
+        """
+        timer: Optional[asyncio.TimerHandle] = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        batch: Dict[Hashable, asyncio.Future] = self._pending.pop(group, {})
+        if batch:
+            self.batches += 1
+            task: asyncio.Future = asyncio.ensure_future(self._run(group, batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    def cancel(self) -> None:
+        """
+        Cancel every waiting and in-flight lookup, e.g. when the client is closed.
+        """
+        for timer in self._timers.values():
+            timer.cancel()
+        for batch in self._pending.values():
+            for future in batch.values():
+                future.cancel()
+        for task in list(self._running):
+            task.cancel()
+        self._timers, self._pending = {}, {}
+
+    async def _run(self, group: Hashable, batch: Dict[Hashable, asyncio.Future]) -> None:
+        try:
+            results: Mapping[Hashable, Any] = await self.load(group, list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            for future in batch.values():
+                future.cancel()
+            raise
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
@@ -3,30 +3,49 @@ A rate limiter that can be used as a context manager or decorator.
 """
 
 import asyncio
-import collections
+from fnmatch import fnmatchcase
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
 import threading
 import time
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Dict, Iterable, List, Optional, Sequence, Tuple
 from types import TracebackType
-from functools import wraps
+from functools import lru_cache, wraps
+import uuid
 
-from pydantic import Field, SkipValidation
+from pydantic import Field, PrivateAttr
+from .adaptive import AdaptiveRate
+from .deadline import DeadlineExceeded, check
 from .easymodel import EasyModel
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
 
 class RateLimiter(EasyModel):
     """
     A rate limiter that can be used as a context manager or decorator.
+
+    It implements the generic cell rate algorithm (GCRA): calls are spaced `period / max_calls`
+    seconds apart on average, and up to `burst` calls may go back to back.  A call that fits
+    in the budget proceeds without any delay.  Otherwise it reserves the next free slot
+    under a short lock and sleeps outside of it, so waiters are served in arrival order and
+    never block each other.  A `burst` above one may briefly exceed `max_calls` in a period
+    by `burst - 1` calls.  A wait that would outlast the deadline of the current call raises
+    `DeadlineExceeded` right away instead.
     """
-    calls: collections.deque = Field(default_factory=collections.deque, alias="calls") # type: ignore
     max_calls: int = Field(default_factory=int, alias="max_calls")
     period: float = Field(default_factory=float, alias="period")
-    sync_lock: SkipValidation[threading.RLock] = Field(
-        default_factory=SkipValidation[threading.RLock], alias="sync_lock", validate_default=False
-    )
-    async_lock: asyncio.Lock = Field(
-        default_factory=asyncio.Lock, alias="async_lock")
+    burst: int = Field(default=1, alias="burst")
     min_interval: float = Field(default_factory=float, alias="min_interval")
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _tat: float = PrivateAttr(default=0.0)
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
@@ -34,24 +53,331 @@ class RateLimiter(EasyModel):
         self.period = kwargs.get("period", self.period)
         self.min_interval = self.period / self.max_calls
 
+    def acquire(self) -> float:
+        """
+        Wait for the next free slot, returning its reservation.
+        """
+        delay, reservation = self.reserve()
+        if delay > 0:
+            self._check_deadline(delay, reservation)
+            time.sleep(delay)
+        return reservation
+
+    async def acquire_async(self) -> float:
+        """
+        Wait for the next free slot without blocking the event loop, returning its reservation.
+        """
+        delay, reservation = self.reserve()
+        if delay > 0:
+            self._check_deadline(delay, reservation)
+            try:
+                await asyncio.sleep(delay=delay)
+            except asyncio.CancelledError:
+                self.release(reservation)
+                raise
+        return reservation
+
     def __enter__(self) -> "RateLimiter":
-        with self.sync_lock:
-            self._ensure_rate_limit()
-            return self
-    
+        self.acquire()
+        return self
+
     def __exit__(
         self,
         exc_type: Optional[type],
         exc_val: Optional[BaseException],
         exc_tb: Optional[TracebackType]
     ) -> None:
-        with self.sync_lock:
-            self._record_call()
+        pass
 
     async def __aenter__(self) -> "RateLimiter":
-        async with self.async_lock:
-            await self._ensure_rate_limit_async()
-            return self
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        pass
+
+    def _check_deadline(self, delay: float, reservation: float) -> None:
+        """
+        Give the slot back and raise `DeadlineExceeded` if waiting for it would outlast the call's deadline.
+        """
+        try:
+            check(delay)
+        except DeadlineExceeded:
+            self.release(reservation)
+            raise
+
+    @property
+    def tolerance(self) -> float:
+        return (max(self.burst, 1) - 1) * self.min_interval
+
+    @property
+    def rate(self) -> float:
+        """
+        The current sustained rate in calls per second.
+        """
+        return 1 / self.min_interval
+
+    def set_rate(self, rate: float) -> None:
+        """
+        Change the sustained rate; calls already reserved keep their slots.
+        """
+        with self._lock:
+            self.min_interval = 1 / rate
+
+    def defer(self, seconds: float) -> None:
+        """
+        Hold back every call for at least `seconds`, e.g. as long as a server asked with `Retry-After`.
+        """
+        with self._lock:
+            self._store(max(self._load(), time.monotonic() + seconds + self.tolerance))
+
+    def _load(self) -> float:
+        """
+        Read the theoretical arrival time of the next call; called under `_lock`.
+        """
+        return self._tat
+
+    def _store(self, tat: float) -> None:
+        self._tat = tat
+
+    def reserve(self) -> Tuple[float, float]:
+        """
+        Reserve the next free slot, returning how long to wait for it and the reservation.
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            tat: float = max(self._load(), now)
+            reservation: float = tat + self.min_interval
+            self._store(reservation)
+            return max(0.0, tat - self.tolerance - now), reservation
+
+    def try_reserve(self) -> Optional[float]:
+        """
+        Take a slot only if one is free right now, returning its reservation or `None`.
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            tat: float = max(self._load(), now)
+            if tat - self.tolerance > now:
+                return None
+            reservation: float = tat + self.min_interval
+            self._store(reservation)
+            return reservation
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot only if one is free right now.
+        """
+        return self.try_reserve() is not None
+
+    def release(self, reservation: float) -> None:
+        """
+        Give back an unused reservation, if no later caller has queued behind it.
+        """
+        with self._lock:
+            if self._load() == reservation:
+                self._store(reservation - self.min_interval)
+
+    @property
+    def available(self) -> int:
+        """
+        The number of calls that could proceed right now without waiting.
+        """
+        with self._lock:
+            now: float = time.monotonic()
+            headroom: float = now + self.tolerance - max(self._load(), now)
+            return max(0, min(max(self.burst, 1), math.floor(headroom / self.min_interval + 1e-9) + 1))
+
+
+class _ProcessLock:
+    """
+    A lock held by one thread of one process at a time: a thread lock around an exclusive `flock`.
+    """
+
+    def __init__(self, fd: int) -> None:
+        self.fd: int = fd
+        self._thread_lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> "_ProcessLock":
+        self._thread_lock.acquire()
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+
+_STATE: struct.Struct = struct.Struct("d16s")
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    A `RateLimiter` whose state lives in a memory-mapped file, shared by every process on the host.
+
+    GCRA keeps a single number per budget, the theoretical arrival time of the next call, so
+    the file holds one double read and written under an exclusive `flock`.  Every worker that
+    opens the same `path` draws from one budget: a reservation costs a lock round trip and no
+    system call beyond it.  Times come from the monotonic clock, which is system-wide on Linux
+    but restarts at boot, so the file also records the boot it was written in and state left
+    by an earlier boot is ignored.  Requires a platform with `fcntl`.
+    """
+    path: str = Field(default=..., alias="path")
+    _fd: int = PrivateAttr(default=-1)
+    _map: Optional[mmap.mmap] = PrivateAttr(default=None)
+    _boot: bytes = PrivateAttr(default=b"")
+
+    def __init__(self, **kwargs: Any) -> None:
+        if fcntl is None:  # pragma: no cover
+            raise RuntimeError("SharedRateLimiter requires fcntl, which this platform does not provide")
+        super().__init__(**kwargs)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock = _ProcessLock(self._fd)
+        with self._lock:
+            if os.fstat(self._fd).st_size < _STATE.size:
+                os.ftruncate(self._fd, _STATE.size)
+        self._map = mmap.mmap(self._fd, _STATE.size)
+        self._boot = boot_id()
+
+    def _load(self) -> float:
+        tat, boot = _STATE.unpack_from(self._map)
+        return tat if boot == self._boot else 0.0
+
+    def _store(self, tat: float) -> None:
+        _STATE.pack_into(self._map, 0, tat, self._boot)
+
+    def close(self) -> None:
+        """
+        Unmap and close the state file; the budget stays in it for the other processes.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+@lru_cache(maxsize=1)
+def boot_id() -> bytes:
+    """
+    Identify the current boot, the epoch of the monotonic clock, as 16 bytes.
+
+    Linux names every boot with a random UUID; elsewhere the wall-clock boot time, rounded
+    to ten seconds to absorb clock adjustments, stands in for it.
+    """
+    try:
+        with open("/proc/sys/kernel/random/boot_id", encoding="ascii") as f:
+            return uuid.UUID(f.read().strip()).bytes
+    except (OSError, ValueError):
+        return struct.pack("<q8x", round((time.time() - time.monotonic()) / 10))
+
+
+LIMITER_BACKENDS: Tuple[str, ...] = ("memory", "shared")
+
+
+def shared_limiter_path(key: str, directory: Optional[str] = None) -> str:
+    """
+    Get the state file of a shared budget, such as `public-api.birdeye.so/multi_price`.
+    """
+    name: str = re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+    return os.path.join(directory or os.path.join(tempfile.gettempdir(), "tbot-ratelimit"), f"{name}.gcra")
+
+
+def make_limiter(
+    key: str,
+    max_calls: int,
+    period: float,
+    burst: int = 1,
+    backend: str = "memory",
+    directory: Optional[str] = None
+) -> RateLimiter:
+    """
+    Build the limiter of a budget with one of the `LIMITER_BACKENDS`.
+
+    On platforms without `fcntl` the `shared` backend falls back to a per-process `memory` limiter.
+    """
+    if backend == "memory" or (backend == "shared" and fcntl is None):
+        return RateLimiter(max_calls=max_calls, period=period, burst=burst)
+    if backend == "shared":
+        return SharedRateLimiter(
+            max_calls=max_calls, period=period, burst=burst, path=shared_limiter_path(key, directory))
+    raise ValueError(f"Unknown rate limiter backend {backend!r}, expected one of {LIMITER_BACKENDS}")
+
+
+class RateLimitPolicy(EasyModel):
+    """
+    A budget shared by the routes of a host matching a glob pattern, such as `multi_price` or `dex/pairs/*`.
+    """
+    route: str = Field(default=..., alias="route")
+    max_calls: int = Field(default=..., alias="max_calls")
+    period: float = Field(default=..., alias="period")
+    burst: int = Field(default=1, alias="burst")
+
+    def matches(self, route: str) -> bool:
+        return fnmatchcase(route.lstrip("/"), self.route.lstrip("/"))
+
+
+class LimiterChain:
+    """
+    Nested rate limiters acquired together, from the most specific endpoint budget to the provider total.
+
+    Each limiter is only entered once the previous one has granted its slot, so a call
+    waiting on a busy endpoint does not hold a slot of the shared provider budget.  If a
+    later limiter fails, for example past the deadline or cancelled, the slots already taken
+    are given back.
+    """
+
+    def __init__(self, limiters: Sequence[RateLimiter]) -> None:
+        self.limiters: Tuple[RateLimiter, ...] = tuple(limiters)
+
+    def __enter__(self) -> "LimiterChain":
+        taken: List[Tuple[RateLimiter, float]] = []
+        try:
+            for limiter in self.limiters:
+                taken.append((limiter, limiter.acquire()))
+        except BaseException:
+            self._release(taken)
+            raise
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        pass
+
+    async def __aenter__(self) -> "LimiterChain":
+        taken: List[Tuple[RateLimiter, float]] = []
+        try:
+            for limiter in self.limiters:
+                taken.append((limiter, await limiter.acquire_async()))
+        except BaseException:
+            self._release(taken)
+            raise
+        return self
+
+    @staticmethod
+    def _release(taken: List[Tuple[RateLimiter, float]]) -> None:
+        for limiter, reservation in reversed(taken):
+            limiter.release(reservation)
 
     async def __aexit__(
         self,
@@ -59,43 +385,170 @@ class RateLimiter(EasyModel):
         exc_val: Optional[BaseException],
         exc_tb: Optional[TracebackType]
     ) -> None:
-        async with self.async_lock:
-            self._record_call()
-
-    def _ensure_rate_limit(self) -> None:
-        sleep_time: float = self._get_sleep_time()
-        if sleep_time > 0:
-            time.sleep(sleep_time)
-        else:
-            time.sleep(self.min_interval)
-
-    async def _ensure_rate_limit_async(self) -> None:
-        sleep_time: float = self._get_sleep_time()
-        if sleep_time > 0:
-            await asyncio.sleep(delay=sleep_time)
-        else:
-            await asyncio.sleep(delay=self.min_interval)
-
-    def _get_sleep_time(self) -> float:
-        self._clear_old_calls()
-        if self.calls and len(self.calls) >= self.max_calls:
-            elapsed: float = time.time() - self.calls[0]
-            sleep_time: float = self.period - elapsed
-            if sleep_time > 0:
-                return sleep_time
-        return 0
-
-    def _record_call(self) -> None:
-        self.calls.append(time.time())
-        self._clear_old_calls()
-
-    def _clear_old_calls(self) -> None:
-        while self.calls and (time.time() - self.calls[0]) >= self.period:
-            self.calls.popleft()
+        pass
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot of every limiter only if all of them have one free right now.
+        """
+        taken: List[Tuple[RateLimiter, float]] = []
+        for limiter in self.limiters:
+            reservation: Optional[float] = limiter.try_reserve()
+            if reservation is None:
+                self._release(taken)
+                return False
+            taken.append((limiter, reservation))
+        return True
 
     @property
-    def timespan(self) -> float:
-        return time.time() - self.calls[0] if self.calls else 0
+    def available(self) -> int:
+        """
+        The number of calls that could proceed right now through every limiter of the chain.
+        """
+        return min(limiter.available for limiter in self.limiters)
+
+
+class LimiterRegistry(EasyModel):
+    """
+    Process-wide rate limiters keyed by host, and by host and route pattern for endpoint budgets.
+
+    Every client talking to a host draws from the same limiters, so several clients of one
+    provider together stay within its quota.  The first registration of a key sets its
+    budget; `configure` replaces it.
+    """
+    _limiters: Dict[str, RateLimiter] = PrivateAttr(default_factory=dict)
+    _chains: Dict[Tuple[str, ...], LimiterChain] = PrivateAttr(default_factory=dict)
+    _controllers: Dict[str, AdaptiveRate] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def limiter(
+        self,
+        key: str,
+        max_calls: int,
+        period: float,
+        burst: int = 1,
+        backend: str = "memory",
+        directory: Optional[str] = None
+    ) -> RateLimiter:
+        """
+        Get the limiter registered under a key, registering one with the given budget if there is none.
+        """
+        found: Optional[RateLimiter] = self._limiters.get(key)
+        if found is not None:
+            return found
+        with self._lock:
+            found = self._limiters.get(key)
+            if found is None:
+                found = self._limiters[key] = make_limiter(key, max_calls, period, burst, backend, directory)
+            return found
+
+    def configure(
+        self,
+        key: str,
+        max_calls: int,
+        period: float,
+        burst: int = 1,
+        backend: str = "memory",
+        directory: Optional[str] = None
+    ) -> RateLimiter:
+        """
+        Register a limiter with a new budget under a key, replacing the previous one.
+        """
+        with self._lock:
+            limiter: RateLimiter = make_limiter(key, max_calls, period, burst, backend, directory)
+            self._limiters[key] = limiter
+            self._chains.clear()
+            self._controllers.pop(key, None)
+            return limiter
+
+    def get(self, key: str) -> Optional[RateLimiter]:
+        return self._limiters.get(key)
+
+    def controller(self, key: str, ceiling: Optional[float] = None) -> Optional[AdaptiveRate]:
+        """
+        Get the AIMD controller of a registered limiter, starting it at the limiter's configured rate.
+
+        `ceiling` is the highest rate it may reach in calls per second, by default the configured rate.
+        """
+        found: Optional[AdaptiveRate] = self._controllers.get(key)
+        if found is not None:
+            return found
+        limiter: Optional[RateLimiter] = self._limiters.get(key)
+        if limiter is None:
+            return None
+        with self._lock:
+            return self._controllers.setdefault(key, AdaptiveRate(limiter=limiter, ceiling=ceiling or 0))
+
+    def rates(self) -> Dict[str, float]:
+        """
+        The current rate of every registered limiter in calls per second, for monitoring.
+        """
+        return {key: limiter.rate for key, limiter in self._limiters.items()}
+
+    def chain(
+        self,
+        host: str,
+        route: str,
+        max_calls: int,
+        period: float,
+        burst: int = 1,
+        policies: Iterable[RateLimitPolicy] = (),
+        backend: str = "memory",
+        directory: Optional[str] = None
+    ) -> LimiterChain:
+        """
+        Get the limiters a request to a route of a host must pass: the budgets of matching policies,
+        then the host total.
+        """
+        matched: List[RateLimitPolicy] = [policy for policy in policies if policy.matches(route)]
+        key: Tuple[str, ...] = (host, *(policy.route for policy in matched))
+        found: Optional[LimiterChain] = self._chains.get(key)
+        if found is not None:
+            return found
+        limiters: List[RateLimiter] = [
+            self.limiter(f"{host}/{policy.route.lstrip('/')}", policy.max_calls, policy.period, policy.burst,
+                         backend, directory)
+            for policy in matched
+        ]
+        limiters.append(self.limiter(host, max_calls, period, burst, backend, directory))
+        with self._lock:
+            return self._chains.setdefault(key, LimiterChain(limiters))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._limiters.clear()
+            self._chains.clear()
+            self._controllers.clear()
+
+
+default_registry: LimiterRegistry = LimiterRegistry()
+
+
+def resolve_limiter(
+    self: Any,
+    limiter: Optional[Any],
+    max_calls: Optional[int],
+    period: Optional[float],
+    *args: Any,
+    **kwargs: Any
+) -> Any:
+    """
+    Get the limiter a decorated call of `self` acquires: an explicit one, the one `self.limiter_for`
+    picks for the call, or `self.rate_limiter`.
+    """
+    if limiter is not None:
+        return limiter
+    limiter_for: Optional[Callable[..., Any]] = getattr(self, "limiter_for", None)
+    if limiter_for is not None:
+        return limiter_for(*args, **kwargs)
+    return getattr(
+        self,
+        "rate_limiter",
+        RateLimiter(
+            max_calls=max_calls if max_calls is not None else getattr(self, "max_calls", 100),
+            period=period if period is not None else getattr(self, "period", 60),
+        ),
+    )
 
 
 def rate_limit_async(
@@ -110,20 +563,7 @@ def rate_limit_async(
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(wrapped=func)
         async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
-            r_limiter: RateLimiter | Any = (
-                limiter
-                if limiter is not None
-                else getattr(
-                    self,
-                    "rate_limiter",
-                    RateLimiter(
-                        max_calls=max_calls if max_calls is not None else getattr(
-                            self, "max_calls", 100),
-                        period=period if period is not None else getattr(
-                            self, "period", 60),
-                    ),
-                )
-            )
+            r_limiter: RateLimiter | Any = resolve_limiter(self, limiter, max_calls, period, *args, **kwargs)
             async with r_limiter:
                 return await func(self, *args, **kwargs)
 
@@ -140,20 +580,7 @@ def rate_limit(max_calls: Optional[int] = None, period: Optional[float] = None,
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(wrapped=func)
         def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
-            r_limiter: RateLimiter | Any = (
-                limiter
-                if limiter is not None
-                else getattr(
-                    self,
-                    "rate_limiter",
-                    RateLimiter(
-                        max_calls=max_calls if max_calls is not None else getattr(
-                            self, "max_calls", 100),
-                        period=period if period is not None else getattr(
-                            self, "period", 60),
-                    ),
-                )
-            )
+            r_limiter: RateLimiter | Any = resolve_limiter(self, limiter, max_calls, period, *args, **kwargs)
             with r_limiter:
                 return func(self, *args, **kwargs)
 
@@ -3,10 +3,106 @@ Python module for retrying a function call if an exception is raised.
 """
 import asyncio
 from functools import wraps
+import random
+import threading
 import time
-from typing import Any, Callable, Optional, Type
+from typing import Any, Callable, Optional, Tuple, Type
 
-from .ratelimit import RateLimiter
+from pydantic import Field, PrivateAttr
+
+from .deadline import DeadlineExceeded, remaining
+from .easymodel import EasyModel
+
+
+class RetryBudget(EasyModel):
+    """
+    A token bucket that caps retries at a fraction of normal traffic.
+
+    Every call deposits `ratio` tokens and every retry spends one, so over time retries
+    can never exceed `ratio` of the calls made.  The bucket starts with `min_tokens` so an
+    idle client can still retry, and holds at most `max_tokens` so a quiet period cannot
+    save up a retry storm.  When it runs dry, failures are raised instead of retried.
+    """
+    ratio: float = Field(default=0.1, alias="ratio")
+    min_tokens: float = Field(default=10, alias="min_tokens")
+    max_tokens: float = Field(default=100, alias="max_tokens")
+    tokens: float = Field(default=-1, alias="tokens")
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        if self.tokens < 0:
+            self.tokens = self.min_tokens
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Spend a token for a retry, returning whether the budget allowed it.
+        """
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def _retry_limiter(self: Any, *args: Any, **kwargs: Any) -> Optional[Any]:
+    """
+    Get the limiter a retried call acquires again; the first attempt was charged by `rate_limit`.
+    """
+    limiter_for: Optional[Callable[..., Any]] = getattr(self, "limiter_for", None)
+    if limiter_for is not None:
+        return limiter_for(*args, **kwargs)
+    return getattr(self, "rate_limiter", None)
+
+
+def _retry_pause(
+    self: Any,
+    error: BaseException,
+    attempts: int,
+    max_retries: Optional[int],
+    delay: Optional[float],
+    backoff: Optional[float],
+    max_delay: Optional[float],
+) -> Optional[float]:
+    """
+    Decide whether to retry after a failed attempt, returning how long to sleep first or `None` to give up.
+
+    The sleep is drawn with full jitter, uniformly up to the exponential backoff, so clients
+    that failed together do not retry in lockstep.  A call that ran out of its deadline is
+    never retried, nor is one that `self.is_retryable` rejects, that cannot finish before the
+    deadline or that the retry budget refuses.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return None
+    if attempts >= (max_retries if max_retries is not None else getattr(self, "max_retries", 3)):
+        return None
+    is_retryable: Optional[Callable[[BaseException], bool]] = getattr(self, "is_retryable", None)
+    if is_retryable is not None and not is_retryable(error):
+        return None
+    ceiling: float = min(
+        max_delay if max_delay is not None else getattr(self, "max_delay", 30.0),
+        (delay if delay is not None else getattr(self, "delay", 1.0))
+        * (backoff if backoff is not None else getattr(self, "backoff", 2.0)) ** (attempts - 1),
+    )
+    pause: float = random.uniform(0, ceiling)
+    left: Optional[float] = remaining()
+    if left is not None and pause >= left:
+        return None
+    budget: Optional[RetryBudget] = getattr(self, "retry_budget", None)
+    if budget is not None and not budget.withdraw():
+        return None
+    return pause
+
+
+def _retried(exceptions: Tuple[Type[BaseException], ...]) -> Tuple[Type[BaseException], ...]:
+    for exception in exceptions:
+        if not (isinstance(exception, type) and issubclass(exception, BaseException)):
+            raise TypeError(f"retry_on_error expects exception classes, got {exception!r}")
+    return exceptions or (Exception,)
 
 
 def retry_on_error(
@@ -14,35 +110,36 @@ def retry_on_error(
     max_retries: Optional[int] = None,
     delay: Optional[float] = None,
     backoff: Optional[float] = None,
+    max_delay: Optional[float] = None,
 ) -> Callable[..., Any]:
     """
     A decorator that retries a function call if the registered exceptions are raised.
+
+    Other exceptions propagate at once.  `max_retries` bounds the number of attempts; the
+    defaults come from the attributes of the same names on `self`.
     """
+    retried: Tuple[Type[BaseException], ...] = _retried(exceptions)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
-            b_current_retries = 0
-            b_max_retries: int | Any = max_retries if max_retries is not None else getattr(
-                self, "max_retries", 3)
-            b_delay: float | Any = delay if delay is not None else getattr(
-                self, "delay", 1.0)
-            b_backoff: float | Any = backoff if backoff is not None else getattr(
-                self, "backoff", 2.0)
-            b_exceptions: Any = exceptions if exceptions else (
-                NotImplementedError,)
-
-            while b_current_retries < b_max_retries:
+            budget: Optional[RetryBudget] = getattr(self, "retry_budget", None)
+            if budget is not None:
+                budget.deposit()
+            attempts: int = 0
+            while True:
                 try:
-                    with RateLimiter(max_calls=getattr(self, "max_calls", 300), period=getattr(self, "period", 60)):
-                        result = func(self, *args, **kwargs)
-                        return result
-                except Exception as e:
-                    b_current_retries += 1
-                    if b_current_retries >= b_max_retries:
-                        raise e
-                    time.sleep(
-                        b_delay * (b_backoff ** (b_current_retries - 1)))
+                    limiter: Optional[Any] = _retry_limiter(self, *args, **kwargs) if attempts else None
+                    if limiter is None:
+                        return func(self, *args, **kwargs)
+                    with limiter:
+                        return func(self, *args, **kwargs)
+                except retried as e:
+                    attempts += 1
+                    pause: Optional[float] = _retry_pause(self, e, attempts, max_retries, delay, backoff, max_delay)
+                    if pause is None:
+                        raise
+                    time.sleep(pause)
 
         return wrapper
 
@@ -54,36 +151,36 @@ def retry_on_error_async(
     max_retries: Optional[int] = None,
     delay: Optional[float] = None,
     backoff: Optional[float] = None,
+    max_delay: Optional[float] = None,
 ) -> Callable[..., Any]:
     """
-    A decorator that retries a function call if the registered exceptions are raised.
+    A decorator that retries a coroutine call if the registered exceptions are raised.
+
+    Other exceptions propagate at once.  `max_retries` bounds the number of attempts; the
+    defaults come from the attributes of the same names on `self`.
     """
+    retried: Tuple[Type[BaseException], ...] = _retried(exceptions)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(wrapped=func)
         async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
-            b_current_retries = 0
-            b_max_retries: int | Any = max_retries if max_retries is not None else getattr(
-                self, "max_retries", 3)
-            b_delay: float | Any = delay if delay is not None else getattr(
-                self, "delay", 1.0)
-            b_backoff: float | Any = backoff if backoff is not None else getattr(
-                self, "backoff", 2.0)
-            b_exceptions: Any = exceptions if exceptions else (
-                NotImplementedError,)
-
-            while b_current_retries < b_max_retries:
+            budget: Optional[RetryBudget] = getattr(self, "retry_budget", None)
+            if budget is not None:
+                budget.deposit()
+            attempts: int = 0
+            while True:
                 try:
-                    async with RateLimiter(
-                        max_calls=getattr(self, "max_calls", 300), period=getattr(self, "period", 60)
-                    ):
-                        result = await func(self, *args, **kwargs)
-                    return result
-                except Exception as e:
-                    b_current_retries += 1
-                    if b_current_retries >= b_max_retries:
-                        raise e
-                    await asyncio.sleep(delay=b_delay * (b_backoff ** (b_current_retries - 1)))
+                    limiter: Optional[Any] = _retry_limiter(self, *args, **kwargs) if attempts else None
+                    if limiter is None:
+                        return await func(self, *args, **kwargs)
+                    async with limiter:
+                        return await func(self, *args, **kwargs)
+                except retried as e:
+                    attempts += 1
+                    pause: Optional[float] = _retry_pause(self, e, attempts, max_retries, delay, backoff, max_delay)
+                    if pause is None:
+                        raise
+                    await asyncio.sleep(delay=pause)
 
         return wrapper
 
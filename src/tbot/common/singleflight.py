@@ -0,0 +1,91 @@
+"""
+Python module for coalescing identical in-flight requests into a single upstream call.
+"""
+import asyncio
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from pydantic import Field
+from .easymodel import EasyModel
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Turn request parameters into a hashable, order-independent value.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, bytes):
+        return value
+    return str(value) if value is not None else None
+
+
+def request_key(
+    method: str,
+    url: str,
+    params: Optional[Any] = None,
+    headers: Optional[Dict[str, Any]] = None,
+    vary_headers: Iterable[str] = (),
+) -> Tuple[Hashable, ...]:
+    """
+    Build the identity of a request from its method, URL, params and the headers it varies on.
+    """
+    vary: set[str] = {h.lower() for h in vary_headers}
+    relevant: Dict[str, Any] = {k.lower(): v for k, v in (headers or {}).items() if k.lower() in vary}
+    return (method, url, freeze(params), freeze(relevant))
+
+
+class SingleFlight(EasyModel):
+    """
+    Runs at most one call per key at a time; concurrent callers with the same key share its result.
+    """
+    calls: Dict[Hashable, asyncio.Future] = Field(default_factory=dict, alias="calls")  # type: ignore
+    saved: int = Field(default=0, alias="saved")
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await the in-flight call for `key`, starting `func` if there is none.
+
+        The upstream call runs as its own task, so a cancelled caller does not cancel it
+        for the callers still waiting on the result.
+        """
+        task: Optional[asyncio.Future] = self.calls.get(key)  # type: ignore
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(func())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.saved += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:  # type: ignore
+        if self.calls.get(key) is task:
+            del self.calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.calls)
+
+
+def single_flight_async() -> Callable[..., Callable[..., Any]]:
+    """
+    An asynchronous decorator that coalesces identical concurrent calls.
+
+    The decorated object provides a `single_flight` instance and a `coalesce_key` method that
+    returns the request identity, or `None` when the call must not be coalesced.
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(wrapped=func)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            flight: Optional[SingleFlight] = getattr(self, "single_flight", None)
+            key: Optional[Hashable] = self.coalesce_key(*args, **kwargs) if flight is not None else None
+            if flight is None or key is None:
+                return await func(self, *args, **kwargs)
+            return await flight.do(key, lambda: func(self, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -1,23 +1,44 @@
 from functools import wraps
+import re
+from types import TracebackType
 from pydantic import Field
 
 from ..birdeye.models import DefiNetwork
-from .models import TokenPair
-from ..common.easymodel import EasyModel
+from .models import TokenPair, TokenPairsResponse
+from ..common.batch import batch_map_async, chunked
+from ..common.cache import CachePolicy
+from ..common.easymodel import EasyModel, get_type_adapter
+from ..common.compact import get_compact_adapter
 from ..common.httpclient import HttpClient, HttpRequestMethod
-from typing import Any, Callable, Dict, List, Union
+from ..common.ratelimit import RateLimitPolicy
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 
 
 class DexscreenerClientConfig(EasyModel):
     base_url: str = Field(
         default="https://api.dexscreener.io/latest", alias="base_url")
+    cache_policies: List[CachePolicy] = Field(
+        default_factory=lambda: [
+            CachePolicy(route="dex/pairs/*", ttl=5, negative_ttl=30, negative_field="pairs"),
+            CachePolicy(route="dex/tokens/*", ttl=5, negative_ttl=30, negative_field="pairs"),
+            CachePolicy(route="dex/search", ttl=30),
+        ],
+        alias="cache_policies",
+    )
+    stale_while_revalidate: bool = Field(default=False, alias="stale_while_revalidate")
+    hedge_requests: bool = Field(default=False, alias="hedge_requests")
+    max_staleness: Optional[float] = Field(default=None, alias="max_staleness")
+    trusted: bool = Field(default=False, alias="trusted")
+    rate_limits: List[RateLimitPolicy] = Field(default_factory=list, alias="rate_limits")
+    max_addresses: int = Field(default=30, alias="max_addresses")
 
 
 def dexscreener_route() -> Callable[..., Callable[..., Any]]:
     """
     Dexscreener API route.
 
-    This decorator is used to wrap methods that make requests to the Dexscreener API.
+    This decorator is used to wrap methods that make requests to the Dexscreener API and
+    return a parsed `TokenPairsResponse`.
     """
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(wrapped=func)
@@ -30,8 +51,8 @@ def dexscreener_route() -> Callable[..., Callable[..., Any]]:
                     kwargs['address'] = key
                 else:
                     raise ValueError(f"Invalid address provided: {key}")
-            response = func(self, *args, **kwargs)
-            result: List[TokenPair] | None = [TokenPair(**pair) for pair in response.get("pairs", [])] if response.get("pairs", []) is not None else None
+            response: TokenPairsResponse = func(self, *args, **kwargs)
+            result: List[TokenPair] | None = response.pairs
             if result is not None:
                 if len(result) == 1:
                     return result[0]
@@ -59,9 +80,8 @@ def dexscreener_route_async() -> Callable[..., Callable[..., Any]]:
                     kwargs['address'] = key
                 else:
                     raise ValueError(f"Invalid address provided: {key}")
-            response = await func(self, *args, **kwargs)
-            result: List[TokenPair] | None = [TokenPair(**pair) for pair in response.get("pairs", [])
-                      ] if response.get("pairs", []) is not None else None
+            response: TokenPairsResponse = await func(self, *args, **kwargs)
+            result: List[TokenPair] | None = response.pairs
             if result is not None:
                 if len(result) == 1:
                     return result[0]
@@ -83,45 +103,201 @@ class DexscreenerClient(EasyModel):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.client.config.base_url = self.config.base_url
+        self.client.add_cache_policies(self.config.cache_policies)
+        self.client.add_rate_limits(self.config.rate_limits)
+        if self.config.stale_while_revalidate:
+            self.client.config.stale_while_revalidate = True
+        if self.config.hedge_requests:
+            self.client.config.hedge_requests = True
+        if self.config.max_staleness is not None:
+            self.client.config.max_staleness = self.config.max_staleness
+
+    def __enter__(self) -> "DexscreenerClient":
+        self.client.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        self.client.__exit__(exc_type, exc_val, exc_tb)
+
+    async def __aenter__(self) -> "DexscreenerClient":
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        await self.client.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def close_async(self) -> None:
+        """
+        Close the pooled connections of the underlying HTTP client.
+        """
+        await self.client.close_async()
+
+    def close(self) -> None:
+        """
+        Close the pooled sync connections and thread pool of the underlying HTTP client.
+        """
+        self.client.close()
+
+    def batch_map(
+        self,
+        func: Callable[..., Any],
+        *iterables: Iterable[Any],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Fan sync calls of this client out over the bounded thread pool of the underlying HTTP client.
+        """
+        return self.client.batch_map(func, *iterables, return_exceptions=return_exceptions)
+
+    def parser(self, tp: Any) -> Any:
+        """
+        Get the parser of a response type, building compact unvalidated records when the client is `trusted`.
+        """
+        return get_compact_adapter(tp) if self.config.trusted else get_type_adapter(tp)
 
     @dexscreener_route()
     def get_pairs(self, address: Union[str, List[str]], network: DefiNetwork) -> Union[TokenPair, List[TokenPair], Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Fetch pairs on the provided Blockchain with the provided Contract Address.
         """
-        return self.client.api_request(f"dex/pairs/{network.value}/{address}", HttpRequestMethod.GET)
+        return self.client.api_request(
+            f"dex/pairs/{network.value}/{address}", HttpRequestMethod.GET, parser=self.parser(TokenPairsResponse))
 
     @dexscreener_route_async()
     async def get_pairs_async(self, address: Union[str, List[str]], network: DefiNetwork) -> Union[TokenPair, List[TokenPair], Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Async version of `get_token_pair` method - Fetch pairs on the provided Blockchain with the provided Contract Address.
         """
-        return await self.client.api_request_async(f"dex/pairs/{network.value}/{address}", HttpRequestMethod.GET)
+        return await self.client.api_request_async(
+            f"dex/pairs/{network.value}/{address}", HttpRequestMethod.GET, parser=self.parser(TokenPairsResponse))
 
     @dexscreener_route()
     def get_tokens(self, address: Union[str, List[str]]) -> Union[TokenPair, List[TokenPair], Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Get pairs matching the provided Contract Address.
         """
-        return self.client.api_request(f"dex/tokens/{address}", HttpRequestMethod.GET)
+        return self.client.api_request(
+            f"dex/tokens/{address}", HttpRequestMethod.GET, parser=self.parser(TokenPairsResponse))
 
     @dexscreener_route_async()
     async def get_tokens_async(self, address: str) -> Union[TokenPair, List[TokenPair], Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Async version of `get_token_pairs`.
         """
-        return await self.client.api_request_async(f"dex/tokens/{address}", HttpRequestMethod.GET)
+        return await self.client.api_request_async(
+            f"dex/tokens/{address}", HttpRequestMethod.GET, parser=self.parser(TokenPairsResponse))
 
     @dexscreener_route()
     def search_pairs(self, search_query: str) -> Union[TokenPair, List[TokenPair], Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Search for pairs matching query
         """
-        return self.client.api_request("dex/search", HttpRequestMethod.GET, params={"q": search_query})
+        return self.client.api_request(
+            "dex/search", HttpRequestMethod.GET, params={"q": search_query}, parser=self.parser(TokenPairsResponse))
 
     @dexscreener_route_async()
     async def search_pairs_async(self, search_query: str) -> Union[TokenPair, List[TokenPair], Dict[str, Any], List[Dict[str, Any]], None]:
         """
         Async version of `search_pairs`
         """
-        return await self.client.api_request_async("dex/search", HttpRequestMethod.GET, params={"q": search_query})
+        return await self.client.api_request_async(
+            "dex/search", HttpRequestMethod.GET, params={"q": search_query}, parser=self.parser(TokenPairsResponse))
+
+    def _chunks(self, addresses: Iterable[str]) -> List[str]:
+        return [",".join(chunk) for chunk in chunked(addresses, self.config.max_addresses)]
+
+    def _fetch_pairs(self, endpoint: str) -> List[TokenPair]:
+        response: TokenPairsResponse = self.client.api_request(
+            endpoint, HttpRequestMethod.GET, parser=self.parser(TokenPairsResponse))
+        return response.pairs or []
+
+    async def _fetch_pairs_async(self, endpoint: str) -> List[TokenPair]:
+        response: TokenPairsResponse = await self.client.api_request_async(
+            endpoint, HttpRequestMethod.GET, parser=self.parser(TokenPairsResponse))
+        return response.pairs or []
+
+    def get_pairs_many(self, addresses: Iterable[str], network: DefiNetwork) -> Dict[str, Optional[TokenPair]]:
+        """
+        Fetch many pairs on the provided Blockchain, `max_addresses` per request, keyed by pair address.
+
+        The requests run on the thread pool of the client; pairs that were not found map to `None`.
+        """
+        addresses = list(addresses)
+        endpoints: List[str] = [f"dex/pairs/{network.value}/{chunk}" for chunk in self._chunks(addresses)]
+        return _by_pair(addresses, self.batch_map(self._fetch_pairs, endpoints))
+
+    async def get_pairs_many_async(
+        self,
+        addresses: Iterable[str],
+        network: DefiNetwork
+    ) -> Dict[str, Optional[TokenPair]]:
+        """
+        Async version of `get_pairs_many`, running the requests concurrently.
+        """
+        addresses = list(addresses)
+        endpoints: List[str] = [f"dex/pairs/{network.value}/{chunk}" for chunk in self._chunks(addresses)]
+        return _by_pair(addresses, await batch_map_async(self._fetch_pairs_async, endpoints))
+
+    def get_tokens_many(self, addresses: Iterable[str]) -> Dict[str, List[TokenPair]]:
+        """
+        Get the pairs of many tokens, `max_addresses` per request, keyed by token address.
+
+        A pair of two requested tokens is listed under both; tokens without pairs map to an empty list.
+        """
+        addresses = list(addresses)
+        endpoints: List[str] = [f"dex/tokens/{chunk}" for chunk in self._chunks(addresses)]
+        return _by_token(addresses, self.batch_map(self._fetch_pairs, endpoints))
+
+    async def get_tokens_many_async(self, addresses: Iterable[str]) -> Dict[str, List[TokenPair]]:
+        """
+        Async version of `get_tokens_many`, running the requests concurrently.
+        """
+        addresses = list(addresses)
+        endpoints: List[str] = [f"dex/tokens/{chunk}" for chunk in self._chunks(addresses)]
+        return _by_token(addresses, await batch_map_async(self._fetch_pairs_async, endpoints))
+
+
+_HEX_ADDRESS = re.compile(r"0x[0-9a-fA-F]+")
+
+
+def _address_key(address: str) -> str:
+    """
+    Key to match an address returned by the API against a requested one.
+
+    Hex addresses of EVM chains are case-insensitive, checksummed or not, so they match in
+    lower case; base58 addresses, as on Solana, are case-sensitive and must match exactly.
+    """
+    return address.lower() if _HEX_ADDRESS.fullmatch(address) else address
+
+
+def _by_pair(addresses: Iterable[str], chunks: List[List[TokenPair]]) -> Dict[str, Optional[TokenPair]]:
+    result: Dict[str, Optional[TokenPair]] = dict.fromkeys(addresses)
+    requested: Dict[str, str] = {_address_key(address): address for address in result}
+    for pairs in chunks:
+        for pair in pairs:
+            address: Optional[str] = requested.get(_address_key(pair.pair_address))
+            if address is not None:
+                result[address] = pair
+    return result
+
+
+def _by_token(addresses: Iterable[str], chunks: List[List[TokenPair]]) -> Dict[str, List[TokenPair]]:
+    found: Dict[str, Dict[str, TokenPair]] = {address: {} for address in addresses}
+    requested: Dict[str, str] = {_address_key(address): address for address in found}
+    for pairs in chunks:
+        for pair in pairs:
+            for token in (pair.base_token, pair.quote_token):
+                address: Optional[str] = requested.get(_address_key(token.address))
+                if address is not None:
+                    found[address].setdefault(pair.pair_address, pair)
+    return {address: list(pairs.values()) for address, pairs in found.items()}
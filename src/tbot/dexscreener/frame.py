@@ -0,0 +1,209 @@
+"""
+Python module for screening many Dexscreener pairs with vectorized filters and rankings.
+
+NumPy is an optional dependency: install the `analytics` extra to use it.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+PERIODS: Tuple[str, ...] = ("m5", "h1", "h6", "h24")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("PairFrame requires numpy; install it with `pip install tbot[analytics]`")
+
+
+def _created_at(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    # Compact records keep Dexscreener's raw milliseconds.
+    return value / 1000
+
+
+def _periods(periods: Any) -> Tuple[Any, ...]:
+    if periods is None:
+        return (None,) * len(PERIODS)
+    return (periods.m5, periods.h1, periods.h6, periods.h24)
+
+
+def _counts(transactions: Any) -> Tuple[Any, ...]:
+    counts: Tuple[Any, ...] = _periods(transactions)
+    return (
+        *(count.buys if count is not None else None for count in counts),
+        *(count.sells if count is not None else None for count in counts),
+    )
+
+
+def _labels(pair: Any) -> Tuple[Any, ...]:
+    base: Any = pair.base_token
+    quote: Any = pair.quote_token
+    return (
+        pair.pair_address, pair.chain_id, pair.dex_id,
+        base.address if base is not None else None,
+        base.symbol if base is not None else None,
+        quote.address if quote is not None else None,
+    )
+
+
+def _numbers(pair: Any) -> Tuple[Any, ...]:
+    liquidity: Any = pair.liquidity
+    return (
+        pair.price_native, pair.price_usd,
+        *((liquidity.usd, liquidity.base, liquidity.quote) if liquidity is not None else (None, None, None)),
+        pair.fdv, _created_at(pair.pair_created_at),
+        *_periods(pair.volume), *_periods(pair.price_change), *_counts(pair.transactions),
+    )
+
+
+LABEL_COLUMNS: Tuple[str, ...] = ("pair_address", "chain_id", "dex_id", "base_address", "base_symbol", "quote_address")
+NUMBER_COLUMNS: Tuple[str, ...] = (
+    "price_native", "price_usd", "liquidity_usd", "liquidity_base", "liquidity_quote", "fdv", "pair_created_at",
+    *(f"volume_{period}" for period in PERIODS),
+    *(f"price_change_{period}" for period in PERIODS),
+    *(f"buys_{period}" for period in PERIODS),
+    *(f"sells_{period}" for period in PERIODS),
+)
+
+
+def _columns(pairs: Sequence[Any]) -> Dict[str, Any]:
+    """
+    Flatten pairs in one pass per column group; missing values become NaN.
+    """
+    labels: Any = np.empty((len(pairs), len(LABEL_COLUMNS)), dtype=object)
+    if pairs:
+        labels[:] = list(map(_labels, pairs))
+    numbers: Any = np.array(list(map(_numbers, pairs)), dtype="float64").reshape(len(pairs), len(NUMBER_COLUMNS))
+    columns: Dict[str, Any] = {name: labels[:, i].copy() for i, name in enumerate(LABEL_COLUMNS)}
+    columns.update({name: numbers[:, i].copy() for i, name in enumerate(NUMBER_COLUMNS)})
+    return columns
+
+
+Score = Union[str, Any]
+
+
+class PairFrame:
+    """
+    Dexscreener pairs held as one NumPy array per metric, one row per pair address.
+
+    Screens are boolean masks over whole columns, combined with `&` and `|` and applied with
+    `filter`; `where` covers the common range checks.  Missing values are NaN and fail every
+    comparison.  `update` rewrites only the rows of pairs that changed.
+    """
+
+    def __init__(self, columns: Dict[str, Any]) -> None:
+        _require_numpy()
+        self.columns: Dict[str, Any] = columns
+        self._index: Dict[str, int] = {address: row for row, address in enumerate(columns["pair_address"])}
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Any]) -> "PairFrame":
+        """
+        Build a frame from `TokenPair` models or their compact records; later duplicates win.
+        """
+        _require_numpy()
+        unique: Dict[str, Any] = {pair.pair_address: pair for pair in pairs}
+        return cls(_columns(list(unique.values())))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, pair_address: str) -> bool:
+        return pair_address in self._index
+
+    def __getitem__(self, column: str) -> Any:
+        return self.columns[column]
+
+    def buy_sell_ratio(self, period: str = "h1") -> Any:
+        """
+        Buys per sell over a period; infinite with buys and no sells, NaN without transactions.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.columns[f"buys_{period}"] / self.columns[f"sells_{period}"]
+
+    def where(self, **bounds: Tuple[Optional[float], Optional[float]]) -> Any:
+        """
+        A mask of the rows whose columns fall within inclusive `(low, high)` bounds; `None` leaves a side open.
+
+        For example `frame.where(liquidity_usd=(10_000, None), fdv=(None, 5e6))`.
+        """
+        mask: Any = np.ones(len(self), dtype=bool)
+        for column, (low, high) in bounds.items():
+            values: Any = self.columns[column]
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+        return mask
+
+    def filter(self, mask: Any) -> "PairFrame":
+        """
+        Get the rows selected by a boolean mask as a new frame.
+        """
+        return PairFrame({name: values[mask] for name, values in self.columns.items()})
+
+    def _scores(self, score: Score) -> Any:
+        values: Any = self.columns[score] if isinstance(score, str) else np.asarray(score, dtype="float64")
+        # NaN never ranks: push it below every real score.
+        return np.where(np.isnan(values), -np.inf, values)
+
+    def rank(self, score: Score, descending: bool = True) -> Any:
+        """
+        Row positions ordered by a column name or a score array.
+        """
+        order: Any = np.argsort(self._scores(score), kind="stable")
+        return order[::-1] if descending else order
+
+    def top_k(self, score: Score, k: int) -> List[str]:
+        """
+        The addresses of the `k` best-scoring pairs, best first.
+
+        Selection partitions the scores in linear time and only sorts the `k` winners, so
+        taking a short list out of tens of thousands of pairs never sorts the whole frame.
+        """
+        values: Any = self._scores(score)
+        k = min(k, len(values))
+        if k <= 0:
+            return []
+        candidates: Any = np.argpartition(-values, k - 1)[:k]
+        best: Any = candidates[np.argsort(-values[candidates], kind="stable")]
+        return self.columns["pair_address"][best].tolist()
+
+    def update(self, pairs: Iterable[Any]) -> None:
+        """
+        Refresh the rows of changed pairs in place and append pairs not seen before.
+        """
+        changed: Dict[str, Any] = {pair.pair_address: pair for pair in pairs}
+        if not changed:
+            return
+        updates: Dict[str, Any] = _columns(list(changed.values()))
+        rows: Any = np.fromiter((self._index.get(address, -1) for address in changed), dtype="int64",
+                                count=len(changed))
+        known: Any = rows >= 0
+        for name, values in updates.items():
+            self.columns[name][rows[known]] = values[known]
+        if not known.all():
+            start: int = len(self)
+            for name, values in updates.items():
+                self.columns[name] = np.concatenate([self.columns[name], values[~known]])
+            for offset, address in enumerate(updates["pair_address"][~known]):
+                self._index[address] = start + offset
+
+    def remove(self, pair_addresses: Iterable[str]) -> None:
+        """
+        Drop pairs from the frame.
+        """
+        rows: List[int] = [self._index[address] for address in pair_addresses if address in self._index]
+        if not rows:
+            return
+        keep: Any = np.ones(len(self), dtype=bool)
+        keep[rows] = False
+        self.columns = {name: values[keep] for name, values in self.columns.items()}
+        self._index = {address: row for row, address in enumerate(self.columns["pair_address"])}
@@ -2,10 +2,12 @@
 This module contains the models for the DeFi screener.
 """
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 import datetime as dt
 from pydantic import Field
+from ..common.compact import compact_model
 from ..common.easymodel import EasyModel
+from ..common.intern import InternedStr
 
 
 class DefiNetwork(Enum):
@@ -28,9 +30,9 @@ class BaseToken(EasyModel):
     """
     A model for a token on a decentralized exchange.
     """
-    address: str = Field(default=..., alias="address")
-    name: str = Field(default=..., alias="name")
-    symbol: str = Field(default=..., alias="symbol")
+    address: InternedStr = Field(default=..., alias="address")
+    name: InternedStr = Field(default=..., alias="name")
+    symbol: InternedStr = Field(default=..., alias="symbol")
 
 
 class TransactionCount(EasyModel):
@@ -87,10 +89,10 @@ class TokenPair(EasyModel):
     """
     A model for a token pair on a decentralized exchange.
     """
-    chain_id: str = Field(default=..., alias="chainId")
-    dex_id: str = Field(default=..., alias="dexId")
+    chain_id: InternedStr = Field(default=..., alias="chainId")
+    dex_id: InternedStr = Field(default=..., alias="dexId")
     url: str = Field(default=..., alias="url")
-    pair_address: str = Field(default=..., alias="pairAddress")
+    pair_address: InternedStr = Field(default=..., alias="pairAddress")
     base_token: BaseToken = Field(default_factory=BaseToken, alias="baseToken")
     quote_token: BaseToken = Field(
         default_factory=BaseToken, alias="quoteToken")
@@ -106,3 +108,14 @@ class TokenPair(EasyModel):
     fdv: Optional[float] = Field(default=None, alias="fdv")
     pair_created_at: Optional[dt.datetime] = Field(
         default=None, alias="pairCreatedAt")
+
+
+class TokenPairsResponse(EasyModel):
+    """
+    A model for a Dexscreener pairs response; `pairs` is null when nothing matched.
+    """
+    schema_version: Optional[str] = Field(default=None, alias="schemaVersion")
+    pairs: Optional[List[TokenPair]] = Field(default=None, alias="pairs")
+
+
+CompactTokenPair = compact_model(TokenPair)
@@ -1,10 +1,13 @@
 """
 This module contains the MeteoraClient class that interacts with the Meteora API.
 """
-from typing import Any, List, Optional
-import aiohttp
-from pydantic import Field
-from ..common.httpclient import HttpClient
+from datetime import date, datetime, timedelta, timezone
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional
+from pydantic import Field, HttpUrl
+from ..common.cache import CachePolicy
+from ..common.httpclient import HttpClient, HttpRequestMethod
+from ..common.ratelimit import RateLimitPolicy
 from .models import (
     PairInfo,
     AllGroupOfPairs,
@@ -19,35 +22,175 @@ from .models import (
     PositionWithApy,
     WalletEarning,
 )
-from ..common.easymodel import EasyModel
+from .history import HistoryStore
+from ..common.easymodel import EasyModel, get_type_adapter
+from ..common.compact import get_compact_adapter
+from ..common.jsonstream import JsonArrayStream
+
+if TYPE_CHECKING:
+    from .frame import SwapFrame
+
+
+class MeteoraClientConfig(EasyModel):
+    """
+    Configuration for the MeteoraClient class.
+    """
+    base_url: Optional[HttpUrl] = Field(default="https://dlmm-api.meteora.ag", alias="base_url")
+    cache_policies: List[CachePolicy] = Field(
+        default_factory=lambda: [
+            CachePolicy(route="pair/*/analytic/swap_history", ttl=5),
+            CachePolicy(route="pair/*/analytic/*", ttl=5 * 60),
+            CachePolicy(route="pair/all", ttl=60),
+        ],
+        alias="cache_policies",
+    )
+    stale_while_revalidate: bool = Field(default=False, alias="stale_while_revalidate")
+    hedge_requests: bool = Field(default=False, alias="hedge_requests")
+    max_staleness: Optional[float] = Field(default=None, alias="max_staleness")
+    trusted: bool = Field(default=False, alias="trusted")
+    rate_limits: List[RateLimitPolicy] = Field(default_factory=list, alias="rate_limits")
+    history_path: Optional[str] = Field(default=None, alias="history_path")
+    history_settle: float = Field(default=2 * 60 * 60, alias="history_settle")
 
 
 class MeteoraClient(EasyModel):
     """
     Meteora API HTTP client class that interacts with the Meteora API.
     """
-    client: HttpClient = Field(default=..., alias="client")
+    client: HttpClient = Field(default_factory=HttpClient, alias="client")
+    config: MeteoraClientConfig = Field(
+        default_factory=MeteoraClientConfig, alias="config")
+    history: Optional[HistoryStore] = Field(default=None, alias="history")
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)  # type: ignore
-        self.client: HttpClient = HttpClient()
+        self.client.config.base_url = self.config.base_url
+        self.client.add_cache_policies(self.config.cache_policies)
+        self.client.add_rate_limits(self.config.rate_limits)
+        if self.config.stale_while_revalidate:
+            self.client.config.stale_while_revalidate = True
+        if self.config.hedge_requests:
+            self.client.config.hedge_requests = True
+        if self.config.max_staleness is not None:
+            self.client.config.max_staleness = self.config.max_staleness
+        if self.history is None and self.config.history_path is not None:
+            self.history = HistoryStore(path=self.config.history_path)
+
+    async def __aenter__(self) -> "MeteoraClient":
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType]
+    ) -> None:
+        await self.client.__aexit__(exc_type, exc_val, exc_tb)
+        if self.history is not None:
+            self.history.close()
+
+    async def close_async(self) -> None:
+        """
+        Close the pooled connections of the underlying HTTP client.
+        """
+        await self.client.close_async()
+        if self.history is not None:
+            self.history.close()
 
-    async def fetch(self, endpoint: str, params: Optional[dict[str, Any]] = None) -> dict[Any, Any]:
+    def parser(self, tp: Any) -> Any:
         """
-        Fetch data from the Meteora API.
+        Get the parser of a response type, building compact unvalidated records when the client is `trusted`.
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url=endpoint, params=params) as response:
-                response.raise_for_status()
-                return await response.json()
+        return get_compact_adapter(tp) if self.config.trusted else get_type_adapter(tp)
+
+    async def fetch(
+        self,
+        endpoint: str,
+        params: Optional[dict[str, Any]] = None,
+        parser: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """
+        Fetch data from the Meteora API, optionally parsing it inside the HTTP client.
+
+        Parsing inside the client lets a `304 Not Modified` answer reuse the previously parsed result.
+        """
+        return await self.client.api_request_async(endpoint, HttpRequestMethod.GET, params=params, parser=parser)
+
+    async def fetch_history(
+        self,
+        kind: str,
+        pair_address: Optional[str],
+        num_of_days: Optional[int],
+        date_field: str,
+    ) -> List[dict[str, Any]]:
+        """
+        Fetch the daily analytics rows of a pair, serving settled days from the history store.
+
+        A day is settled `history_settle` seconds after it closes, once late rows have arrived.
+        Only the oldest missing day onwards is requested, so once the history is warm only the
+        days that are still open or settling are downloaded.  Empty days are only stored from
+        the oldest day the API returned rows for, as older ones may lie beyond its window.
+        Rows are returned oldest day first.
+        """
+        endpoint: str = f"/pair/{pair_address}/analytic/{kind}"
+        days_wanted: int = num_of_days if num_of_days is not None else 30
+        if self.history is None or pair_address is None:
+            return await self.fetch(endpoint=endpoint, params={"num_of_days": days_wanted})
+        now: datetime = datetime.now(tz=timezone.utc)
+        today: date = now.date()
+        settled_before: str = (now - timedelta(seconds=self.config.history_settle)).date().isoformat()
+        days: List[str] = [(today - timedelta(days=offset)).isoformat() for offset in range(days_wanted - 1, -1, -1)]
+        settled_days: List[str] = [day for day in days if day < settled_before]
+        stored: Dict[str, List[dict[str, Any]]] = self.history.get_days(kind, pair_address, settled_days)
+        needed: List[str] = [day for day in days if day not in stored]
+        fetch_days: int = (today - date.fromisoformat(needed[0])).days + 1 if needed else 1
+        response: List[dict[str, Any]] = await self.fetch(endpoint=endpoint, params={"num_of_days": fetch_days})
+        fetched: Dict[str, List[dict[str, Any]]] = {}
+        for item in response:
+            fetched.setdefault(str(item.get(date_field, ""))[:10], []).append(item)
+        if fetched:
+            oldest: str = min(fetched)
+            self.history.put_days(kind, pair_address, {
+                day: fetched.get(day, []) for day in settled_days if day not in stored and day >= oldest})
+        rows_by_day: Dict[str, List[dict[str, Any]]] = {**stored, **fetched}
+        return [item for day in days for item in rows_by_day.get(day, [])]
 
     async def get_all_pairs(self) -> List[PairInfo]:
         """
         Get all DLMM pairs with their information.
         """
         endpoint = "/pair/all"
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint)
-        return [PairInfo(**pair) for pair in response]
+        return await self.fetch(
+            endpoint=endpoint, parser=self.parser(List[PairInfo]))
+
+    async def iter_all_pairs_batches(self, batch_size: int = 500) -> AsyncIterator[List[PairInfo]]:
+        """
+        Stream all DLMM pairs, yielding them in batches as the response body is parsed.
+
+        Unlike `get_all_pairs`, the `/pair/all` body is never held in memory as a whole, and
+        the first batch is available as soon as its bytes have arrived.
+        """
+        adapter = self.parser(List[PairInfo])
+        stream = JsonArrayStream()
+        batch: List[Any] = []
+        async for chunk in self.client.stream_async("/pair/all", HttpRequestMethod.GET):
+            for item in stream.feed(chunk):
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    yield adapter.validate_python(batch)
+                    batch = []
+        stream.close()
+        if batch:
+            yield adapter.validate_python(batch)
+
+    async def iter_all_pairs(self) -> AsyncIterator[PairInfo]:
+        """
+        Stream all DLMM pairs one at a time as the response body is parsed.
+        """
+        async for batch in self.iter_all_pairs_batches():
+            for pair in batch:
+                yield pair
 
     async def get_all_pairs_by_groups(
         self,
@@ -72,8 +215,8 @@ class MeteoraClient(EasyModel):
             "order_by": order_by.value if order_by is not None else PairOrderType.DESC.value,
             "search_term": search_term if search_term is not None else "",
         }
-        response: dict[str, Any] = await self.fetch(endpoint=endpoint, params=params)
-        return AllGroupOfPairs(**response)
+        return await self.fetch(
+            endpoint=endpoint, params=params, parser=self.parser(AllGroupOfPairs))
 
     async def get_all_pairs_by_groups_metadata(
         self,
@@ -98,8 +241,8 @@ class MeteoraClient(EasyModel):
             "order_by": order_by if order_by is not None else PairOrderType.DESC.value,
             "search_term": search_term if search_term is not None else "",
         }
-        response: dict[str, Any] = await self.fetch(endpoint=endpoint, params=params)
-        return AllGroupOfPairs(**response)
+        return await self.fetch(
+            endpoint=endpoint, params=params, parser=self.parser(AllGroupOfPairs))
 
     async def get_all_pairs_with_pagination(
         self,
@@ -124,16 +267,15 @@ class MeteoraClient(EasyModel):
             "order_by": order_by if order_by is not None else PairOrderType.DESC.value,
             "search_term": search_term if search_term is not None else "",
         }
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint, params=params)
-        return AllPairsWithPagination(**response)
+        return await self.fetch(
+            endpoint=endpoint, params=params, parser=self.parser(AllPairsWithPagination))
 
     async def get_pair_info(self, pair_address: str) -> PairInfo:
         """
         Get information about a specific DLMM pair.
         """
         endpoint: str = f"/pair/{pair_address}"
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint)
-        return PairInfo(**response)
+        return await self.fetch(endpoint=endpoint, parser=self.parser(PairInfo))
 
     async def get_bin_trade_volume_by_days(
         self,
@@ -147,8 +289,8 @@ class MeteoraClient(EasyModel):
         params: dict[str, int | List[str] | str | None] = {
             "num_of_days": num_of_days if num_of_days is not None else 30,
         }
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint, params=params)
-        return [BinTradeVolume(**item) for item in response]
+        return await self.fetch(
+            endpoint=endpoint, params=params, parser=self.parser(List[BinTradeVolume]))
 
     async def get_pair_fee_bps_by_days(
         self,
@@ -158,12 +300,9 @@ class MeteoraClient(EasyModel):
         """
         Get pair fee basis points by days.
         """
-        endpoint: str = f"/pair/{pair_address}/analytic/pair_fee_bps"
-        params: dict[str, int | List[str] | str | None] = {
-            "num_of_days": num_of_days if num_of_days is not None else 30,
-        }
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint, params=params)
-        return [PairFeeBps(**item) for item in response]
+        response: List[dict[str, Any]] = await self.fetch_history(
+            kind="pair_fee_bps", pair_address=pair_address, num_of_days=num_of_days, date_field="hour_date")
+        return self.parser(List[PairFeeBps]).validate_python(response)
 
     async def get_pair_daily_trade_volume_by_days(
         self,
@@ -173,12 +312,9 @@ class MeteoraClient(EasyModel):
         """
         Get pair daily trade volume by days.
         """
-        endpoint: str = f"/pair/{pair_address}/analytic/pair_trade_volume"
-        params: dict[str, int | List[str] | str | None] = {
-            "num_of_days": num_of_days if num_of_days is not None else 30,
-        }
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint, params=params)
-        return [PairTradeVolume(**item) for item in response]
+        response: List[dict[str, Any]] = await self.fetch_history(
+            kind="pair_trade_volume", pair_address=pair_address, num_of_days=num_of_days, date_field="day_date")
+        return self.parser(List[PairTradeVolume]).validate_python(response)
 
     async def get_pair_tvl_by_days(
         self,
@@ -188,12 +324,9 @@ class MeteoraClient(EasyModel):
         """
         Get pair TVL by days.
         """
-        endpoint: str = f"/pair/{pair_address}/analytic/pair_tvl"
-        params: dict[str, int | List[str] | str | None] = {
-            "num_of_days": num_of_days if num_of_days is not None else 30,
-        }
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint, params=params)
-        return [PairTvlSnapshotByDay(**item) for item in response]
+        response: List[dict[str, Any]] = await self.fetch_history(
+            kind="pair_tvl", pair_address=pair_address, num_of_days=num_of_days, date_field="day_date")
+        return self.parser(List[PairTvlSnapshotByDay]).validate_python(response)
 
     async def get_pair_swap_records(
         self,
@@ -207,8 +340,20 @@ class MeteoraClient(EasyModel):
         params: dict[str, int | List[str] | str | None] = {
             "rows_to_take": rows_to_take if rows_to_take is not None else 100
         }
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint, params=params)
-        return [Swap(**item) for item in response]
+        return await self.fetch(
+            endpoint=endpoint, params=params, parser=self.parser(List[Swap]))
+
+    async def get_pair_swap_frame(
+        self,
+        pair_address: Optional[str] = None,
+        rows_to_take: Optional[int] = None
+    ) -> "SwapFrame":
+        """
+        Get pair swap records as a columnar `SwapFrame` for vectorized analytics; requires numpy.
+        """
+        from .frame import SwapFrame
+
+        return SwapFrame.from_swaps(await self.get_pair_swap_records(pair_address, rows_to_take))
 
     async def get_position_info(
         self,
@@ -218,8 +363,7 @@ class MeteoraClient(EasyModel):
         Get information about a specific DLMM position.
         """
         endpoint: str = f"/position/{position_address}"
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint)
-        return PositionWithApy(**response)
+        return await self.fetch(endpoint=endpoint, parser=self.parser(PositionWithApy))
 
     async def get_wallet_earning(
         self,
@@ -230,5 +374,5 @@ class MeteoraClient(EasyModel):
         Get wallet earning information.
         """
         endpoint: str = f"/wallet/{wallet_address}/{pair_address}/earning"
-        response: dict[Any, Any] = await self.fetch(endpoint=endpoint)
-        return [WalletEarning(**item) for item in response]
+        return await self.fetch(
+            endpoint=endpoint, parser=self.parser(List[WalletEarning]))
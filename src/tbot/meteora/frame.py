@@ -0,0 +1,198 @@
+"""
+Python module for columnar, vectorized analytics over Meteora swap history.
+
+NumPy is an optional dependency: install the `analytics` extra to use it.
+"""
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+
+# Column name, numpy dtype.  Raw token amounts are u64 on-chain, so they do not fit in int64.
+SWAP_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("onchain_timestamp", "int64"),
+    ("in_amount", "uint64"),
+    ("out_amount", "uint64"),
+    ("in_amount_usd", "float64"),
+    ("out_amount_usd", "float64"),
+    ("trade_fee", "uint64"),
+    ("trade_fee_usd", "float64"),
+    ("protocol_fee", "uint64"),
+    ("protocol_fee_usd", "float64"),
+    ("start_bin_id", "int32"),
+    ("end_bin_id", "int32"),
+    ("bin_count", "int32"),
+    ("fee_bps", "float64"),
+    ("pair_address", "object"),
+    ("in_token", "object"),
+    ("out_token", "object"),
+    ("tx_id", "object"),
+)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("SwapFrame requires numpy; install it with `pip install tbot[analytics]`")
+
+
+class SwapFrame:
+    """
+    Swap history held as one NumPy array per field, ordered by on-chain timestamp.
+
+    Aggregations run over whole columns instead of looping over `Swap` objects in Python.
+    Prices and amounts of the base token are in raw units unless `decimals` is given.
+    """
+
+    def __init__(self, columns: Dict[str, Any]) -> None:
+        _require_numpy()
+        order: Any = np.argsort(columns["onchain_timestamp"], kind="stable")
+        self.columns: Dict[str, Any] = {name: np.asarray(values)[order] for name, values in columns.items()}
+
+    @classmethod
+    def _build(cls, rows: Sequence[Any], getter: Callable[[str], Callable[[Any], Any]]) -> "SwapFrame":
+        _require_numpy()
+        count: int = len(rows)
+        columns: Dict[str, Any] = {}
+        for name, dtype in SWAP_COLUMNS:
+            get: Callable[[Any], Any] = getter(name)
+            if dtype == "object":
+                column: Any = np.empty(count, dtype=object)
+                column[:] = list(map(get, rows))
+            else:
+                column = np.fromiter(map(get, rows), dtype=dtype, count=count)
+            columns[name] = column
+        return cls(columns)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "SwapFrame":
+        """
+        Build a frame straight from the decoded `swap_history` payload.
+        """
+        return cls._build(records, itemgetter)
+
+    @classmethod
+    def from_swaps(cls, swaps: Sequence[Any]) -> "SwapFrame":
+        """
+        Build a frame from parsed `Swap` models or their compact records.
+        """
+        return cls._build(swaps, attrgetter)
+
+    @classmethod
+    def concat(cls, frames: Iterable["SwapFrame"]) -> "SwapFrame":
+        """
+        Merge the frames of several pools into one, ordered by timestamp.
+        """
+        _require_numpy()
+        frames = list(frames)
+        if not frames:
+            return cls({name: np.empty(0, dtype=dtype) for name, dtype in SWAP_COLUMNS})
+        return cls({
+            name: np.concatenate([frame.columns[name] for frame in frames]) for name, _dtype in SWAP_COLUMNS
+        })
+
+    def __len__(self) -> int:
+        return len(self.columns["onchain_timestamp"])
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.__dict__["columns"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def for_pair(self, pair_address: str) -> "SwapFrame":
+        """
+        Get the swaps of one pool.
+        """
+        mask: Any = self.columns["pair_address"] == pair_address
+        return SwapFrame({name: values[mask] for name, values in self.columns.items()})
+
+    def is_buy(self, base_mint: str) -> Any:
+        """
+        A boolean column that is true for swaps that bought the base token.
+        """
+        return self.columns["out_token"] == base_mint
+
+    def base_amount(self, base_mint: str, decimals: int = 0) -> Any:
+        """
+        The amount of base token traded by each swap, whichever side it was on.
+        """
+        amount: Any = np.where(self.is_buy(base_mint), self.columns["out_amount"], self.columns["in_amount"])
+        return amount.astype("float64") / 10 ** decimals
+
+    @property
+    def volume_usd(self) -> Any:
+        """
+        The USD notional of each swap, valued on its input side.
+        """
+        return self.columns["in_amount_usd"]
+
+    def vwap(self, base_mint: str, decimals: int = 0) -> float:
+        """
+        The volume-weighted average USD price of the base token over the whole frame.
+        """
+        amount: Any = self.base_amount(base_mint, decimals)
+        total: float = float(amount.sum())
+        return float(self.volume_usd.sum()) / total if total else float("nan")
+
+    def rolling_vwap(self, base_mint: str, window: float, decimals: int = 0) -> Any:
+        """
+        The VWAP of the base token at each swap, over the swaps of the trailing `window` seconds.
+        """
+        timestamps: Any = self.columns["onchain_timestamp"]
+        volume: Any = np.concatenate(([0.0], np.cumsum(self.volume_usd)))
+        amount: Any = np.concatenate(([0.0], np.cumsum(self.base_amount(base_mint, decimals))))
+        end: Any = np.arange(1, len(self) + 1)
+        start: Any = np.searchsorted(timestamps, timestamps - window, side="right")
+        traded: Any = amount[end] - amount[start]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(traded > 0, (volume[end] - volume[start]) / traded, np.nan)
+
+    def volume_by_bucket(self, seconds: int, column: str = "in_amount_usd") -> Tuple[Any, Any]:
+        """
+        Sum a column per time bucket, returning the bucket start times and their totals.
+        """
+        buckets: Any = self.columns["onchain_timestamp"] // seconds * seconds
+        starts, inverse = np.unique(buckets, return_inverse=True)
+        return starts, np.bincount(inverse, weights=self.columns[column], minlength=len(starts))
+
+    def bin_histogram(self) -> Tuple[Any, Any]:
+        """
+        The USD volume that flowed through each bin, spreading every swap evenly over the bins it crossed.
+        """
+        low: Any = np.minimum(self.columns["start_bin_id"], self.columns["end_bin_id"]).astype("int64")
+        high: Any = np.maximum(self.columns["start_bin_id"], self.columns["end_bin_id"]).astype("int64")
+        spans: Any = high - low + 1
+        offsets: Any = np.arange(int(spans.sum())) - np.repeat(np.cumsum(spans) - spans, spans)
+        bins: Any = np.repeat(low, spans) + offsets
+        weights: Any = np.repeat(self.volume_usd / spans, spans)
+        bin_ids, inverse = np.unique(bins, return_inverse=True)
+        return bin_ids, np.bincount(inverse, weights=weights, minlength=len(bin_ids))
+
+    def fees(self) -> Dict[str, float]:
+        """
+        Total trade and protocol fees in USD.
+        """
+        return {
+            "trade_fee_usd": float(self.columns["trade_fee_usd"].sum()),
+            "protocol_fee_usd": float(self.columns["protocol_fee_usd"].sum()),
+        }
+
+    def imbalance(self, base_mint: str) -> float:
+        """
+        The buy/sell imbalance of the base token in USD, from -1 (only sells) to 1 (only buys).
+        """
+        buys: Any = self.is_buy(base_mint)
+        bought: float = float(self.volume_usd[buys].sum())
+        sold: float = float(self.volume_usd[~buys].sum())
+        total: float = bought + sold
+        return (bought - sold) / total if total else 0.0
+
+    def pairs(self) -> List[str]:
+        """
+        The distinct pool addresses in the frame.
+        """
+        return sorted(set(self.columns["pair_address"].tolist()))
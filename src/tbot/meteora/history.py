@@ -0,0 +1,72 @@
+"""
+This module contains a persistent on-disk store for closed days of Meteora analytics history.
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import Field, PrivateAttr
+
+from ..common.easymodel import EasyModel
+
+
+class HistoryStore(EasyModel):
+    """
+    SQLite-backed store of analytics rows keyed by history kind, pair address and UTC day.
+
+    Only settled days belong here, closed long enough ago that no late rows arrive for them:
+    their rows never change, so they are served from disk across process restarts instead of
+    being downloaded again.
+    """
+    path: str = Field(default=..., alias="path")
+    _conn: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "kind TEXT NOT NULL, pair_address TEXT NOT NULL, day TEXT NOT NULL, rows TEXT NOT NULL, "
+                "PRIMARY KEY (kind, pair_address, day))"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get_days(self, kind: str, pair_address: str, days: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the stored rows of the requested days; days that are not stored are left out.
+        """
+        wanted: List[str] = list(days)
+        if not wanted:
+            return {}
+        with self._lock:
+            cursor: sqlite3.Cursor = self._connection().execute(
+                f"SELECT day, rows FROM history WHERE kind = ? AND pair_address = ? "
+                f"AND day IN ({','.join('?' * len(wanted))})",
+                (kind, pair_address, *wanted),
+            )
+            return {day: json.loads(rows) for day, rows in cursor.fetchall()}
+
+    def put_days(self, kind: str, pair_address: str, rows_by_day: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Store the rows of settled days, replacing what was stored for them before.
+        """
+        if not rows_by_day:
+            return
+        with self._lock:
+            conn: sqlite3.Connection = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO history (kind, pair_address, day, rows) VALUES (?, ?, ?, ?)",
+                [(kind, pair_address, day, json.dumps(rows)) for day, rows in rows_by_day.items()],
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
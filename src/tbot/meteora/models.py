@@ -1,11 +1,15 @@
 """
 This module contains the MeteoraClient model and type hints.
 """
+from decimal import Decimal
 from enum import Enum
+from functools import cached_property
 from typing import List
 from pydantic import Field
 
+from ..common.compact import compact_model
 from ..common.easymodel import EasyModel
+from ..common.intern import InternedStr
 
 
 class DefiNetwork(Enum):
@@ -48,8 +52,8 @@ class PairInfo(EasyModel):
     """
     address: str = Field(default=..., alias="address")
     name: str = Field(default=..., alias="name")
-    mint_x: str = Field(default=..., alias="mint_x")
-    mint_y: str = Field(default=..., alias="mint_y")
+    mint_x: InternedStr = Field(default=..., alias="mint_x")
+    mint_y: InternedStr = Field(default=..., alias="mint_y")
     reserve_x: str = Field(default=..., alias="reserve_x")
     reserve_x_amount: int = Field(default=..., alias="reserve_x_amount")
     reserve_y: str = Field(default=..., alias="reserve_y")
@@ -59,8 +63,8 @@ class PairInfo(EasyModel):
     max_fee_percentage: str = Field(default=..., alias="max_fee_percentage")
     protocol_fee_percentage: str = Field(default=..., alias="protocol_fee_percentage")
     liquidity: str = Field(default=..., alias="liquidity")
-    reward_mint_x: str = Field(default=..., alias="reward_mint_x")
-    reward_mint_y: str = Field(default=..., alias="reward_mint_y")
+    reward_mint_x: InternedStr = Field(default=..., alias="reward_mint_x")
+    reward_mint_y: InternedStr = Field(default=..., alias="reward_mint_y")
     fees_24h: float = Field(default=..., alias="fees_24h")
     today_fees: float = Field(default=..., alias="today_fees")
     trade_volume_24h: float = Field(default=..., alias="trade_volume_24h")
@@ -74,6 +78,34 @@ class PairInfo(EasyModel):
     farm_apy: float = Field(default=..., alias="farm_apy")
     hide: bool = Field(default=..., alias="hide")
 
+    @cached_property
+    def liquidity_value(self) -> Decimal:
+        """
+        The liquidity as a Decimal, parsed on first access.
+        """
+        return Decimal(self.liquidity)
+
+    @cached_property
+    def base_fee_percentage_value(self) -> Decimal:
+        """
+        The base fee percentage as a Decimal, parsed on first access.
+        """
+        return Decimal(self.base_fee_percentage)
+
+    @cached_property
+    def max_fee_percentage_value(self) -> Decimal:
+        """
+        The max fee percentage as a Decimal, parsed on first access.
+        """
+        return Decimal(self.max_fee_percentage)
+
+    @cached_property
+    def protocol_fee_percentage_value(self) -> Decimal:
+        """
+        The protocol fee percentage as a Decimal, parsed on first access.
+        """
+        return Decimal(self.protocol_fee_percentage)
+
 
 class AllGroupOfPairs(EasyModel):
     """
@@ -108,12 +140,26 @@ class BinTradeVolume(EasyModel):
     total_amount_x: str = Field(default=..., alias="total_amount_x")
     total_amount_usd: float = Field(default=..., alias="total_amount_usd")
 
+    @cached_property
+    def total_amount_x_value(self) -> int:
+        """
+        The X token amount as an integer, parsed on first access.
+        """
+        return int(self.total_amount_x)
+
+    @cached_property
+    def total_amount_y_value(self) -> int:
+        """
+        The Y token amount as an integer, parsed on first access.
+        """
+        return int(self.total_amount_y)
+
 
 class PairFeeBps(EasyModel):
     """
     Model class for pair fee basis points.
     """
-    pair_address: str = Field(default=..., alias="pair_address")
+    pair_address: InternedStr = Field(default=..., alias="pair_address")
     min_fee_bps: float = Field(default=..., alias="min_fee_bps")
     max_fee_bps: float = Field(default=..., alias="max_fee_bps")
     average_fee_bps: float = Field(default=..., alias="average_fee_bps")
@@ -124,7 +170,7 @@ class PairTradeVolume(EasyModel):
     """
     Model class for pair daily trade volume by days.
     """
-    pair_address: str = Field(default=..., alias="pair_address")
+    pair_address: InternedStr = Field(default=..., alias="pair_address")
     trade_volume: float = Field(default=..., alias="trade_volume")
     fee_volume: float = Field(default=..., alias="fee_volume")
     protocol_fee_volume: float = Field(default=..., alias="protocol_fee_volume")
@@ -135,7 +181,7 @@ class PairTvlSnapshotByDay(EasyModel):
     """
     Model class for pair TVL snapshot by days.
     """
-    pair_address: str = Field(default=..., alias="pair_address")
+    pair_address: InternedStr = Field(default=..., alias="pair_address")
     total_value_locked: float = Field(default=..., alias="total_value_locked")
     day_date: str = Field(default=..., alias="day_date")
 
@@ -154,13 +200,13 @@ class Swap(EasyModel):
     protocol_fee: int = Field(default=..., alias="protocol_fee")
     protocol_fee_usd: float = Field(default=..., alias="protocol_fee_usd")
     onchain_timestamp: int = Field(default=..., alias="onchain_timestamp")
-    pair_address: str = Field(default=..., alias="pair_address")
+    pair_address: InternedStr = Field(default=..., alias="pair_address")
     start_bin_id: int = Field(default=..., alias="start_bin_id")
     end_bin_id: int = Field(default=..., alias="end_bin_id")
     bin_count: int = Field(default=..., alias="bin_count")
     fee_bps: float = Field(default=..., alias="fee_bps")
-    in_token: str = Field(default=..., alias="in_token")
-    out_token: str = Field(default=..., alias="out_token")
+    in_token: InternedStr = Field(default=..., alias="in_token")
+    out_token: InternedStr = Field(default=..., alias="out_token")
 
 
 class PositionWithApy(EasyModel):
@@ -168,7 +214,7 @@ class PositionWithApy(EasyModel):
     Model class for DLMM position information with APY.
     """
     address: str = Field(default=..., alias="address")
-    pair_address: str = Field(default=..., alias="pair_address")
+    pair_address: InternedStr = Field(default=..., alias="pair_address")
     owner: str = Field(default=..., alias="owner")
     total_fee_x_claimed: int = Field(default=..., alias="total_fee_x_claimed")
     total_fee_y_claimed: int = Field(default=..., alias="total_fee_y_claimed")
@@ -193,3 +239,35 @@ class WalletEarning(EasyModel):
                                             alias="total_reward_usd_claimed")
     total_reward_x_claimed: str = Field(default=..., alias="total_reward_x_claimed")
     total_reward_y_claimed: str = Field(default=..., alias="total_reward_y_claimed")
+
+    @cached_property
+    def total_fee_x_claimed_value(self) -> int:
+        """
+        The claimed X token fees as an integer, parsed on first access.
+        """
+        return int(self.total_fee_x_claimed)
+
+    @cached_property
+    def total_fee_y_claimed_value(self) -> int:
+        """
+        The claimed Y token fees as an integer, parsed on first access.
+        """
+        return int(self.total_fee_y_claimed)
+
+    @cached_property
+    def total_reward_x_claimed_value(self) -> int:
+        """
+        The claimed X token rewards as an integer, parsed on first access.
+        """
+        return int(self.total_reward_x_claimed)
+
+    @cached_property
+    def total_reward_y_claimed_value(self) -> int:
+        """
+        The claimed Y token rewards as an integer, parsed on first access.
+        """
+        return int(self.total_reward_y_claimed)
+
+
+CompactPairInfo = compact_model(PairInfo)
+CompactSwap = compact_model(Swap)
@@ -0,0 +1,65 @@
+import asyncio
+
+import aiohttp
+import pytest
+from tbot.birdeye.client import BirdeyeClient
+from tbot.birdeye.models import DefiNetwork, MultiTokenPriceResponse
+
+
+class FakeBirdeye:
+    """
+    Answers `multi_price` with the number of the call as the price of every known address.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.failing = None
+
+    def api_request(self, endpoint, method, params=None, headers=None, parser=None):
+        assert endpoint == "multi_price"
+        addresses = params["list_address"].split(",")
+        self.calls.append((headers["X-CHAIN"], addresses))
+        if self.failing in addresses:
+            raise aiohttp.ClientConnectionError("down")
+        return MultiTokenPriceResponse(data={
+            address: {"value": float(len(self.calls))} for address in addresses if address != "unknown"})
+
+    async def api_request_async(self, endpoint, method, **kwargs):
+        return self.api_request(endpoint, method, **kwargs)
+
+
+@pytest.mark.parametrize("fake_api", [FakeBirdeye], indirect=True)
+@pytest.mark.asyncio
+async def test_get_prices_async_groups_by_network_and_reports_failed_chunks(fake_api):
+    fake_api.failing = "e3"
+    client = BirdeyeClient(config={"max_addresses": 2})
+    bulk = await client.get_prices_async({
+        DefiNetwork.SOLANA: ["s1", "s2", "s3", "unknown"],
+        DefiNetwork.ETHEREUM: ["e1", "e2", "e3"],
+    })
+    assert sorted(fake_api.calls) == [
+        ("ethereum", ["e1", "e2"]), ("ethereum", ["e3"]), ("solana", ["s1", "s2"]), ("solana", ["s3", "unknown"])]
+    assert set(bulk.prices) == {"s1", "s2", "s3", "e1", "e2"}
+    assert len(bulk.errors) == 1
+    assert bulk.errors[0].network == DefiNetwork.ETHEREUM
+    assert bulk.failed == ["e3"]
+    assert isinstance(bulk.errors[0].error, aiohttp.ClientConnectionError)
+
+
+@pytest.mark.parametrize("fake_api", [FakeBirdeye], indirect=True)
+def test_get_prices_chunks_a_plain_list_on_one_network(fake_api):
+    addresses = [f"t{i}" for i in range(250)]
+    bulk = BirdeyeClient().get_prices(addresses + addresses[:10], DefiNetwork.ETHEREUM)
+    assert [len(chunk) for _, chunk in fake_api.calls] == [100, 100, 50]
+    assert {network for network, _ in fake_api.calls} == {"ethereum"}
+    assert list(bulk.prices) == addresses
+    assert not bulk.errors
+
+
+@pytest.mark.parametrize("fake_api", [FakeBirdeye], indirect=True)
+@pytest.mark.asyncio
+async def test_batched_get_price_async_sends_one_multi_price(fake_api):
+    client = BirdeyeClient(config={"batch_prices": True})
+    prices = await asyncio.gather(*(client.get_price_async(f"t{i}") for i in range(5)), client.get_price_async("unknown"))
+    assert fake_api.calls == [("solana", ["t0", "t1", "t2", "t3", "t4", "unknown"])]
+    assert [price.value for price in prices] == [1.0] * 5 + [None]
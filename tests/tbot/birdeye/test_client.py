@@ -31,3 +31,16 @@ async def test_get_price_async_with_asyncio(birdeye_client, mocker):
     price = await birdeye_client.get_price_async("address", DefiNetwork.SOLANA)
     assert price.value == 100.0
     assert price.updateHumanTime == "09-30-2021 @ 17:00:00 PM (UTC)"
+
+
+def test_get_multi_price_keeps_input_order(birdeye_client, mocker):
+    mock_request = mocker.patch('requests.Session.request')
+    mock_request.return_value.status_code = 200
+    mock_request.return_value.headers = {}
+    mock_request.return_value.content = (
+        b'{"data": {"b": {"value": 2.0, "updateUnixTime": 1633024800},'
+        b' "a": {"value": 1.0, "updateUnixTime": 1633024800}}, "success": true}'
+    )
+
+    prices = birdeye_client.get_multi_price(["a", "b", "c"])
+    assert [price.value for price in prices] == [1.0, 2.0]
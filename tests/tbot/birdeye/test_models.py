@@ -1,4 +1,7 @@
-from tbot.birdeye.models import BirdEyeResponse, SupportedNetworks, DefiNetwork
+from datetime import timezone
+
+from tbot.birdeye import models
+from tbot.birdeye.models import BirdEyeResponse, CompactTokenPrice, SupportedNetworks, DefiNetwork, TokenPrice
 
 
 def test_birdeye_response_model():
@@ -11,3 +14,20 @@ def test_supported_networks_model():
     supported_networks = SupportedNetworks(data=["solana", "ethereum"])
     assert supported_networks[0] == DefiNetwork.SOLANA
     assert supported_networks[1] == DefiNetwork.ETHEREUM
+
+
+def test_token_price_human_time_is_lazy(mocker):
+    zone = mocker.patch.object(models, "local_zone", return_value=timezone.utc)
+    price = TokenPrice(value=1.0, updateUnixTime=1633024800)
+    zone.assert_not_called()
+    assert price.updateHumanTime == "09-30-2021 @ 18:00:00 PM (UTC)"
+    assert price.updateHumanTime == "09-30-2021 @ 18:00:00 PM (UTC)"
+    zone.assert_called_once()
+    assert price.to_dict()["updateHumanTime"] == "09-30-2021 @ 18:00:00 PM (UTC)"
+    assert TokenPrice(value=1.0).updateHumanTime is None
+
+
+def test_compact_token_price_human_time(mocker):
+    mocker.patch.object(models, "local_zone", return_value=timezone.utc)
+    price = CompactTokenPrice.from_dict({"value": 1.0, "updateUnixTime": 1633024800})
+    assert price.updateHumanTime == "09-30-2021 @ 18:00:00 PM (UTC)"
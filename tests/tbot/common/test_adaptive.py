@@ -0,0 +1,99 @@
+import time
+from email.utils import formatdate
+
+import pytest
+from tbot.common.adaptive import AdaptiveRate, ratelimit_limit, ratelimit_reset, retry_after
+from tbot.common.httpclient import HttpClient, HttpRequestMethod
+from tbot.common.ratelimit import LimiterRegistry, RateLimiter
+
+
+def test_retry_after_accepts_seconds_and_dates():
+    assert retry_after({"Retry-After": "3"}) == 3
+    assert retry_after({"Retry-After": formatdate(time.time() + 60, usegmt=True)}) == pytest.approx(60, abs=2)
+    assert retry_after({"Retry-After": "soon"}) is None
+    assert retry_after({}) is None
+
+
+def test_ratelimit_reset_accepts_deltas_and_timestamps():
+    assert ratelimit_reset("30") == 30
+    assert ratelimit_reset(str(int(time.time()) + 30)) == pytest.approx(30, abs=2)
+    assert ratelimit_reset(str(int(time.time() * 1000) + 30_000)) == pytest.approx(30, abs=2)
+    assert ratelimit_reset(None) is None
+
+
+def test_aimd_halves_on_429_and_recovers_additively():
+    controller = AdaptiveRate(limiter=RateLimiter(max_calls=100, period=1), increase=10)
+    controller.observe(429, {})
+    assert controller.rate == pytest.approx(50)
+    assert controller.throttled == 1
+    for _ in range(3):
+        controller.observe(200, {})
+    assert controller.rate == pytest.approx(80)
+    for _ in range(10):
+        controller.observe(200, {})
+    assert controller.rate == pytest.approx(100)
+
+
+def test_retry_after_holds_back_calls():
+    limiter = RateLimiter(max_calls=100, period=1)
+    AdaptiveRate(limiter=limiter).observe(429, {"Retry-After": "2"})
+    assert limiter.reserve()[0] == pytest.approx(2, abs=0.05)
+
+
+def test_ratelimit_headers_pace_the_window():
+    limiter = RateLimiter(max_calls=100, period=1)
+    controller = AdaptiveRate(limiter=limiter)
+    controller.observe(200, {"X-RateLimit-Remaining": "20", "X-RateLimit-Reset": "10"})
+    assert controller.rate == pytest.approx(2)
+    controller.observe(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "5"})
+    assert limiter.reserve()[0] == pytest.approx(5, abs=0.05)
+
+
+def test_client_exposes_learned_rate_shared_by_host(mocker):
+    registry = LimiterRegistry()
+    client = HttpClient(config={"ratelimit_max_calls": 60, "ratelimit_period": 1}, limiter_registry=registry)
+    other = HttpClient(config={"ratelimit_max_calls": 60, "ratelimit_period": 1}, limiter_registry=registry)
+    request = mocker.patch("requests.Session.request")
+    request.return_value.status_code = 200
+    request.return_value.content = b"{}"
+    request.return_value.headers = {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": "10"}
+    client.api_request("test", HttpRequestMethod.GET)
+    assert client.current_rate == pytest.approx(10)
+    assert other.current_rate == pytest.approx(10)
+    assert registry.rates() == {"api.dexscreener.io": pytest.approx(10)}
+
+
+def test_ratelimit_limit_reads_the_window():
+    assert ratelimit_limit("600", 60) == pytest.approx(10)
+    assert ratelimit_limit("100;w=10", 60) == pytest.approx(10)
+    assert ratelimit_limit("100, 1000;w=3600", 1) == pytest.approx(100)
+    assert ratelimit_limit("many", 60) is None
+    assert ratelimit_limit(None, 60) is None
+
+
+def test_rate_climbs_to_a_configured_or_announced_ceiling():
+    controller = AdaptiveRate(limiter=RateLimiter(max_calls=10, period=1), ceiling=20, increase=5)
+    for _ in range(5):
+        controller.observe(200, {})
+    assert controller.rate == pytest.approx(20)
+    controller.observe(200, {"X-RateLimit-Limit": "3000", "X-RateLimit-Remaining": "3000", "X-RateLimit-Reset": "60"})
+    assert controller.ceiling == pytest.approx(3000)
+    for _ in range(4):
+        controller.observe(200, {})
+    assert controller.rate == pytest.approx(45)
+    controller.observe(200, {"X-RateLimit-Limit": "15"})
+    assert controller.rate == pytest.approx(15)
+
+
+def test_client_rate_can_exceed_the_configured_start(mocker):
+    client = HttpClient(
+        config={"ratelimit_max_calls": 10, "ratelimit_period": 1, "ratelimit_ceiling": 50},
+        limiter_registry=LimiterRegistry(),
+    )
+    request = mocker.patch("requests.Session.request")
+    request.return_value.status_code = 200
+    request.return_value.content = b"{}"
+    request.return_value.headers = {}
+    for page in range(5):
+        client.api_request("test", HttpRequestMethod.GET, params={"page": page})
+    assert client.current_rate > 10
@@ -0,0 +1,122 @@
+import pickle
+import time
+
+import pytest
+import requests
+from tbot.common.breaker import CircuitBreaker, CircuitBreakers, CircuitOpen, CircuitState, circuit_breaker
+from tbot.common.deadline import DeadlineExceeded
+from tbot.common.httpclient import HttpClient, HttpRequestMethod
+from tbot.common.ratelimit import LimiterRegistry
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_through_half_open():
+    transitions = []
+    breaker = CircuitBreaker(window=4, min_calls=4, failure_rate=0.5, open_for=0.05,
+                             listeners=[transitions.append])
+    for success in (True, False, True, False):
+        breaker.before_call()
+        breaker.record(success)
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+    assert breaker.rejected == 1
+    time.sleep(0.06)
+    breaker.before_call()
+    assert breaker.state is CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+    breaker.record(True)
+    assert breaker.state is CircuitState.CLOSED
+    assert [(t.old, t.new) for t in transitions] == [
+        (CircuitState.CLOSED, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+
+
+def test_failed_probe_reopens_and_cancelled_probe_is_released():
+    breaker = CircuitBreaker(min_calls=1, open_for=0)
+    breaker.before_call()
+    breaker.record(False)
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    breaker.record(False)
+    assert breaker.state is CircuitState.OPEN
+
+
+@pytest.fixture
+def failing_client(mocker):
+    mocker.patch("tbot.common.retry.time.sleep")
+    client = HttpClient(config={
+        "circuit_min_calls": 2,
+        "cache_enabled": True,
+        "cache_policies": [{"route": "price", "ttl": 0.01}],
+    }, limiter_registry=LimiterRegistry())
+    request = mocker.patch("requests.Session.request")
+    request.return_value.status_code = 200
+    request.return_value.content = b'{"price": 1}'
+    request.return_value.headers = {}
+    return client, request
+
+
+def test_open_circuit_fails_fast_without_requests(failing_client):
+    client, request = failing_client
+    request.return_value.status_code = 503
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.api_request("networks", HttpRequestMethod.GET)
+    calls = request.call_count
+    with pytest.raises(CircuitOpen):
+        client.api_request("networks", HttpRequestMethod.GET)
+    assert request.call_count == calls
+    assert client.circuit_states() == {"api.dexscreener.io/*": CircuitState.OPEN}
+
+
+def test_open_circuit_falls_back_to_cached_data(failing_client):
+    client, request = failing_client
+    assert client.api_request("price", HttpRequestMethod.GET) == {"price": 1}
+    request.return_value.status_code = 503
+    with pytest.raises(requests.HTTPError):
+        client.api_request("price", HttpRequestMethod.GET, params={"address": "a"})
+    assert client.circuit_states()["api.dexscreener.io/price"] is CircuitState.OPEN
+    time.sleep(0.02)
+    assert client.api_request("price", HttpRequestMethod.GET) == {"price": 1}
+    with pytest.raises(CircuitOpen):
+        client.api_request("price", HttpRequestMethod.GET, params={"address": "b"})
+
+
+class Guarded:
+    def __init__(self, error):
+        self.circuit_breakers = CircuitBreakers(settings={"min_calls": 1, "open_for": 0.01})
+        self.error = error
+        self.calls = 0
+
+    def circuit_key(self):
+        return "host/*"
+
+    @circuit_breaker()
+    def call(self):
+        self.calls += 1
+        raise self.error
+
+
+def test_probe_that_never_reached_the_host_keeps_the_circuit_from_closing():
+    guarded = Guarded(ValueError("down"))
+    with pytest.raises(ValueError):
+        guarded.call()
+    breaker = guarded.circuit_breakers.get("host/*")
+    assert breaker.state is CircuitState.OPEN
+    time.sleep(0.02)
+    guarded.error = DeadlineExceeded("limiter wait")
+    for _ in range(2):
+        with pytest.raises(DeadlineExceeded):
+            guarded.call()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert guarded.calls == 3
+
+
+def test_circuit_open_survives_pickling():
+    error = pickle.loads(pickle.dumps(CircuitOpen("host/*", 1.5)))
+    assert (error.key, error.retry_in) == ("host/*", 1.5)
+    assert str(error) == "Circuit host/* is open, retry in 1.5s"
@@ -0,0 +1,89 @@
+import threading
+import time
+import traceback
+from tbot.common.cache import CachePolicy, ResponseCache
+
+
+def test_policy_matches_route_globs():
+    cache = ResponseCache(policies=[
+        CachePolicy(route="pair/*/analytic/swap_history", ttl=5),
+        CachePolicy(route="pair/*/analytic/*", ttl=300),
+    ])
+    assert cache.policy_for("/pair/abc/analytic/swap_history").ttl == 5
+    assert cache.policy_for("pair/abc/analytic/pair_tvl").ttl == 300
+    assert cache.policy_for("pair/all") is None
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache()
+    cache.set("key", {"value": 1}, ttl=0.05)
+    assert cache.get("key").value == {"value": 1}
+    time.sleep(0.06)
+    assert cache.get("key") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a").value == 1 and cache.get("c").value == 3
+
+
+def test_stale_entries_are_only_served_when_allowed():
+    cache = ResponseCache()
+    cache.set("key", 1, ttl=0.02, max_staleness=60)
+    time.sleep(0.03)
+    assert cache.get("key") is None
+    entry = cache.get("key", allow_stale=True)
+    assert entry.value == 1 and not entry.fresh
+    assert cache.stale_hits == 1
+
+
+def test_negative_results_and_errors_use_negative_ttl():
+    class NotFound(Exception):
+        status = 404
+
+    policy = CachePolicy(route="dex/pairs/*", ttl=0, negative_ttl=60, negative_field="pairs")
+    cache = ResponseCache(policies=[policy])
+    cache.store("empty", {"pairs": None}, policy)
+    cache.store("full", {"pairs": []}, policy)
+    cache.store_error("missing", NotFound(), policy)
+    cache.store_error("broken", ValueError(), policy)
+    assert cache.get("empty").value == {"pairs": None}
+    assert cache.get("full") is None
+    assert isinstance(cache.get("missing").error, NotFound)
+    assert cache.get("broken") is None
+
+
+def test_cached_errors_are_raised_as_fresh_copies():
+    class NotFound(Exception):
+        status = 404
+
+    policy = CachePolicy(route="price", ttl=0, negative_ttl=60)
+    cache = ResponseCache(policies=[policy])
+    cache.store_error("missing", NotFound("gone"), policy)
+    raised = []
+    for _ in range(3):
+        try:
+            cache.get("missing").unwrap()
+        except NotFound as e:
+            raised.append(e)
+    assert len({id(error) for error in raised}) == 3
+    assert all(str(error) == "gone" and error.status == 404 for error in raised)
+    assert len({len(traceback.extract_tb(error.__traceback__)) for error in raised}) == 1
+    assert cache.get("missing").error.__traceback__ is None
+
+
+def test_close_shuts_the_refresh_pool_down():
+    cache = ResponseCache()
+    done = threading.Event()
+    cache.submit(done.set)
+    assert done.wait(1)
+    executor = cache._executor
+    cache.close()
+    assert cache._executor is None
+    assert executor._shutdown
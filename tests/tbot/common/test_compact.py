@@ -0,0 +1,51 @@
+from typing import List, Optional
+
+from pydantic import Field
+from tbot.common.compact import compact_model, get_compact_adapter
+from tbot.common.easymodel import EasyModel
+
+
+class Inner(EasyModel):
+    symbol: str = Field(default=..., alias="sym")
+
+
+class Outer(EasyModel):
+    name: str = Field(default=..., alias="name")
+    price: Optional[float] = Field(default=None, alias="priceUsd")
+    inner: Optional[Inner] = Field(default=None, alias="inner")
+    items: List[Inner] = Field(default_factory=list, alias="items")
+
+
+def test_compact_model_is_slotted_and_cached():
+    compact = compact_model(Outer)
+    assert compact is compact_model(Outer)
+    assert compact.__name__ == "CompactOuter"
+    record = compact.from_dict({"name": "a", "priceUsd": 1.5, "inner": {"sym": "X"}, "items": [{"sym": "Y"}]})
+    assert not hasattr(record, "__dict__")
+    assert record.name == "a" and record.price == 1.5
+    assert record.inner.symbol == "X"
+    assert record.items[0].symbol == "Y"
+
+
+def test_compact_model_fills_defaults_and_accepts_names():
+    compact = compact_model(Outer)
+    assert compact.from_dict({"name": "a"}).items == []
+    assert compact.from_dict({"name": "a"}).price is None
+    assert compact.from_dict({"name": "a", "price": 2.0}).price == 2.0
+
+
+def test_compact_model_does_not_coerce():
+    assert compact_model(Outer).from_dict({"name": "a", "priceUsd": "1.5"}).price == "1.5"
+
+
+def test_compact_model_round_trips():
+    model = Outer(name="a", priceUsd=1.5, inner={"sym": "X"}, items=[{"sym": "Y"}])
+    record = compact_model(Outer).from_model(model)
+    assert record.to_model() == model
+    assert record == compact_model(Outer).from_dict(record.to_dict())
+
+
+def test_compact_adapter_builds_lists():
+    records = get_compact_adapter(List[Outer]).validate_python([{"name": "a"}, {"name": "b"}])
+    assert [record.name for record in records] == ["a", "b"]
+    assert get_compact_adapter(List[Outer]) is get_compact_adapter(List[Outer])
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from tbot.common.hedge import LatencyTracker, hedged
+from tbot.common.ratelimit import LimiterChain, RateLimiter
+
+
+def test_percentile():
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile(95) is None
+    for latency in range(1, 21):
+        tracker.observe(latency / 100)
+    assert len(tracker) == 10
+    assert tracker.percentile(50) == pytest.approx(0.15)
+    assert tracker.percentile(95) == pytest.approx(0.20)
+
+
+class Sender:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.cancelled = 0
+
+    async def send(self):
+        delay, result = self.outcomes.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.mark.asyncio
+async def test_slow_request_is_hedged_and_loser_cancelled():
+    sender = Sender((1.0, "slow"), (0.01, "fast"))
+    assert await hedged(sender.send, 0.02, lambda: True) == "fast"
+    assert sender.cancelled == 1
+
+
+@pytest.mark.asyncio
+async def test_refused_hedge_waits_for_the_first_request():
+    sender = Sender((0.05, "slow"), (0.01, "fast"))
+    assert await hedged(sender.send, 0.01, lambda: False) == "slow"
+    assert sender.outcomes == [(0.01, "fast")]
+
+
+@pytest.mark.asyncio
+async def test_failed_request_lets_the_other_answer():
+    sender = Sender((0.03, ValueError("boom")), (0.05, "hedge"))
+    assert await hedged(sender.send, 0.01, lambda: True) == "hedge"
+    sender = Sender((0.03, ValueError("first")), (0.01, ValueError("second")))
+    with pytest.raises(ValueError):
+        await hedged(sender.send, 0.01, lambda: True)
+
+
+def test_chain_try_acquire_is_all_or_nothing():
+    endpoint = RateLimiter(max_calls=10, period=1)
+    host = RateLimiter(max_calls=1, period=10)
+    chain = LimiterChain(limiters=[endpoint, host])
+    assert chain.try_acquire()
+    before = endpoint.available
+    assert not chain.try_acquire()
+    assert endpoint.available == before
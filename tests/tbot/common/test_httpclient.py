@@ -1,6 +1,9 @@
+import asyncio
+import json
 import requests
 import pytest
 from tbot.common.httpclient import HttpClient, HttpRequestMethod
+from tbot.common.ratelimit import LimiterRegistry
 
 
 @pytest.fixture
@@ -9,17 +12,273 @@ def http_client():
 
 
 def test_api_request(http_client, mocker):
-    mock_response = mocker.patch('requests.request')
+    mock_response = mocker.patch('requests.Session.request')
     mock_response.return_value.status_code = 200
-    mock_response.return_value.json.return_value = {"key": "value"}
+    mock_response.return_value.content = b'{"key": "value"}'
 
     response = http_client.api_request("test", HttpRequestMethod.GET)
     assert response == {"key": "value"}
 
 
 def test_api_request_error(http_client, mocker):
-    mock_response = mocker.patch('requests.request')
+    mock_response = mocker.patch('requests.Session.request')
     mock_response.return_value.status_code = 404
 
     with pytest.raises(requests.HTTPError):
         http_client.api_request("test", HttpRequestMethod.GET)
+
+
+@pytest.mark.asyncio
+async def test_session_is_pooled_and_closed():
+    async with HttpClient(config={"connector_limit_per_host": 4}) as client:
+        session = await client.get_session_async()
+        assert await client.get_session_async() is session
+        assert session.connector.limit_per_host == 4
+    assert session.closed
+
+
+def test_sync_session_is_per_thread_with_shared_adapter(http_client):
+    session = http_client.get_session()
+    assert http_client.get_session() is session
+    other = http_client.batch_map(lambda _: http_client.get_session(), [0])[0]
+    assert other is not session
+    assert other.get_adapter("https://x") is session.get_adapter("https://x")
+    http_client.close()
+
+
+def test_batch_map_preserves_order_and_exceptions(http_client):
+    def work(value):
+        if value == 2:
+            raise ValueError("bad")
+        return value * 10
+
+    assert http_client.batch_map(work, [0, 1]) == [0, 10]
+    results = http_client.batch_map(work, [1, 2, 3], return_exceptions=True)
+    assert results[0] == 10 and isinstance(results[1], ValueError) and results[2] == 30
+    with pytest.raises(ValueError):
+        http_client.batch_map(work, [2])
+    http_client.close()
+
+
+class FakeResponse:
+    def __init__(self, payload, status=200, headers=None, delay=0.0):
+        self.payload = payload
+        self.status = status
+        self.reason = "OK" if status == 200 else "Error"
+        self.headers = headers or {}
+        self.delay = delay
+        self.request_info = None
+        self.history = ()
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.delay)
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def json(self):
+        return dict(self.payload)
+
+    async def read(self):
+        return json.dumps(self.payload).encode()
+
+
+class FakeSession:
+    def __init__(self, payload=None, delay=0.0, etag=None):
+        self.payload = payload if payload is not None else {"key": "value"}
+        self.delay = delay
+        self.etag = etag
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        if self.etag is not None and (kwargs.get("headers") or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(None, status=304, delay=self.delay)
+        headers = {"ETag": self.etag} if self.etag is not None else {}
+        return FakeResponse(self.payload, headers=headers, delay=self.delay)
+
+
+@pytest.fixture
+def fake_session(mocker):
+    session = FakeSession(delay=0.01)
+    mocker.patch.object(HttpClient, "get_session_async", return_value=session)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_identical_async_requests_are_coalesced(http_client, fake_session):
+    results = await asyncio.gather(
+        http_client.api_request_async("price", HttpRequestMethod.GET, params={"address": "a"}),
+        http_client.api_request_async("price", HttpRequestMethod.GET, params={"address": "a"}),
+        http_client.api_request_async("price", HttpRequestMethod.GET, params={"address": "b"}),
+    )
+    assert results == [{"key": "value"}] * 3
+    assert len(fake_session.calls) == 2
+    assert http_client.coalesced_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_routes_skip_the_network(fake_session):
+    client = HttpClient(config={"cache_enabled": True, "cache_policies": [{"route": "networks", "ttl": 60}]})
+    first = await client.api_request_async("networks", HttpRequestMethod.GET)
+    second = await client.api_request_async("networks", HttpRequestMethod.GET)
+    await client.api_request_async("price", HttpRequestMethod.GET)
+    await client.api_request_async("price", HttpRequestMethod.GET)
+    assert first is second
+    assert len(fake_session.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_serves_stale_and_refreshes(fake_session):
+    client = HttpClient(config={
+        "cache_enabled": True,
+        "cache_policies": [{"route": "price", "ttl": 0.02}],
+        "stale_while_revalidate": True,
+        "ratelimit_max_calls": 1000,
+        "ratelimit_period": 1,
+    }, limiter_registry=LimiterRegistry())
+    first = await client.api_request_async("price", HttpRequestMethod.GET)
+    await asyncio.sleep(0.03)
+    stale = await client.api_request_async("price", HttpRequestMethod.GET)
+    assert stale is first
+    assert len(fake_session.calls) == 1
+    await asyncio.sleep(0.05)
+    assert len(fake_session.calls) == 2
+    assert await client.api_request_async("price", HttpRequestMethod.GET) is not first
+
+
+@pytest.mark.asyncio
+async def test_not_modified_returns_previously_parsed_result(mocker):
+    session = FakeSession(etag='"v1"')
+    mocker.patch.object(HttpClient, "get_session_async", return_value=session)
+    client = HttpClient(config={"ratelimit_max_calls": 1000, "ratelimit_period": 1})
+    parsed = []
+
+    def parser(payload):
+        parsed.append(payload)
+        return ("parsed", payload["key"])
+
+    first = await client.api_request_async("pair/all", HttpRequestMethod.GET, parser=parser)
+    second = await client.api_request_async("pair/all", HttpRequestMethod.GET, parser=parser)
+    assert second is first
+    assert len(parsed) == 1
+    assert session.calls[1][2]["headers"] == {"If-None-Match": '"v1"'}
+    assert client.conditional_cache.not_modified == 1
+
+
+@pytest.mark.asyncio
+async def test_type_adapter_parser_validates_raw_bytes(fake_session):
+    from pydantic import TypeAdapter
+
+    client = HttpClient(config={"json_decoder": "json"})
+    result = await client.api_request_async("test", HttpRequestMethod.GET, parser=TypeAdapter(dict[str, str]))
+    assert result == {"key": "value"}
+
+
+def test_client_errors_are_not_retried_but_server_errors_are(http_client, mocker):
+    mocker.patch("tbot.common.retry.time.sleep")
+    request = mocker.patch('requests.Session.request')
+    request.return_value.status_code = 404
+    with pytest.raises(requests.HTTPError):
+        http_client.api_request("missing", HttpRequestMethod.GET)
+    assert request.call_count == 1
+    request.return_value.status_code = 503
+    with pytest.raises(requests.HTTPError):
+        http_client.api_request("down", HttpRequestMethod.GET)
+    assert request.call_count == 4
+
+
+def test_zero_deadline_never_reaches_the_transport(http_client, mocker):
+    from tbot.common.deadline import DeadlineExceeded
+
+    request = mocker.patch('requests.Session.request')
+    with pytest.raises(DeadlineExceeded):
+        http_client.api_request("price", HttpRequestMethod.GET, deadline=0)
+    request.assert_not_called()
+
+
+def test_deadline_overruns_are_not_retryable(http_client):
+    from tbot.common.deadline import DeadlineExceeded
+
+    assert not http_client.is_retryable(DeadlineExceeded("late"))
+    assert http_client.is_retryable(asyncio.TimeoutError())
+
+
+@pytest.mark.asyncio
+async def test_slow_gets_are_hedged_within_the_rate_limit(mocker):
+    session = FakeSession()
+    delays = [0.5, 0.01]
+    original = session.request
+    mocker.patch.object(HttpClient, "get_session_async", return_value=session)
+
+    def request(method, url, **kwargs):
+        response = original(method, url, **kwargs)
+        response.delay = delays.pop(0) if delays else 0.0
+        return response
+
+    session.request = request
+    client = HttpClient(
+        config={"hedge_requests": True, "hedge_min_samples": 1, "hedge_percentile": 50, "ratelimit_burst": 5},
+        limiter_registry=LimiterRegistry(),
+    )
+    client.latency("price").observe(0.02)
+    assert await client.api_request_async("price", HttpRequestMethod.GET) == {"key": "value"}
+    assert len(session.calls) == 2
+    assert client.hedged_requests == 1
+    client.hedge_budget.tokens = 0
+    delays[:] = [0.05]
+    await client.api_request_async("price", HttpRequestMethod.GET, params={"page": 2})
+    assert len(session.calls) == 3
+    assert client.hedged_requests == 1
+
+
+@pytest.mark.asyncio
+async def test_results_are_only_shared_between_callers_with_the_same_parser(fake_session):
+    client = HttpClient(config={"cache_enabled": True, "cache_policies": [{"route": "networks", "ttl": 60}]})
+    tagged = await client.api_request_async("networks", HttpRequestMethod.GET, parser=lambda payload: ("A", payload))
+    plain = await client.api_request_async("networks", HttpRequestMethod.GET)
+    again = await client.api_request_async("networks", HttpRequestMethod.GET)
+    assert tagged == ("A", {"key": "value"})
+    assert plain == {"key": "value"}
+    assert again is plain
+    assert len(fake_session.calls) == 2
+    results = await asyncio.gather(
+        client.api_request_async("price", HttpRequestMethod.GET, parser=lambda payload: ("B", payload)),
+        client.api_request_async("price", HttpRequestMethod.GET),
+    )
+    assert results == [("B", {"key": "value"}), {"key": "value"}]
+
+
+@pytest.mark.asyncio
+async def test_hedges_refused_by_the_limiter_keep_their_budget(mocker):
+    session = FakeSession(delay=0.05)
+    mocker.patch.object(HttpClient, "get_session_async", return_value=session)
+    client = HttpClient(
+        config={"hedge_requests": True, "hedge_min_samples": 1, "hedge_percentile": 50},
+        limiter_registry=LimiterRegistry(),
+    )
+    client.latency("price").observe(0.01)
+    tokens = client.hedge_budget.tokens
+    await client.api_request_async("price", HttpRequestMethod.GET)
+    assert len(session.calls) == 1
+    assert client.hedged_requests == 0
+    assert client.hedge_budget.tokens == pytest.approx(tokens + client.config.hedge_budget_ratio)
+
+
+def test_close_shuts_down_the_cache_refresh_pool():
+    http_client = HttpClient(config={"cache_enabled": True})
+    http_client.response_cache.submit(lambda: None)
+    executor = http_client.response_cache._executor
+    http_client.close()
+    assert executor._shutdown
+
+
+@pytest.mark.asyncio
+async def test_response_cache_is_opt_in(fake_session):
+    client = HttpClient(config={"cache_policies": [{"route": "networks", "ttl": 60}]})
+    first = await client.api_request_async("networks", HttpRequestMethod.GET)
+    second = await client.api_request_async("networks", HttpRequestMethod.GET)
+    assert client.response_cache is None
+    assert first is not second
+    assert len(fake_session.calls) == 2
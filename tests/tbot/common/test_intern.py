@@ -0,0 +1,45 @@
+from typing import List
+
+from tbot.common import intern
+from tbot.common.compact import get_compact_adapter
+from tbot.common.easymodel import get_type_adapter
+from tbot.common.intern import InternPool
+from tbot.meteora.models import Swap
+
+
+def test_intern_pool_shares_equal_strings():
+    pool = InternPool(maxsize=4)
+    first = "".join(["So1", "111"])
+    second = "".join(["So11", "11"])
+    assert first is not second
+    assert pool(first) is first
+    assert pool(second) is first
+    assert len(pool) == 1
+
+
+def test_intern_pool_is_bounded():
+    pool = InternPool(maxsize=2)
+    for value in ["a", "b", "c"]:
+        pool(value)
+    assert len(pool) == 1
+    disabled = InternPool(maxsize=0)
+    disabled("a")
+    assert len(disabled) == 0
+
+
+def _swap(i):
+    return {
+        "tx_id": f"tx{i}", "in_amount": 1, "in_amount_usd": 1.0, "out_amount": 1, "out_amount_usd": 1.0,
+        "trade_fee": 1, "trade_fee_usd": 1.0, "protocol_fee": 1, "protocol_fee_usd": 1.0,
+        "onchain_timestamp": i, "pair_address": "".join(["pa", "ir"]), "start_bin_id": 1, "end_bin_id": 1,
+        "bin_count": 1, "fee_bps": 1.0, "in_token": "".join(["so", "l"]), "out_token": "".join(["us", "dc"]),
+    }
+
+
+def test_models_intern_identifiers():
+    payload = [_swap(0), _swap(1)]
+    for adapter in (get_type_adapter(List[Swap]), get_compact_adapter(List[Swap])):
+        intern.default_pool.clear()
+        first, second = adapter.validate_python(payload)
+        assert first.pair_address is second.pair_address
+        assert first.in_token is second.in_token
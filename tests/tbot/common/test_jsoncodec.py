@@ -0,0 +1,19 @@
+import pytest
+from pydantic import TypeAdapter
+from tbot.common.jsoncodec import get_decoder, parse_body
+
+
+def test_get_decoder_falls_back_to_stdlib():
+    assert get_decoder("json")(b'{"a": 1}') == {"a": 1}
+    assert get_decoder("auto")(b'[1, 2]') == [1, 2]
+    with pytest.raises(ValueError):
+        get_decoder("simdjson")
+
+
+def test_parse_body_dispatches_on_parser_kind():
+    decoder = get_decoder("json")
+    adapter = TypeAdapter(list[int])
+    assert parse_body(b'[1, "2"]', decoder) == [1, "2"]
+    assert parse_body(b'[1, "2"]', decoder, adapter) == [1, 2]
+    assert parse_body(b'[1, "2"]', decoder, adapter, validate_json_bytes=False) == [1, 2]
+    assert parse_body(b'[1, 2]', decoder, sum) == 3
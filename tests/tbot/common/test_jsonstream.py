@@ -0,0 +1,22 @@
+import json
+import pytest
+from tbot.common.jsonstream import JsonArrayStream
+
+
+def test_elements_split_across_chunks():
+    items = [{"name": 'SOL-USDC "q" \\ ✓', "amount": 12345}, [1, 2], 3.5, None, "tail"]
+    body = json.dumps(items, ensure_ascii=False).encode()
+    for size in (1, 3, 7, len(body)):
+        stream = JsonArrayStream()
+        parsed = []
+        for start in range(0, len(body), size):
+            parsed.extend(stream.feed(body[start:start + size]))
+        stream.close()
+        assert parsed == items
+
+
+def test_truncated_stream_is_rejected():
+    stream = JsonArrayStream()
+    assert stream.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+    with pytest.raises(ValueError):
+        stream.close()
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from tbot.common.microbatch import MicroBatcher
+
+
+class Loader:
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    async def load(self, group, keys):
+        self.calls.append((group, keys))
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return {key: f"{group}:{key}" for key in keys if key != "missing"}
+
+
+@pytest.mark.asyncio
+async def test_lookups_in_a_window_share_one_call_per_group():
+    loader = Loader()
+    batcher = MicroBatcher(load=loader.load, window=0.01)
+    results = await asyncio.gather(
+        batcher.load_one("sol", "a"),
+        batcher.load_one("sol", "b"),
+        batcher.load_one("sol", "a"),
+        batcher.load_one("eth", "a"),
+        batcher.load_one("sol", "missing"),
+    )
+    assert results == ["sol:a", "sol:b", "sol:a", "eth:a", None]
+    assert sorted(loader.calls) == [("eth", ["a"]), ("sol", ["a", "b", "missing"])]
+    assert batcher.batches == 2
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_before_the_window_ends():
+    loader = Loader()
+    batcher = MicroBatcher(load=loader.load, window=10, max_size=2)
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.load_one("sol", "a"), batcher.load_one("sol", "b")), timeout=1)
+    assert results == ["sol:a", "sol:b"]
+
+
+@pytest.mark.asyncio
+async def test_failed_load_fails_every_lookup_of_its_batch():
+    batcher = MicroBatcher(load=Loader(error=ValueError("down")).load, window=0.001)
+    results = await asyncio.gather(
+        batcher.load_one("sol", "a"), batcher.load_one("sol", "b"), return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_cancels_its_lookups():
+    started = asyncio.Event()
+
+    async def load(group, keys):
+        started.set()
+        await asyncio.sleep(10)
+
+    batcher = MicroBatcher(load=load, window=0.001)
+    lookups = [asyncio.ensure_future(batcher.load_one("sol", key)) for key in ("a", "b")]
+    await asyncio.wait_for(started.wait(), timeout=1)
+    for task in list(batcher._running):
+        task.cancel()
+    results = await asyncio.wait_for(asyncio.gather(*lookups, return_exceptions=True), timeout=1)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancel_releases_waiting_and_in_flight_lookups():
+    loader = Loader()
+    batcher = MicroBatcher(load=loader.load, window=10)
+    lookup = asyncio.ensure_future(batcher.load_one("sol", "a"))
+    await asyncio.sleep(0)
+    batcher.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(lookup, timeout=1)
+    assert loader.calls == []
@@ -1,5 +1,19 @@
+import asyncio
+import multiprocessing
+import struct
+import time
+
 import pytest
-from tbot.common.ratelimit import RateLimiter
+from tbot.common.httpclient import HttpClient, HttpRequestMethod
+from tbot.common.deadline import DeadlineExceeded, deadline
+from tbot.common.ratelimit import (
+    LimiterChain,
+    LimiterRegistry,
+    RateLimiter,
+    RateLimitPolicy,
+    SharedRateLimiter,
+    make_limiter,
+)
 
 
 @pytest.fixture
@@ -26,3 +40,164 @@ async def test_rate_limiter_async(rate_limiter):
 
     async with rate_limiter:
         assert True
+
+
+def test_rate_limiter_does_not_wait_under_budget():
+    limiter = RateLimiter(max_calls=10, period=10, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter:
+            pass
+    assert time.monotonic() - start < 0.05
+    assert limiter.available == 0
+    assert not limiter.try_acquire()
+
+
+def test_rate_limiter_spaces_calls_after_burst():
+    limiter = RateLimiter(max_calls=20, period=1, burst=2)
+    delays = [limiter.reserve()[0] for _ in range(4)]
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.05, abs=0.01)
+    assert delays[3] == pytest.approx(0.10, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_serves_waiters_in_order_without_serializing():
+    limiter = RateLimiter(max_calls=20, period=1)
+    order = []
+
+    async def call(i):
+        async with limiter:
+            order.append(i)
+
+    start = time.monotonic()
+    await asyncio.gather(*(call(i) for i in range(5)))
+    elapsed = time.monotonic() - start
+    assert order == [0, 1, 2, 3, 4]
+    assert 0.18 <= elapsed < 0.4
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_releases_cancelled_reservations():
+    limiter = RateLimiter(max_calls=10, period=1)
+    async with limiter:
+        pass
+    task = asyncio.ensure_future(limiter.__aenter__())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    delay, _reservation = limiter.reserve()
+    assert delay == pytest.approx(0.09, abs=0.02)
+
+
+def test_registry_shares_host_budget_across_clients():
+    registry = LimiterRegistry()
+    birdeye = HttpClient(config={"base_url": "https://public-api.birdeye.so/defi"}, limiter_registry=registry)
+    other = HttpClient(config={"base_url": "https://public-api.birdeye.so/defi"}, limiter_registry=registry)
+    meteora = HttpClient(config={"base_url": "https://dlmm-api.meteora.ag"}, limiter_registry=registry)
+    first = birdeye.limiter_for("price", HttpRequestMethod.GET)
+    assert other.limiter_for("networks", HttpRequestMethod.GET).limiters == first.limiters
+    assert registry.get("public-api.birdeye.so") is first.limiters[-1]
+    assert meteora.limiter_for("pair/all", HttpRequestMethod.GET).limiters[-1] is not first.limiters[-1]
+
+
+def test_registry_nests_endpoint_budget_in_host_total():
+    registry = LimiterRegistry()
+    client = HttpClient(config={"base_url": "https://public-api.birdeye.so/defi"}, limiter_registry=registry)
+    client.add_rate_limits([RateLimitPolicy(route="multi_price", max_calls=1, period=1)])
+    chain = client.limiter_for("multi_price", HttpRequestMethod.GET)
+    assert [limiter.max_calls for limiter in chain.limiters] == [1, 300]
+    assert client.limiter_for("price", HttpRequestMethod.GET).limiters == (registry.get("public-api.birdeye.so"),)
+    with chain:
+        pass
+    assert chain.available == 0
+    assert client.limiter_for("price", HttpRequestMethod.GET).available == 0
+
+
+def test_private_limiter_when_sharing_is_disabled():
+    client = HttpClient(config={"ratelimit_shared": False, "ratelimit_max_calls": 5})
+    assert client.limiter_for("test", HttpRequestMethod.GET) is client.rate_limiter
+    assert client.rate_limiter.max_calls == 5
+
+
+def test_shared_limiters_draw_from_one_budget(tmp_path):
+    path = str(tmp_path / "birdeye.gcra")
+    first = SharedRateLimiter(max_calls=10, period=1, path=path)
+    second = SharedRateLimiter(max_calls=10, period=1, path=path)
+    delays = [limiter.reserve()[0] for limiter in (first, second, first, second)]
+    assert delays[0] == 0.0
+    assert delays[1:] == pytest.approx([0.1, 0.2, 0.3], abs=0.02)
+    assert not second.try_acquire()
+    first.close()
+    second.close()
+
+
+def test_shared_limiter_ignores_state_from_an_earlier_boot(tmp_path):
+    future = time.monotonic() + 30 * 24 * 3600
+    stale = tmp_path / "stale.gcra"
+    stale.write_bytes(struct.pack("d16s", future, b"another boot id!"))
+    legacy = tmp_path / "legacy.gcra"
+    legacy.write_bytes(struct.pack("d", future))
+    for path in (stale, legacy):
+        limiter = SharedRateLimiter(max_calls=10, period=1, path=str(path))
+        assert limiter.reserve()[0] == 0.0
+        assert limiter.reserve()[0] == pytest.approx(0.1, abs=0.02)
+        limiter.close()
+
+
+def _reserve_many(path, count, queue):
+    limiter = SharedRateLimiter(max_calls=1000, period=1, path=path)
+    queue.put([limiter.reserve()[1] for _ in range(count)])
+    limiter.close()
+
+
+def test_shared_limiter_spaces_reservations_across_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    path = str(tmp_path / "workers.gcra")
+    workers = [context.Process(target=_reserve_many, args=(path, 50, queue)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    reservations = sorted(sum((queue.get(timeout=10) for _ in workers), []))
+    for worker in workers:
+        worker.join()
+    gaps = [later - earlier for earlier, later in zip(reservations, reservations[1:])]
+    assert len(reservations) == 150
+    assert min(gaps) >= 0.001 - 1e-9
+
+
+def test_registry_builds_shared_limiters_from_config(tmp_path):
+    client = HttpClient(config={
+        "base_url": "https://public-api.birdeye.so/defi",
+        "ratelimit_backend": "shared",
+        "ratelimit_directory": str(tmp_path),
+    }, limiter_registry=LimiterRegistry())
+    (limiter,) = client.limiter_for("price", HttpRequestMethod.GET).limiters
+    assert isinstance(limiter, SharedRateLimiter)
+    assert limiter.path == str(tmp_path / "public-api.birdeye.so.gcra")
+    with pytest.raises(ValueError):
+        LimiterRegistry().limiter("host", 1, 1, backend="redis")
+
+
+def test_shared_backend_falls_back_to_memory_without_fcntl(tmp_path, mocker):
+    mocker.patch("tbot.common.ratelimit.fcntl", None)
+    limiter = make_limiter("host", 10, 1, backend="shared", directory=str(tmp_path))
+    assert type(limiter) is RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_chain_gives_back_slots_when_a_later_limiter_times_out():
+    endpoint = RateLimiter(max_calls=1, period=10)
+    host = RateLimiter(max_calls=1, period=10)
+    host.acquire()
+    chain = LimiterChain(limiters=[endpoint, host])
+    with deadline(0.05):
+        with pytest.raises(DeadlineExceeded):
+            with chain:
+                pass
+        with pytest.raises(DeadlineExceeded):
+            async with chain:
+                pass
+    assert endpoint.available == 1
+    assert endpoint.reserve()[0] == 0.0
@@ -1,5 +1,11 @@
+import asyncio
+import time
+from typing import Type
+
 import pytest
-from tbot.common.retry import retry_on_error, retry_on_error_async
+from tbot.common.deadline import DeadlineExceeded, deadline, remaining, within_deadline_async
+from tbot.common.ratelimit import RateLimiter
+from tbot.common.retry import RetryBudget, retry_on_error, retry_on_error_async
 
 
 class TestRetry:
@@ -34,3 +40,125 @@ async def test_retry_async():
     result = await obj.test_func_async()
     assert result == "Success"
     assert obj.attempts == 3
+
+
+class Flaky:
+    def __init__(self, error, failures=10, **attributes):
+        self.error = error
+        self.failures = failures
+        self.attempts = 0
+        self.__dict__.update(attributes)
+
+    @retry_on_error(ValueError, max_retries=5, delay=0.01)
+    def call(self):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise self.error
+        return "Success"
+
+    @retry_on_error_async(ValueError, max_retries=5, delay=0.01)
+    async def call_async(self):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise self.error
+        return "Success"
+
+
+def test_only_registered_exceptions_are_retried():
+    obj = Flaky(KeyError("not retried"))
+    with pytest.raises(KeyError):
+        obj.call()
+    assert obj.attempts == 1
+
+
+def test_rejected_errors_are_not_retried():
+    obj = Flaky(ValueError("final"), is_retryable=lambda error: str(error) != "final")
+    with pytest.raises(ValueError):
+        obj.call()
+    assert obj.attempts == 1
+
+
+def test_exception_types_must_be_classes():
+    with pytest.raises(TypeError):
+        retry_on_error(Type[ValueError])
+
+
+def test_backoff_uses_full_jitter(mocker):
+    sleep = mocker.patch("tbot.common.retry.time.sleep")
+    uniform = mocker.patch("tbot.common.retry.random.uniform", side_effect=lambda low, high: high / 2)
+    Flaky(ValueError(), failures=3, max_delay=0.015).call()
+    assert [call.args for call in uniform.call_args_list] == [(0, 0.01), (0, 0.015), (0, 0.015)]
+    assert [call.args[0] for call in sleep.call_args_list] == [0.005, 0.0075, 0.0075]
+
+
+def test_retry_budget_caps_retries():
+    budget = RetryBudget(ratio=0.5, min_tokens=2)
+    obj = Flaky(ValueError(), retry_budget=budget)
+    with pytest.raises(ValueError):
+        obj.call()
+    assert obj.attempts == 3
+    assert budget.tokens == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_retries_stop_at_the_deadline():
+    obj = Flaky(ValueError(), delay=1.0)
+    start = time.monotonic()
+    with deadline(0.05):
+        with pytest.raises(ValueError):
+            await obj.call_async()
+    assert time.monotonic() - start < 0.1
+
+
+@pytest.mark.asyncio
+async def test_limiter_waits_count_against_the_deadline():
+    limiter = RateLimiter(max_calls=1, period=10)
+    async with limiter:
+        pass
+    with deadline(0.5):
+        with pytest.raises(DeadlineExceeded):
+            async with limiter:
+                pass
+    assert limiter.reserve()[0] == pytest.approx(10, abs=0.1)
+
+
+class SlowUpstream:
+    def __init__(self, error, **attributes):
+        self.error = error
+        self.attempts = 0
+        self.__dict__.update(attributes)
+
+    @retry_on_error_async(asyncio.TimeoutError, max_retries=5, delay=0.01)
+    async def call_async(self):
+        self.attempts += 1
+        raise self.error
+
+
+@pytest.mark.asyncio
+async def test_deadline_overruns_are_not_retried():
+    budget = RetryBudget(min_tokens=5)
+    obj = SlowUpstream(DeadlineExceeded("late"), retry_budget=budget)
+    with pytest.raises(DeadlineExceeded):
+        await obj.call_async()
+    assert obj.attempts == 1
+    assert budget.tokens == pytest.approx(5.1)
+    obj = SlowUpstream(asyncio.TimeoutError(), retry_budget=budget)
+    with pytest.raises(asyncio.TimeoutError):
+        await obj.call_async()
+    assert obj.attempts == 5
+
+
+@pytest.mark.asyncio
+async def test_zero_deadline_fails_at_once_despite_a_default():
+    obj = Flaky(ValueError(), failures=0, request_deadline=60)
+    observed = []
+
+    @within_deadline_async()
+    async def call(self):
+        observed.append(remaining())
+
+    with pytest.raises(DeadlineExceeded):
+        await call(obj, deadline=0)
+    await call(obj)
+    assert len(observed) == 1
+    assert observed[0] == pytest.approx(60, abs=1)
@@ -0,0 +1,18 @@
+import pytest
+from tbot.common.httpclient import HttpClient
+
+
+@pytest.fixture
+def fake_api(request, mocker):
+    """
+    Route every `HttpClient.api_request` and `api_request_async` call to a fake API.
+
+    The fake class is given by indirect parametrization, for example
+    `@pytest.mark.parametrize("fake_api", [FakeBirdeye], indirect=True)`, and its instance
+    is returned for inspecting the calls it received.
+    """
+    api = request.param()
+    mocker.patch.object(HttpClient, "api_request", lambda self, *args, **kwargs: api.api_request(*args, **kwargs))
+    mocker.patch.object(
+        HttpClient, "api_request_async", lambda self, *args, **kwargs: api.api_request_async(*args, **kwargs))
+    return api
@@ -0,0 +1,79 @@
+import pytest
+from tbot.common.batch import chunked
+from tbot.dexscreener.client import DexscreenerClient
+from tbot.dexscreener.models import DefiNetwork, TokenPair, TokenPairsResponse
+
+
+def _pair(address, base, quote="sol"):
+    txns = {"buys": 1, "sells": 1}
+    periods = {"m5": 1.0, "h1": 1.0, "h6": 1.0, "h24": 1.0}
+    return TokenPair(**{
+        "chainId": "solana", "dexId": "raydium", "url": "u", "pairAddress": address,
+        "baseToken": {"address": base, "name": "T", "symbol": "T"},
+        "quoteToken": {"address": quote, "name": "SOL", "symbol": "SOL"},
+        "priceNative": 1.0, "priceUsd": 2.0,
+        "txns": {"m5": txns, "h1": txns, "h6": txns, "h24": txns},
+        "volume": periods, "priceChange": periods, "fdv": 1e6, "pairCreatedAt": 1_700_000_000_000,
+    })
+
+
+class FakeDexscreener:
+    """
+    Answers pair lookups with one pair per address, and token lookups with one pair per token.
+
+    Returned addresses go through `spell`, to mimic the API normalizing them.
+    """
+
+    def __init__(self, spell=str):
+        self.endpoints = []
+        self.spell = spell
+
+    def api_request(self, endpoint, method, parser=None):
+        self.endpoints.append(endpoint)
+        addresses = [self.spell(address) for address in endpoint.rsplit("/", 1)[1].split(",")]
+        if endpoint.startswith("dex/pairs/"):
+            pairs = [_pair(address, f"mint-{address}") for address in addresses if address != "missing"]
+        else:
+            pairs = [_pair(f"pair-{address}", address) for address in addresses]
+        return TokenPairsResponse(pairs=pairs or None)
+
+    async def api_request_async(self, endpoint, method, parser=None):
+        return self.api_request(endpoint, method, parser)
+
+
+def test_chunked_drops_duplicates_and_keeps_order():
+    assert chunked(["a", "b", "a", "c", "d"], 2) == [["a", "b"], ["c", "d"]]
+    with pytest.raises(ValueError):
+        chunked(["a"], 0)
+
+
+@pytest.mark.parametrize("fake_api", [FakeDexscreener], indirect=True)
+@pytest.mark.asyncio
+async def test_get_pairs_many_async_chunks_and_merges(fake_api):
+    addresses = [f"p{i}" for i in range(64)] + ["missing"]
+    result = await DexscreenerClient().get_pairs_many_async(addresses, DefiNetwork.SOLANA)
+    assert len(fake_api.endpoints) == 3
+    assert all(endpoint.startswith("dex/pairs/solana/") for endpoint in fake_api.endpoints)
+    assert list(result) == addresses
+    assert result["p42"].pair_address == "p42"
+    assert result["missing"] is None
+
+
+@pytest.mark.parametrize("fake_api", [FakeDexscreener], indirect=True)
+def test_get_tokens_many_keys_pairs_by_token(fake_api):
+    client = DexscreenerClient(config={"max_addresses": 2})
+    result = client.get_tokens_many(["m1", "m2", "sol", "none"])
+    assert fake_api.endpoints == ["dex/tokens/m1,m2", "dex/tokens/sol,none"]
+    assert [pair.pair_address for pair in result["m1"]] == ["pair-m1"]
+    assert {pair.pair_address for pair in result["sol"]} == {"pair-m1", "pair-m2", "pair-sol", "pair-none"}
+    assert [pair.pair_address for pair in result["none"]] == ["pair-none"]
+
+
+@pytest.mark.parametrize("fake_api", [FakeDexscreener], indirect=True)
+def test_only_hex_addresses_match_regardless_of_case(fake_api):
+    fake_api.spell = lambda address: address.lower() if address.startswith("0x") else address.swapcase()
+    evm = "0xAbCdEf0123456789aBcDeF0123456789AbCdEf01"
+    solana = "So11111111111111111111111111111111111111112"
+    result = DexscreenerClient().get_pairs_many([evm, solana], DefiNetwork.SOLANA)
+    assert result[evm].pair_address == evm.lower()
+    assert result[solana] is None
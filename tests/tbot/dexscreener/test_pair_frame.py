@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from tbot.common.compact import compact_model
+from tbot.dexscreener.frame import PairFrame
+from tbot.dexscreener.models import TokenPair
+
+
+def _pair(i, liquidity=1000.0, fdv=1e6, buys=10, sells=5, change=1.0):
+    txns = {"buys": buys, "sells": sells}
+    return {
+        "chainId": "solana", "dexId": "raydium", "url": "u", "pairAddress": f"pair{i}",
+        "baseToken": {"address": f"mint{i}", "name": "T", "symbol": f"T{i}"},
+        "quoteToken": {"address": "sol", "name": "SOL", "symbol": "SOL"},
+        "priceNative": 1.0, "priceUsd": 2.0,
+        "txns": {"m5": txns, "h1": txns, "h6": txns, "h24": txns},
+        "volume": {"m5": 1.0, "h1": 2.0, "h6": 3.0, "h24": 4.0 * i},
+        "priceChange": {"m5": change, "h1": change, "h6": change, "h24": change},
+        "liquidity": {"usd": liquidity, "base": 1.0, "quote": 1.0} if liquidity is not None else None,
+        "fdv": fdv, "pairCreatedAt": 1_700_000_000_000,
+    }
+
+
+@pytest.fixture
+def frame():
+    return PairFrame.from_pairs([
+        TokenPair(**_pair(0, liquidity=None)),
+        TokenPair(**_pair(1, liquidity=50_000.0, sells=0)),
+        TokenPair(**_pair(2, liquidity=20_000.0, fdv=9e6)),
+        TokenPair(**_pair(3, liquidity=5_000.0)),
+    ])
+
+
+def test_frame_columns(frame):
+    assert len(frame) == 4
+    assert np.isnan(frame["liquidity_usd"][0])
+    assert frame["volume_h24"].tolist() == [0.0, 4.0, 8.0, 12.0]
+    assert frame["pair_created_at"][0] == 1_700_000_000
+    assert frame.buy_sell_ratio("h1")[2] == 2.0
+    assert np.isinf(frame.buy_sell_ratio("h1")[1])
+
+
+def test_frame_filter_and_rank(frame):
+    screened = frame.filter(frame.where(liquidity_usd=(10_000, None), fdv=(None, 5e6)))
+    assert screened["pair_address"].tolist() == ["pair1"]
+    assert frame.top_k("liquidity_usd", 2) == ["pair1", "pair2"]
+    assert frame.top_k("liquidity_usd", 10) == ["pair1", "pair2", "pair3", "pair0"]
+    assert frame.rank(frame["volume_h24"]).tolist() == [3, 2, 1, 0]
+
+
+def test_frame_updates_incrementally(frame):
+    frame.update([TokenPair(**_pair(3, liquidity=99_000.0)), TokenPair(**_pair(4, liquidity=1.0))])
+    assert len(frame) == 5
+    assert frame.top_k("liquidity_usd", 1) == ["pair3"]
+    assert "pair4" in frame
+    frame.remove(["pair0", "pair4"])
+    assert frame["pair_address"].tolist() == ["pair1", "pair2", "pair3"]
+    frame.update([TokenPair(**_pair(1, liquidity=1.0))])
+    assert frame["liquidity_usd"].tolist() == [1.0, 20_000.0, 99_000.0]
+
+
+def test_frame_from_compact_records():
+    record = compact_model(TokenPair).from_dict(_pair(1))
+    frame = PairFrame.from_pairs([record])
+    assert frame["pair_created_at"][0] == 1_700_000_000
+    assert frame["base_symbol"][0] == "T1"
+
+
+def test_empty_frame():
+    frame = PairFrame.from_pairs([])
+    assert len(frame) == 0
+    assert frame.top_k("fdv", 3) == []
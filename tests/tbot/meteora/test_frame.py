@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from tbot.meteora.frame import SwapFrame
+from tbot.meteora.models import Swap
+
+BASE = "mint"
+QUOTE = "sol"
+
+
+def _swap(i, buy, usd, base_amount, start_bin=1, end_bin=1, pair="pair"):
+    return {
+        "tx_id": f"tx{i}", "in_amount": 7 if buy else base_amount, "in_amount_usd": usd,
+        "out_amount": base_amount if buy else 7, "out_amount_usd": usd, "trade_fee": 1, "trade_fee_usd": 0.5,
+        "protocol_fee": 1, "protocol_fee_usd": 0.1, "onchain_timestamp": 100 + i * 10, "pair_address": pair,
+        "start_bin_id": start_bin, "end_bin_id": end_bin, "bin_count": abs(end_bin - start_bin) + 1,
+        "fee_bps": 25.0, "in_token": QUOTE if buy else BASE, "out_token": BASE if buy else QUOTE,
+    }
+
+
+@pytest.fixture
+def records():
+    return [
+        _swap(2, True, 30.0, 10, start_bin=3, end_bin=5),
+        _swap(0, True, 10.0, 10),
+        _swap(1, False, 20.0, 10, start_bin=2, end_bin=1),
+    ]
+
+
+def test_frame_is_built_in_time_order(records):
+    frame = SwapFrame.from_records(records)
+    assert len(frame) == 3
+    assert frame.onchain_timestamp.tolist() == [100, 110, 120]
+    assert frame.in_amount.dtype == np.uint64
+    assert SwapFrame.from_swaps([Swap(**record) for record in records]).tx_id.tolist() == ["tx0", "tx1", "tx2"]
+
+
+def test_frame_aggregations(records):
+    frame = SwapFrame.from_records(records)
+    assert frame.vwap(BASE) == pytest.approx(60.0 / 30)
+    assert frame.vwap(BASE, decimals=1) == pytest.approx(60.0 / 3)
+    assert frame.rolling_vwap(BASE, window=15).tolist() == pytest.approx([1.0, 1.5, 2.5])
+    assert frame.fees() == {"trade_fee_usd": 1.5, "protocol_fee_usd": pytest.approx(0.3)}
+    assert frame.imbalance(BASE) == pytest.approx((40.0 - 20.0) / 60.0)
+
+
+def test_frame_buckets_and_bins(records):
+    frame = SwapFrame.from_records(records)
+    starts, volume = frame.volume_by_bucket(20)
+    assert starts.tolist() == [100, 120]
+    assert volume.tolist() == [30.0, 30.0]
+    bins, flow = frame.bin_histogram()
+    assert bins.tolist() == [1, 2, 3, 4, 5]
+    assert flow.tolist() == pytest.approx([20.0, 10.0, 10.0, 10.0, 10.0])
+
+
+def test_frame_concat_and_for_pair(records):
+    other = SwapFrame.from_records([_swap(5, True, 1.0, 1, pair="other")])
+    frame = SwapFrame.concat([SwapFrame.from_records(records), other])
+    assert frame.pairs() == ["other", "pair"]
+    assert len(frame.for_pair("other")) == 1
+    assert len(SwapFrame.concat([])) == 0
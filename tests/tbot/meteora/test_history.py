@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from tbot.meteora.client import MeteoraClient
+from tbot.meteora.history import HistoryStore
+
+
+def _tvl_rows(num_of_days, today=None):
+    today = today or datetime.now(tz=timezone.utc).date()
+    return [
+        {"pair_address": "pair", "total_value_locked": float(offset), "day_date": (today - timedelta(days=offset)).isoformat()}
+        for offset in range(num_of_days)
+    ]
+
+
+def test_history_store_round_trip(tmp_path):
+    store = HistoryStore(path=str(tmp_path / "history.sqlite3"))
+    store.put_days("pair_tvl", "pair", {"2024-06-01": [{"a": 1}], "2024-06-02": []})
+    assert store.get_days("pair_tvl", "pair", ["2024-06-01", "2024-06-02", "2024-06-03"]) == {
+        "2024-06-01": [{"a": 1}], "2024-06-02": []}
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_closed_days_survive_restarts(tmp_path, mocker):
+    path = str(tmp_path / "history.sqlite3")
+    requested = []
+
+    async def fake_fetch(self, endpoint, params=None):
+        requested.append(params["num_of_days"])
+        return _tvl_rows(params["num_of_days"])
+
+    mocker.patch.object(MeteoraClient, "fetch", fake_fetch)
+    config = {"history_path": path, "history_settle": 0}
+    first = await MeteoraClient(config=config).get_pair_tvl_by_days("pair", num_of_days=5)
+    second = await MeteoraClient(config=config).get_pair_tvl_by_days("pair", num_of_days=5)
+    assert requested == [5, 1]
+    assert [row.total_value_locked for row in second] == [4.0, 3.0, 2.0, 1.0, 0.0]
+    assert second == first
+
+
+class _Clock(datetime):
+    frozen = datetime(2024, 6, 10, 1, 0, tzinfo=timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.frozen
+
+
+@pytest.mark.asyncio
+async def test_days_are_only_stored_once_settled_and_within_the_returned_window(tmp_path, mocker):
+    path = str(tmp_path / "history.sqlite3")
+    requested = []
+    available = [3]
+
+    async def fake_fetch(self, endpoint, params=None):
+        requested.append(params["num_of_days"])
+        return _tvl_rows(min(params["num_of_days"], available[0]), today=_Clock.frozen.date())
+
+    mocker.patch.object(MeteoraClient, "fetch", fake_fetch)
+    mocker.patch("tbot.meteora.client.datetime", _Clock)
+    async with MeteoraClient(config={"history_path": path}) as client:
+        await client.get_pair_tvl_by_days("pair", num_of_days=5)
+    store = HistoryStore(path=path)
+    assert set(store.get_days("pair_tvl", "pair", ["2024-06-06", "2024-06-07", "2024-06-08", "2024-06-09"])) == {
+        "2024-06-08"}
+    store.close()
+    available[0] = 5
+    async with MeteoraClient(config={"history_path": path}) as client:
+        rows = await client.get_pair_tvl_by_days("pair", num_of_days=5)
+        assert client.history._conn is not None
+    assert client.history._conn is None
+    assert requested == [5, 5]
+    assert [row.total_value_locked for row in rows] == [4.0, 3.0, 2.0, 1.0, 0.0]
@@ -0,0 +1,42 @@
+import json
+import pytest
+from tbot.common.httpclient import HttpClient
+from tbot.meteora.client import MeteoraClient
+from tbot.meteora.models import CompactPairInfo
+
+
+def _pair(i):
+    return {
+        "address": f"pair{i}", "name": "SOL-USDC", "mint_x": "x", "mint_y": "y",
+        "reserve_x": "rx", "reserve_x_amount": 1, "reserve_y": "ry", "reserve_y_amount": 2,
+        "bin_step": 10, "base_fee_percentage": "0.1", "max_fee_percentage": "10",
+        "protocol_fee_percentage": "5", "liquidity": "100.5", "reward_mint_x": "r", "reward_mint_y": "r",
+        "fees_24h": 1.0, "today_fees": 1.0, "trade_volume_24h": 1.0, "cumulative_trade_volume": 1.0,
+        "cumulative_fee_volume": 1.0, "current_price": 1.0, "apr": 1.0, "apy": 1.0,
+        "farm_apr": 0.0, "farm_apy": 0.0, "hide": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_iter_all_pairs_batches_streams_pairs(mocker):
+    body = json.dumps([_pair(i) for i in range(5)]).encode()
+
+    async def fake_stream(self, endpoint, method, chunk_size=64 * 1024, **kwargs):
+        for start in range(0, len(body), 100):
+            yield body[start:start + 100]
+
+    mocker.patch.object(HttpClient, "stream_async", fake_stream)
+    client = MeteoraClient()
+    batches = [[pair.address for pair in batch] async for batch in client.iter_all_pairs_batches(batch_size=2)]
+    assert batches == [["pair0", "pair1"], ["pair2", "pair3"], ["pair4"]]
+    assert [pair.address async for pair in client.iter_all_pairs()] == [f"pair{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_trusted_client_builds_compact_pairs(mocker):
+    mocker.patch.object(HttpClient, "api_request_async", mocker.AsyncMock(
+        side_effect=lambda endpoint, method, parser=None, **kwargs: parser.validate_python([_pair(0)])))
+    client = MeteoraClient(config={"trusted": True})
+    pairs = await client.get_all_pairs()
+    assert type(pairs[0]) is CompactPairInfo
+    assert pairs[0].address == "pair0"
@@ -0,0 +1,41 @@
+from decimal import Decimal
+
+from tbot.meteora.models import BinTradeVolume, CompactPairInfo, PairInfo, WalletEarning
+
+
+def _pair(i):
+    return {
+        "address": f"pair{i}", "name": "SOL-USDC", "mint_x": "x", "mint_y": "y",
+        "reserve_x": "rx", "reserve_x_amount": 1, "reserve_y": "ry", "reserve_y_amount": 2,
+        "bin_step": 10, "base_fee_percentage": "0.1", "max_fee_percentage": "10",
+        "protocol_fee_percentage": "5", "liquidity": "100.5", "reward_mint_x": "r", "reward_mint_y": "r",
+        "fees_24h": 1.0, "today_fees": 1.0, "trade_volume_24h": 1.0, "cumulative_trade_volume": 1.0,
+        "cumulative_fee_volume": 1.0, "current_price": 1.0, "apr": 1.0, "apy": 1.0,
+        "farm_apr": 0.0, "farm_apy": 0.0, "hide": False,
+    }
+
+
+def test_pair_info_parses_decimals_lazily():
+    pair = PairInfo(**_pair(0))
+    assert "liquidity_value" not in pair.__dict__
+    assert pair.liquidity_value == Decimal("100.5")
+    assert pair.__dict__["liquidity_value"] is pair.liquidity_value
+    assert pair.base_fee_percentage_value == Decimal("0.1")
+    assert pair.max_fee_percentage_value == Decimal("10")
+    assert pair.protocol_fee_percentage_value == Decimal("5")
+    assert "liquidity_value" not in pair.to_dict()
+
+
+def test_compact_pair_info_derives_decimals():
+    assert CompactPairInfo.from_dict(_pair(0)).liquidity_value == Decimal("100.5")
+
+
+def test_amounts_parse_as_integers():
+    volume = BinTradeVolume(bin_id=1, total_amount_x="12345678901234567890", total_amount_y="2", total_amount_usd=1.0)
+    assert volume.total_amount_x_value == 12345678901234567890
+    assert volume.total_amount_y_value == 2
+    earning = WalletEarning(
+        total_fee_usd_claimed=1.0, total_fee_x_claimed="1", total_fee_y_claimed="2",
+        total_reward_usd_claimed=1.0, total_reward_x_claimed="3", total_reward_y_claimed="4")
+    assert (earning.total_fee_x_claimed_value, earning.total_fee_y_claimed_value) == (1, 2)
+    assert (earning.total_reward_x_claimed_value, earning.total_reward_y_claimed_value) == (3, 4)